@@ -0,0 +1,74 @@
+#!/bin/env python
+# Copyright: Hallux team, 2024
+
+# Startup budget: time of `import hallux.main`, measured by `python -X importtime` in fresh interpreters.
+# Fails, when the best of --repeat runs exceeds --budget, and lists the slowest modules, imported by hallux.main.
+#
+# USAGE: python benchmarks/import_time.py [--repeat 5] [--budget 0.25] [--output import-results.json]
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def import_times(module: str) -> tuple[int, dict[str, int]]:
+    """
+    :return: cumulative import time of the module, and of modules imported by it directly, in microseconds
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    # "import time: self [us] | cumulative | imported package", nested imports are indented by 2 spaces and
+    # listed before the importing module, e.g. `site` with its .pth hooks goes first
+    children: dict[str, int] = {}
+    for line in stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        level = (len(fields[2]) - len(fields[2].lstrip()) - 1) // 2
+        if level == 0 and fields[2].strip() == module:
+            return int(fields[1]), children
+        if level == 0:
+            children = {}
+        elif level == 1:
+            children[fields[2].strip()] = int(fields[1])
+    raise SystemError(f"{module} is not found in -X importtime output")
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Import time of hallux.main")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=0.25, help="seconds, import takes ~0.1 s")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv[1:])
+
+    # the first run warms up .pyc files and the filesystem cache
+    runs = [import_times("hallux.main") for _ in range(args.repeat + 1)][1:]
+    best_us, children = min(runs, key=lambda run: run[0])
+    import_s = best_us / 1e6
+
+    slowest = sorted(children.items(), key=lambda item: -item[1])[: args.top]
+    print(f"import hallux.main: {import_s * 1e3:.1f} ms, budget {args.budget * 1e3:.0f} ms")
+    for name, us in slowest:
+        print(f"  {us / 1e3:9.1f} ms  {name}")
+
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps({"import_s": import_s, "budget_s": args.budget, "slowest": dict(slowest)}, indent=2) + "\n"
+        )
+    return 0 if import_s <= args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,145 @@
+#!/bin/env python
+# Copyright: Hallux team, 2024
+
+# Microbenchmarks of SimpleProposal merging: current line-level merge against the former difflib.ndiff one,
+# on small, large (Sonar's radius 100, whole functions) and pathological (every line slightly changed) snippets.
+#
+# USAGE: python benchmarks/merge_microbench.py [--repeat 5] [--output merge-results.json]
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hallux.issues.issue import IssueDescriptor  # noqa: E402
+from hallux.proposals.simple_proposal import SimpleProposal  # noqa: E402
+
+
+class SnippetIssue(IssueDescriptor):
+    def list_proposals(self):
+        return []
+
+
+class NdiffProposal(SimpleProposal):
+    """
+    Former merge: walks difflib.ndiff output, which also contains character-level "? " hint lines
+    """
+
+    def _matching_ends(self, lines1: list[str], lines2: list[str]) -> tuple[tuple[int, int], tuple[int, int]]:
+        line_diff = list(difflib.ndiff(lines1, lines2))
+
+        def walk(diff_lines: list[str]) -> tuple[int, int] | None:
+            index1, index2 = 0, 0
+            for line in diff_lines:
+                if line.startswith("+ "):
+                    index2 += 1
+                elif line.startswith("- "):
+                    index1 += 1
+                elif line.startswith("  "):
+                    return index1, index2
+                else:
+                    index1 += 1
+                    index2 += 1
+            return None
+
+        top, bottom = walk(line_diff), walk(line_diff[::-1])
+        if top is None or bottom is None:
+            return (len(lines1), len(lines2)), (len(lines1), len(lines2))
+        return top, bottom
+
+
+def code_lines(rng: random.Random, count: int) -> list[str]:
+    return [f"    value_{i} = compute(value_{i - 1}, {rng.randint(0, 10**6)})  # step {i}\n" for i in range(count)]
+
+
+def make_cases(seed: int) -> dict[str, tuple[list[str], int, str]]:
+    """
+    :return: name -> (file lines, radius, proposed code)
+    """
+    rng = random.Random(seed)
+    cases = {}
+
+    small = code_lines(rng, 21)
+    fixed = list(small[6:15])
+    fixed[4] = fixed[4].replace("compute", "compute_fixed")
+    cases["small"] = (small, 4, "```\n" + "".join(fixed) + "```\n")
+
+    large = code_lines(rng, 301)
+    fixed = list(large[50:251])
+    fixed[100:103] = ["    fixed = True\n"]
+    cases["large"] = (large, 100, "".join(["Here is the fixed code:\n"] + fixed + ["Hope it helps\n"]))
+
+    # every line differs by one character, so ndiff compares all pairs of lines char-by-char
+    pathological = code_lines(rng, 201)
+    fixed = [line.replace("compute", "Compute") for line in pathological]
+    cases["pathological"] = (pathological, 100, "".join(fixed))
+    return cases
+
+
+def run_case(proposal_class: type, path: Path, radius: int, proposed: str) -> tuple[bool, list[str], float]:
+    issue = SnippetIssue("tool", str(path), issue_line=radius + 1, language="python", comment="#")
+    proposal = proposal_class(issue, radius_or_range=radius)
+    start = time.perf_counter()
+    result = proposal._merge_lines(proposal._split_lines(proposed))
+    return result, proposal.proposed_lines, time.perf_counter() - start
+
+
+def best_of(repeat: int, func: Callable[[], tuple[bool, list[str], float]]) -> tuple[bool, list[str], float]:
+    runs = [func() for _ in range(repeat)]
+    return runs[0][0], runs[0][1], min(run[2] for run in runs)
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="SimpleProposal merge microbenchmarks")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv[1:])
+
+    # merge prints diffs, which is not a part of measured work
+    SimpleProposal.print_diff = lambda self, lines1, lines2: None
+
+    results = []
+    snippet_path = Path(__file__).resolve().parent.joinpath(".merge_microbench.py")
+    try:
+        for name, (lines, radius, proposed) in make_cases(args.seed).items():
+            snippet_path.write_text("".join(lines))
+            merged, merged_lines, merge_time = best_of(
+                args.repeat, lambda: run_case(SimpleProposal, snippet_path, radius, proposed)
+            )
+            ndiff_merged, ndiff_lines, ndiff_time = best_of(
+                args.repeat, lambda: run_case(NdiffProposal, snippet_path, radius, proposed)
+            )
+            results.append(
+                {
+                    "case": name,
+                    "lines": 2 * radius + 1,
+                    "merge_s": round(merge_time, 6),
+                    "ndiff_merge_s": round(ndiff_time, 6),
+                    "speedup": round(ndiff_time / merge_time, 1) if merge_time > 0 else None,
+                    "same_decision": merged == ndiff_merged and (not merged or merged_lines == ndiff_lines),
+                }
+            )
+            print(
+                f"{name:<14} {results[-1]['lines']:>4} lines: {merge_time * 1e3:9.3f} ms, "
+                f"ndiff {ndiff_time * 1e3:9.3f} ms, x{results[-1]['speedup']}, "
+                f"same decision: {results[-1]['same_decision']}"
+            )
+    finally:
+        snippet_path.unlink(missing_ok=True)
+
+    if args.output is not None:
+        args.output.write_text(json.dumps({"seed": args.seed, "results": results}, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,112 @@
+# Copyright: Hallux team, 2024
+
+# Local OpenAI-compatible chat completions server with canned answers, for deterministic benchmarks.
+# Answers are produced by rewrite rules, which fix issues injected by projects.py,
+# so no network access nor real model is required.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Final
+
+# (bad code pattern, replacement) for every kind of injected issue
+REWRITE_RULES: Final[list[tuple[re.Pattern, str]]] = [
+    # ruff F401: unused import is removed together with its line
+    (re.compile(r"^import \w+ as bench_unused_\w+.*\n", re.MULTILINE), ""),
+    # ruff F541: f-string without placeholders
+    (re.compile(r'\bf"empty"'), '"empty"'),
+    # mypy: incompatible types in assignment
+    (re.compile(r': int = "zero"'), ": int = 0"),
+    # compiler: use of undeclared identifier
+    (re.compile(r"\bbench_undeclared_\w+"), "0"),
+]
+
+CODE_BLOCK: Final[re.Pattern] = re.compile(r"```[\w+]*\n(.*?)\n?```", re.DOTALL)
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """
+    Answers POST .../chat/completions after `latency` seconds.
+    Every `1 / fail_rate`-th distinct request (chosen by request hash, so runs are reproducible)
+    gets the code back unchanged, imitating a model, which failed to fix the issue.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0, fail_rate: float = 0.0, port: int = 0):
+        super().__init__(("127.0.0.1", port), MockLLMHandler)
+        self.latency: Final[float] = latency
+        self.fail_rate: Final[float] = fail_rate
+        self.calls: int = 0
+        self.lock: Final[threading.Lock] = threading.Lock()
+        self.thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def start(self) -> MockLLMServer:
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def answer(self, request: str) -> str:
+        match = CODE_BLOCK.search(request)
+        code = match.group(1) + "\n" if match is not None else request
+        request_hash = int(hashlib.md5(request.encode("utf8")).hexdigest(), 16)
+        if self.fail_rate > 0 and (request_hash % 10000) / 10000 < self.fail_rate:
+            return f"```\n{code}```"
+        for pattern, replacement in REWRITE_RULES:
+            code = pattern.sub(replacement, code)
+        return f"```\n{code}```"
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    server: MockLLMServer
+
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        request = body["messages"][-1]["content"]
+        with self.server.lock:
+            self.server.calls += 1
+        time.sleep(self.server.latency)
+
+        content = self.server.answer(request)
+        prompt_tokens = sum(len(message["content"]) for message in body["messages"]) // 4
+        completion_tokens = len(content) // 4
+        response = json.dumps(
+            {
+                "id": f"chatcmpl-{self.server.calls}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [
+                    {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }
+        ).encode("utf8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
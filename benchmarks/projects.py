@@ -0,0 +1,122 @@
+# Copyright: Hallux team, 2024
+
+# Synthetic projects with a known number of injected issues, fixable by mock_llm.REWRITE_RULES.
+# Generation is seeded, so the same arguments always produce the same project.
+
+from __future__ import annotations
+
+import random
+import re
+from pathlib import Path
+from typing import Final
+
+STDLIB_MODULES: Final[list[str]] = ["json", "os", "re", "sys", "time", "math", "random", "string"]
+
+PYTHON_ISSUES: Final[dict[str, re.Pattern]] = {
+    "ruff": re.compile(r"^import \w+ as bench_unused_\w+|\bf\"empty\"", re.MULTILINE),
+    "mypy": re.compile(r': int = "zero"'),
+}
+CPP_ISSUES: Final[dict[str, re.Pattern]] = {"cpp": re.compile(r"\bbench_undeclared_\w+")}
+
+
+def python_function(index: int, rng: random.Random, issue: str | None) -> list[str]:
+    assignment = 'result: int = "zero"' if issue == "mypy" else "result: int = 0"
+    empty = 'f"empty"' if issue == "ruff" else '"empty"'
+    return [
+        f"def function_{index}(value: int | None, scale: int = {rng.randint(2, 9)}) -> int:",
+        '    """',
+        f"    Synthetic function #{index}",
+        '    """',
+        f"    {assignment}",
+        "    if value is None:",
+        f"        return len({empty})",
+        "    for step in range(scale):",
+        f"        result += value * step + {rng.randint(0, 99)}",
+        "    return result",
+        "",
+        "",
+    ]
+
+
+def generate_python_project(path: Path, issues: int, files: int = 10, seed: int = 0) -> dict[str, int]:
+    """
+    Every injected issue is either unused import, f-string without placeholders (ruff) or wrong assignment type (mypy)
+    :return: number of injected issues per tool
+    """
+    rng = random.Random(seed)
+    path.mkdir(parents=True, exist_ok=True)
+    path.joinpath("pyproject.toml").write_text("[tool.ruff]\nline-length = 120\n")
+    package = path.joinpath("bench")
+    package.mkdir(exist_ok=True)
+    package.joinpath("__init__.py").write_text("")
+
+    kinds = [rng.choice(["import", "ruff", "mypy"]) for _ in range(issues)]
+    file_kinds: list[list[str]] = [[] for _ in range(files)]
+    for i, kind in enumerate(kinds):
+        file_kinds[rng.randrange(files)].append(kind)
+
+    injected = {"ruff": 0, "mypy": 0}
+    function_index = 0
+    for file_index, current_kinds in enumerate(file_kinds):
+        lines = ["# Synthetic module for hallux benchmarks", ""]
+        imports = sum(1 for kind in current_kinds if kind == "import")
+        for i in range(imports):
+            lines.append(f"import {rng.choice(STDLIB_MODULES)} as bench_unused_{file_index}_{i}")
+        lines.extend(["", ""] if imports > 0 else [""])
+        body_issues = [kind for kind in current_kinds if kind != "import"]
+        # clean functions between the broken ones
+        for kind in body_issues + [None] * max(2, len(body_issues)):
+            lines.extend(python_function(function_index, rng, kind))
+            function_index += 1
+        package.joinpath(f"module_{file_index}.py").write_text("\n".join(lines).rstrip("\n") + "\n")
+        injected["ruff"] += imports + body_issues.count("ruff")
+        injected["mypy"] += body_issues.count("mypy")
+    return injected
+
+
+def generate_cpp_project(path: Path, issues: int, files: int = 5, seed: int = 0) -> dict[str, int]:
+    """
+    Every injected issue is a use of undeclared identifier, i.e. compilation error
+    :return: number of injected issues
+    """
+    rng = random.Random(seed)
+    source_dir = path.joinpath("src")
+    source_dir.mkdir(parents=True, exist_ok=True)
+    file_issues = [0] * files
+    for _ in range(issues):
+        file_issues[rng.randrange(files)] += 1
+
+    sources: list[str] = []
+    for file_index, count in enumerate(file_issues):
+        lines = ["// Synthetic source for hallux benchmarks", ""]
+        for function_index in range(count + 2):
+            issue = function_index < count
+            addend = f"bench_undeclared_{file_index}_{function_index}" if issue else str(rng.randint(0, 99))
+            lines.extend(
+                [
+                    f"int function_{file_index}_{function_index}(int value) {{",
+                    f"    int result = value * {rng.randint(2, 9)};",
+                    f"    result += {addend};",
+                    "    return result;",
+                    "}",
+                    "",
+                ]
+            )
+        source = f"src/source_{file_index}.cpp"
+        path.joinpath(source).write_text("\n".join(lines))
+        sources.append(source)
+
+    path.joinpath("CMakeLists.txt").write_text(
+        "cmake_minimum_required(VERSION 3.4)\n\nproject(hallux_bench)\n"
+        f"add_library(hallux_bench STATIC {' '.join(sources)})\n"
+    )
+    return {"cpp": issues}
+
+
+def count_remaining(path: Path, patterns: dict[str, re.Pattern], suffix: str) -> dict[str, int]:
+    remaining = {tool: 0 for tool in patterns}
+    for file in path.rglob(f"*{suffix}"):
+        text = file.read_text()
+        for tool, pattern in patterns.items():
+            remaining[tool] += len(pattern.findall(text))
+    return remaining
@@ -0,0 +1,170 @@
+#!/bin/env python
+# Copyright: Hallux team, 2024
+
+# End-to-end throughput benchmarks: hallux fixes synthetic projects with N injected issues,
+# querying local mock OpenAI-compatible server (see mock_llm.py) with fixed latency.
+#
+# USAGE: python benchmarks/run_benchmarks.py [--issues 50] [--latency 0.2] [--output results.json]
+#                                            [--baseline previous.json] [--scenario python] [-- HALLUX_ARGS]
+# Arguments after `--` are passed to hallux as-is, e.g. `-- --jobs 4` or `-- --batch 3`
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Final
+
+from mock_llm import MockLLMServer
+from projects import CPP_ISSUES, PYTHON_ISSUES, count_remaining, generate_cpp_project, generate_python_project
+
+REPO_ROOT: Final[Path] = Path(__file__).resolve().parent.parent
+
+# name -> (project generator, hallux tool flag, injected issue patterns, source suffix)
+SCENARIOS: Final[dict[str, tuple[Callable, str, dict, str]]] = {
+    "python": (generate_python_project, "--python", PYTHON_ISSUES, ".py"),
+    "cpp": (generate_cpp_project, "--cpp", CPP_ISSUES, ".cpp"),
+}
+
+
+def run_hallux(project: Path, hallux_args: list[str], server: MockLLMServer, trace_path: Path) -> tuple[float, int]:
+    """
+    Runs hallux as a child process, so its peak RSS is measured separately from the benchmark itself
+    :return: wall time in seconds, peak RSS of hallux and its tools in KiB
+    """
+    project.joinpath(".hallux").write_text("backends:\n  - mock:\n      type: litellm\n      model: gpt-3.5-turbo\n")
+    env = {
+        **os.environ,
+        "OPENAI_API_BASE": server.base_url,
+        "OPENAI_BASE_URL": server.base_url,
+        "OPENAI_API_KEY": "mock",
+        "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+        # newer ruff versions print multi-line diagnostics by default
+        "RUFF_OUTPUT_FORMAT": "concise",
+        "PYTHONPATH": os.pathsep.join([str(REPO_ROOT), os.environ.get("PYTHONPATH", "")]),
+    }
+    command = [sys.executable, "-m", "hallux.main", *hallux_args, f"--profile={trace_path}", "."]
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=project, env=env, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    wall_time = time.perf_counter() - start
+    exit_code = os.waitstatus_to_exitcode(status)
+    if exit_code != 0:
+        print(f"hallux exited with code {exit_code}", file=sys.stderr)
+    # ru_maxrss is in KiB on Linux, but in bytes on macOS
+    peak_rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return wall_time, peak_rss
+
+
+def phase_times(trace_path: Path) -> dict[str, float]:
+    phases: dict[str, float] = defaultdict(float)
+    if trace_path.exists():
+        for event in json.loads(trace_path.read_text())["traceEvents"]:
+            phases[event["name"]] += event["dur"] / 1e6
+    return {name: round(seconds, 4) for name, seconds in sorted(phases.items(), key=lambda item: -item[1])}
+
+
+def run_scenario(name: str, args: argparse.Namespace, hallux_args: list[str]) -> dict:
+    generate, tool_flag, patterns, suffix = SCENARIOS[name]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        project = Path(tmp_dir).joinpath("project")
+        injected = generate(project, args.issues, seed=args.seed)
+        trace_path = Path(tmp_dir).joinpath("trace.json")
+        server = MockLLMServer(latency=args.latency, fail_rate=args.fail_rate).start()
+        try:
+            wall_time, peak_rss = run_hallux(project, [tool_flag, *hallux_args], server, trace_path)
+        finally:
+            server.stop()
+        remaining = count_remaining(project, patterns, suffix)
+        fixed = sum(injected.values()) - sum(remaining.values())
+        return {
+            "scenario": name,
+            "hallux_args": hallux_args,
+            "injected": injected,
+            "remaining": remaining,
+            "fixed": fixed,
+            "wall_time_s": round(wall_time, 3),
+            "issues_per_minute": round(fixed / wall_time * 60, 2) if wall_time > 0 else None,
+            "llm_calls": server.calls,
+            "llm_calls_per_fix": round(server.calls / fixed, 3) if fixed > 0 else None,
+            "peak_rss_kib": peak_rss,
+            "phases_s": phase_times(trace_path),
+        }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
+
+def compare(results: list[dict], baseline_path: Path) -> None:
+    baseline = {result["scenario"]: result for result in json.loads(baseline_path.read_text())["results"]}
+    print(f"\nCompared to {baseline_path}:")
+    for result in results:
+        previous = baseline.get(result["scenario"])
+        if previous is None or not previous.get("issues_per_minute") or result["issues_per_minute"] is None:
+            continue
+        change = result["issues_per_minute"] / previous["issues_per_minute"] - 1
+        print(
+            f"{result['scenario']:<10} issues/minute {previous['issues_per_minute']:>8} -> "
+            f"{result['issues_per_minute']:>8} ({change:+.1%})"
+        )
+
+
+def main(argv: list[str]) -> int:
+    hallux_args: list[str] = []
+    if "--" in argv:
+        hallux_args = argv[argv.index("--") + 1 :]
+        argv = argv[: argv.index("--")]
+
+    parser = argparse.ArgumentParser(description="Hallux end-to-end throughput benchmarks")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="default: all scenarios")
+    parser.add_argument("--issues", type=int, default=50, help="injected issues per scenario")
+    parser.add_argument("--latency", type=float, default=0.2, help="mock LLM latency, seconds")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of requests answered without fix")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"))
+    parser.add_argument("--baseline", type=Path, help="previous results, to print throughput change")
+    args = parser.parse_args(argv[1:])
+
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        result = run_scenario(name, args, hallux_args)
+        results.append(result)
+        print(
+            f"{name:<10} fixed {result['fixed']}/{sum(result['injected'].values())} in {result['wall_time_s']}s: "
+            f"{result['issues_per_minute']} issues/minute, {result['llm_calls_per_fix']} LLM calls per fix, "
+            f"peak RSS {result['peak_rss_kib'] // 1024} MiB"
+        )
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "issues": args.issues,
+            "latency_s": args.latency,
+            "fail_rate": args.fail_rate,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Results written to {args.output}")
+    if args.baseline is not None:
+        compare(results, args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import importlib
 import os
 from contextlib import contextmanager
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from typing import Any
 
 
 @contextmanager
@@ -51,3 +53,12 @@ def find_argvalue(argv: list[str], name: str) -> str | None:
             return arg.split("=")[-1].strip('"').strip("'")
 
     return None
+
+
+def load_class(class_path: str) -> Any:
+    """
+    Imports class on first use, so heavy dependencies (litellm, PyGithub, requests) are not loaded at startup
+    :param class_path: "package.module:ClassName"
+    """
+    module_name, class_name = class_path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
@@ -14,6 +14,8 @@ from ..proposals.diff_proposal import DiffProposal
 
 
 class DummyBackend(QueryBackend):
+    is_cache = True
+
     def __init__(
         self,
         filename: str,
@@ -44,14 +46,21 @@ class DummyBackend(QueryBackend):
         encoded_data = str(description + "\n" + "\n".join(issue_lines)).encode("utf8")
         h = str(hashlib.md5(encoded_data).hexdigest())
         from hallux.logger import logger
+
         logger.message(f"DEBUG HASH: {h}")
         logger.message(f"DEBUG DATA: {description} + {issue_lines}")
         return h
 
     def __del__(self):
+        self.save()
+
+    def save(self) -> None:
         if self.was_modified:
             with open(self.filename, "wt") as file:
                 json.dump(self.json, file)
+            self.was_modified = False
+        if self.previous is not None:
+            self.previous.save()
 
     def report_successful_fix(self, issue: IssueDescriptor, proposal: DiffProposal) -> None:
         hash = self.issue_hash(issue.description, proposal.issue_lines)
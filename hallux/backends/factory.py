@@ -8,11 +8,8 @@ from typing import Any
 from hallux.logger import logger
 from hallux.models import PromptConfig
 
-from ..auxiliary import find_arg, find_argvalue
-from ..backends.dummy_backend import DummyBackend
-from ..backends.litellm import LiteLLMBackend
+from ..auxiliary import find_arg, find_argvalue, load_class
 from ..backends.query_backend import QueryBackend
-from ..backends.rest_backend import RestBackend
 
 
 class BackendFactory:
@@ -45,9 +42,23 @@ class BackendFactory:
             name, settings = BackendFactory._validate_settings(name_dict)
             backend = BackendFactory._create_backend(settings, config_path, backend, prompt)
             if find_arg(argv, "--" + name) > 0:
-                return backend  # stop early if required by CLI
+                break  # stop early if required by CLI
+
+        hedge = True if find_arg(argv, "--hedge") > 0 else config.get("hedge", False)
+        BackendFactory._set_hedging(backend, hedge)
         return backend
 
+    @staticmethod
+    def _set_hedging(backend: QueryBackend, settings: Any) -> None:
+        if settings is None or settings is False:
+            return
+        from .hedging import HedgingPolicy
+
+        hedging = HedgingPolicy.from_config(settings)
+        while backend is not None:
+            backend.hedging = hedging
+            backend = backend.previous_backend()
+
     @staticmethod
     def validate_model_args(argv, model_index: int) -> str | None:
         model_value = find_argvalue(argv, "--model")
@@ -91,10 +102,11 @@ class BackendFactory:
     def _create_backend(
         settings: dict, config_path: Path, previous_backend: QueryBackend, prompt: PromptConfig
     ) -> QueryBackend:
+        # backend modules are imported only when used, e.g. litellm takes seconds to import
         type_to_class = {
-            "dummy": DummyBackend,
-            "rest": RestBackend,
-            "litellm": LiteLLMBackend,
+            "dummy": "hallux.backends.dummy_backend:DummyBackend",
+            "rest": "hallux.backends.rest_backend:RestBackend",
+            "litellm": "hallux.backends.litellm:LiteLLMBackend",
         }
 
         backend_type = settings.get("type", "").strip()
@@ -114,9 +126,9 @@ class BackendFactory:
             settings["model"] = f"azure/{settings['model']}"
             logger.warning(f"Model name for 'openai.azure' updated to 'azure/{settings['model']}'.")
 
-        backend_class = type_to_class.get(backend_type)
-        if backend_class is None:
+        if backend_type not in type_to_class:
             raise SystemError(f"Unknown BACKEND type: {backend_type}. Supported types: {type_to_class.keys()}")
+        backend_class = load_class(type_to_class[backend_type])
         return backend_class(**settings, base_path=config_path, previous_backend=previous_backend, prompt=prompt)
 
     @staticmethod
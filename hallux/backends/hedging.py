@@ -0,0 +1,136 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import copy
+import math
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Final
+
+from ..logger import logger
+from ..proposals.diff_proposal import DiffProposal
+from ..targets.diff import DiffTarget
+from .query_backend import QueryBackend
+
+
+class HedgingPolicy:
+    """
+    Racing policy of one backend chain: backend is queried first, and the next backend of the chain is queried too,
+    if the answer is slower than the percentile of previous answers. The first answer, which merges cleanly, wins.
+    Lost request can not be interrupted, hence it is abandoned: its answer is ignored, its latency is still recorded,
+    and tokens it spends are added to tokens_used of its backend, once it finishes.
+    Cache backends are never hedged, they are answered right away.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        delay: float = 5.0,
+        min_samples: int = 5,
+        window: int = 100,
+        timeout: float = 600.0,
+    ):
+        """
+        :param percentile: hedge is sent, when backend is slower than that percentile of its recent latencies
+        :param delay: seconds to wait for the answer, until backend has min_samples latencies
+        :param min_samples: recorded latencies, needed for the percentile to be trusted
+        :param window: how many recent latencies per backend are kept
+        :param timeout: seconds to wait for the racing backends, once hedge is sent. Hung requests are abandoned
+        """
+        if not 0 < percentile <= 100:
+            raise SystemError(f"HEDGE percentile must be within (0, 100]. Error in: {percentile}")
+        self.percentile: Final[float] = percentile
+        self.delay: Final[float] = delay
+        self.min_samples: Final[int] = min_samples
+        self.timeout: Final[float] = timeout
+        self.lock: Final[threading.Lock] = threading.Lock()
+        # id(backend) -> latencies in seconds
+        self.latencies: Final[dict[int, deque[float]]] = defaultdict(lambda: deque(maxlen=window))
+
+    @staticmethod
+    def from_config(settings: Any) -> HedgingPolicy | None:
+        """
+        :param settings: `hedge` config setting: True, False or dict with HedgingPolicy arguments
+        """
+        if settings is None or settings is False:
+            return None
+        if settings is True:
+            return HedgingPolicy()
+        if not isinstance(settings, dict):
+            raise SystemError(f"HEDGE config setting must be true, false or dict. Error in: {settings}")
+        return HedgingPolicy(**settings)
+
+    def record(self, backend: QueryBackend, seconds: float) -> None:
+        with self.lock:
+            self.latencies[id(backend)].append(seconds)
+
+    def hedge_delay(self, backend: QueryBackend) -> float:
+        """
+        :return: seconds to wait for the backend, before the next backend is queried too
+        """
+        with self.lock:
+            samples = sorted(self.latencies[id(backend)])
+        if len(samples) < self.min_samples:
+            return self.delay
+        return samples[max(0, math.ceil(self.percentile / 100 * len(samples)) - 1)]
+
+    def race(
+        self, proposal: DiffProposal, primary: QueryBackend, secondary: QueryBackend, diff_target: DiffTarget
+    ) -> tuple[bool, QueryBackend]:
+        """
+        Same contract as DiffProposal.try_fixing_with_priority
+        :param primary: backend to be queried
+        :param secondary: next backend of the chain, hedge of the primary one
+        :return: True if the winning answer was applied, and the last backend, which answer was used
+        """
+        from ..tools.pipeline import DeferredTarget
+
+        # backend, its copy of the proposal, merge result, error of the query
+        answers: queue.Queue[tuple[QueryBackend, DiffProposal, bool, Exception | None]] = queue.Queue()
+
+        def attempt(backend: QueryBackend) -> None:
+            # every backend merges into its own copy of the proposal, so racing answers do not mix
+            replica = copy.copy(proposal)
+            replica.issue_lines = list(proposal.issue_lines)
+            replica.proposed_lines = list(proposal.proposed_lines)
+            start = time.monotonic()
+            merged, error = False, None
+            try:
+                merged = replica.try_fixing(backend, DeferredTarget())
+            except Exception as e:
+                error = e
+            self.record(backend, time.monotonic() - start)
+            answers.put((backend, replica, merged, error))
+
+        threading.Thread(target=attempt, args=(primary,), daemon=True).start()
+        hedged = False
+        delay = self.hedge_delay(primary)
+        try:
+            answer = answers.get(timeout=delay)
+        except queue.Empty:
+            logger.info(
+                f"{type(primary).__name__} is slower than {delay:.2f}s, hedging with {type(secondary).__name__}"
+            )
+            threading.Thread(target=attempt, args=(secondary,), daemon=True).start()
+            hedged = True
+            deadline = time.monotonic() + self.timeout
+            try:
+                answer = answers.get(timeout=self.timeout)
+                if not answer[2]:
+                    # the other racer might still merge
+                    answer = answers.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                logger.warning(f"No fix was answered within {self.timeout:.0f}s after hedging, abandoning requests")
+                return False, secondary
+
+        winner, replica, merged, error = answer
+        if error is not None:
+            raise error
+        if not merged:
+            return False, secondary if hedged else primary
+
+        vars(proposal).update(vars(replica))
+        return diff_target.apply_diff(proposal), winner
@@ -51,6 +51,12 @@ class LiteLLMBackend(QueryBackend):
             for variant in result["choices"]:
                 answers.append(variant["message"]["content"])
 
+        usage = result.get("usage") if hasattr(result, "get") else None
+        if usage is not None and usage.get("total_tokens") is not None:
+            self.tokens_used += int(usage["total_tokens"])
+        else:
+            self.tokens_used += self.estimate_tokens(self.prompt["system"], request, *[str(a) for a in answers])
+
         logger.log_multiline("[LiteLLM ANSWERS]:", answers[0], "debug")
 
         return answers
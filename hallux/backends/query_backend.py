@@ -4,14 +4,22 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Final
+from typing import TYPE_CHECKING, Final
 
 from hallux.models import PromptConfig
 
 from ..issues.issue import IssueDescriptor
+from ..tracing import traced_methods
 
+if TYPE_CHECKING:
+    from .hedging import HedgingPolicy
 
+
+@traced_methods("backend", "query")
 class QueryBackend(ABC):
+    # answers right away, e.g. from local file, hence never hedged
+    is_cache: bool = False
+
     def __init__(
         self,
         base_path: Path = Path(),
@@ -22,6 +30,10 @@ class QueryBackend(ABC):
         self.base_path: Final[Path] = base_path
         self.was_modified = False
         self.prompt: PromptConfig = prompt
+        # spent by this backend only, see total_tokens()
+        self.tokens_used: int = 0
+        # racing policy, shared by the whole backend chain
+        self.hedging: HedgingPolicy | None = None
 
     def previous_backend(self) -> QueryBackend | None:
         return self.previous
@@ -30,6 +42,24 @@ class QueryBackend(ABC):
     def query(self, request: str, issue: IssueDescriptor | None = None, issue_lines: list[str] = list) -> list[str]:
         pass
 
+    def total_tokens(self) -> int:
+        """
+        :return: tokens, spent by the whole backend chain
+        """
+        return self.tokens_used + (self.previous.total_tokens() if self.previous is not None else 0)
+
+    @staticmethod
+    def estimate_tokens(*texts: str) -> int:
+        # rough estimation for backends, which do not report usage: ~4 characters per token
+        return sum(len(text) for text in texts) // 4
+
     def report_successful_fix(self, issue, proposal) -> None:
         if self.previous is not None:
             self.previous.report_successful_fix(issue, proposal)
+
+    def save(self) -> None:
+        """
+        Persists collected fixes of the whole backend chain, used by long-living `hallux serve`
+        """
+        if self.previous is not None:
+            self.previous.save()
@@ -143,6 +143,7 @@ class RestBackend(QueryBackend):
 
         response = self._make_request(parsed_request)
         parsed_response = self._parse_response(response)
+        self.tokens_used += self.estimate_tokens(request, *[str(answer) for answer in parsed_response])
 
         if not parsed_response:
             logger.warning("Parsed response is empty")
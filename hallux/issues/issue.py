@@ -5,10 +5,13 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Final
 
+from ..proposals.diff_proposal import DiffProposal
 from ..proposals.proposal_engine import ProposalEngine
+from ..tracing import traced_methods
 from .annotations import get_language
 
 
+@traced_methods("issue", "list_proposals")
 class IssueDescriptor(ABC):
     def __init__(
         self,
@@ -34,9 +37,30 @@ class IssueDescriptor(ABC):
         self.language: Final[str] = language
         self.comment: Final[str] = comment
 
-        if line_comment is None and comment is not None:
-            # TODO: paarametrize line_comment template
-            self.line_comment = f" {comment} <-- fix around this line {str(issue_line)}. Remove this comment after fix applied."
+        # default line_comment mentions issue_line, so it needs an update when issue_line is shifted
+        self.default_line_comment: Final[bool] = line_comment is None and comment is not None
+        if self.default_line_comment:
+            self._set_default_line_comment()
+
+    def _set_default_line_comment(self):
+        # TODO: paarametrize line_comment template
+        self.line_comment = (
+            f" {self.comment} <-- fix around this line {str(self.issue_line)}. Remove this comment after fix applied."
+        )
+
+    def remap_lines(self, proposal: DiffProposal) -> None:
+        """
+        Shifts line numbers, after proposal has been committed into the same file
+        """
+        self.issue_line = proposal.shift_line(self.issue_line)
+        if self.default_line_comment:
+            self._set_default_line_comment()
+
+    def fingerprint(self) -> tuple[str, str, str]:
+        """
+        Identity of the issue, which survives line-number shifts within the file
+        """
+        return self.tool, self.filename, self.description
 
     @abstractmethod
     def list_proposals(self) -> ProposalEngine:
@@ -11,25 +11,36 @@
 from __future__ import annotations
 
 import logging
+import os
 import sys
+import traceback
 from pathlib import Path
-from typing import Any, Final
+from typing import TYPE_CHECKING, Any, Final
 
 import yaml
-import traceback
 
-from hallux.auxiliary import find_arg, find_argvalue
+from hallux.auxiliary import find_arg, find_argvalue, load_class
 from hallux.backends.factory import BackendFactory, QueryBackend
 from hallux.logger import logger
 from hallux.targets.diff import DiffTarget
 from hallux.targets.filesystem import FilesystemTarget
 from hallux.targets.git_commit import GitCommitTarget
-from hallux.targets.github_suggestion import GithubSuggestion
-from hallux.targets.gitlab_suggestion import GitlabSuggestion
 from hallux.tools.factory import IssueSolver, ToolsFactory
+from hallux.tools.issue_scheduler import IssueScheduler, RunBudget
+from hallux.tools.journal import RunJournal
+from hallux.tools.scheduler import SolverScheduler
+from hallux.tools.validity_cache import ValidityCache
+from hallux.tracing import tracer
+
+if TYPE_CHECKING:
+    from hallux.server import WarmState
 
 DEBUG: Final[bool] = False
 CONFIG_FILE: Final[str] = ".hallux"
+# Unix socket of `hallux serve` daemon; hallux.server is imported only, when the daemon is used
+SOCKET_ENV: Final[str] = "HALLUX_SOCKET"
+# libyaml-based loader is much faster, when PyYAML is built with it
+YAML_LOADER: Final[type] = getattr(yaml, "CLoader", yaml.Loader)
 
 
 class Hallux:
@@ -42,15 +53,31 @@ class Hallux:
         run_path: Path,  # directory, specified in command-line
         config_path: Path,  # directory of the config file, if exists, or current one
         verbose: bool = False,
+        concurrent: bool = False,  # run solvers of different tools concurrently
+        journal: RunJournal | None = None,
+        issue_scheduler: IssueScheduler | None = None,
     ):
         self.solvers: Final[list[IssueSolver]] = solvers
         self.run_path: Final[Path] = run_path
         self.config_path: Final[Path] = config_path if config_path is not None else run_path
         self.verbose: bool = verbose
+        self.concurrent: Final[bool] = concurrent
+        self.journal: Final[RunJournal | None] = journal
+        self.issue_scheduler: Final[IssueScheduler | None] = issue_scheduler
 
     def process(self, diff_target: DiffTarget, query_backend: QueryBackend):
         for solver in self.solvers:
-            solver.solve_issues(diff_target, query_backend)
+            solver.journal = self.journal
+            solver.issue_scheduler = self.issue_scheduler
+        try:
+            if self.concurrent:
+                SolverScheduler(self.solvers).run(diff_target, query_backend)
+                return
+            for solver in self.solvers:
+                solver.solve_issues(diff_target, query_backend)
+        finally:
+            if self.journal is not None:
+                self.journal.close()
 
     @staticmethod
     def find_config(run_path: Path) -> tuple[dict, Path]:
@@ -66,7 +93,7 @@ class Hallux:
             return {}, run_path
         config_file = str(config_path.joinpath(CONFIG_FILE))
         with open(config_file) as file_stream:
-            yaml_dict = yaml.load(file_stream, Loader=yaml.Loader)
+            yaml_dict = yaml.load(file_stream, Loader=YAML_LOADER)
             logger.debug(f"Loaded config from {config_file}")
             logger.debug(f"Config: {yaml_dict}")
         return yaml_dict, config_path
@@ -76,6 +103,7 @@ class Hallux:
         print(f"Hallux v{get_version()} - Convenient AI Code Quality Assistant\n")
         print("USAGE: ")
         print("hallux [TOOL] [BACKEND] [TARGET] [OTHER] DIR")
+        print("hallux serve [--socket PATH]   keeps daemon with warm backends and caches, listening on Unix socket")
 
         print("\nOptions for [TOOL]:")
         print("--all       (DEFAULT) try all plugins, or configured ones")
@@ -101,6 +129,18 @@ class Hallux:
         print("More details on [TARGET] options: https://hallux.dev/docs/user-guide/targets")
 
         print("\nOptions for [OTHER]:")
+        print("--jobs N    Solve issues from different files in N parallel sandboxes")
+        print("--pipeline  Query backends for next issues, while current fix is being validated")
+        print("--batch N   Fix up to N nearby issues of the same file with one backend request")
+        print("--speculative  Query backends for all proposals of an issue at once, validate answers in order")
+        print("--hedge     Query the next backend too, when the current one is slower than its p95 latency")
+        print("--validity-cache  Skip validity tests of already tested project files, remembered between runs")
+        print("--concurrent  Run solvers of different tools concurrently, never fixing the same file at once")
+        print("--max-time SECONDS  Solve most valuable issues first, stop when time is over")
+        print("--max-tokens N      Solve most valuable issues first, stop when backends spent N tokens")
+        print("--resume    Journal issue outcomes, skip issues finished by the previous (interrupted) journaled run")
+        print("--daemon    Send the job to running `hallux serve` daemon (also if HALLUX_SOCKET is set)")
+        print("--profile[=FILE]  Print time spent per phase, backend and issue, write Chrome trace JSON to FILE")
         print("--verbose   Print debug tracebacks on errors")
         print("--help      Print this help section")
 
@@ -111,7 +151,7 @@ class Hallux:
         if github_index > 0:
             github_value = find_argvalue(argv, "--github")
             if github_value is not None:
-                return GithubSuggestion(github_value)
+                return load_class("hallux.targets.github_suggestion:GithubSuggestion")(github_value)
             else:
                 raise SystemError(
                     "--github must be followed by valid PR URL, like this https://github.com/ORG_NAME/REPO_NAME/pull/ID"
@@ -120,7 +160,7 @@ class Hallux:
         if gitlab_index > 0:
             gitlab_value = find_argvalue(argv, "--gitlab")
             if gitlab_value is not None:
-                return GitlabSuggestion(gitlab_value)
+                return load_class("hallux.targets.gitlab_suggestion:GitlabSuggestion")(gitlab_value)
             else:
                 raise SystemError(
                     "--gitlab must be followed by valid MR URL, like this"
@@ -135,7 +175,7 @@ class Hallux:
 
         # Config settings has medium priority:
         if "github" in config:
-            return GithubSuggestion(config["github"])
+            return load_class("hallux.targets.github_suggestion:GithubSuggestion")(config["github"])
         elif config == "git" or "git" in config:
             return GitCommitTarget()
         # If no other targets were found - use default
@@ -150,15 +190,30 @@ def get_version():
         return "DEVELOP"
 
 
-def main(argv: list[str] | None = None, run_path: Path | None = None) -> int:
+def main(argv: list[str] | None = None, run_path: Path | None = None, warm_state: WarmState | None = None) -> int:
     """
     :param argv: list of command-line arguments
     :param run_path: Path, from where main executable is running
+    :param warm_state: configs and backends, kept between jobs by `hallux serve` daemon
     :return: error code or 0, if successful
     """
     if argv is None:
         argv = sys.argv
 
+    if len(argv) > 1 and argv[1] == "serve":
+        from hallux.server import serve
+
+        return serve(argv)
+
+    if warm_state is None and (find_arg(argv, "--daemon") > 0 or SOCKET_ENV in os.environ):
+        from hallux.server import default_socket_path, run_client
+
+        argv = [arg for arg in argv if arg != "--daemon"]
+        exit_code = run_client(argv, default_socket_path(), run_path)
+        if exit_code is not None:
+            return exit_code
+        logger.warning(f"Hallux daemon is not available on {default_socket_path()}, running locally")
+
     verbose: bool = find_arg(argv, "--verbose") > 0 or find_arg(argv, "-v") > 0
     if verbose:
         logger.setLevel(logging.DEBUG)
@@ -172,9 +227,12 @@ def main(argv: list[str] | None = None, run_path: Path | None = None) -> int:
     if command_dir is None:
         return 1
 
-    config, config_path = Hallux.find_config(run_path)
+    if warm_state is not None:
+        config, config_path = warm_state.find_config(run_path)
+    else:
+        config, config_path = Hallux.find_config(run_path)
 
-    error_code, query_backend = init_backend(argv, config, config_path, verbose)
+    error_code, query_backend = init_backend(argv, config, config_path, verbose, warm_state)
     if query_backend is None:
         return error_code
 
@@ -182,16 +240,27 @@ def main(argv: list[str] | None = None, run_path: Path | None = None) -> int:
     if target is None:
         return error_code
 
-    error_code, solvers = init_solvers(argv, config, config_path, run_path, command_dir, verbose)
+    validity_cache = init_validity_cache(argv, config, config_path)
+    error_code, solvers = init_solvers(argv, config, config_path, run_path, command_dir, verbose, validity_cache)
     if solvers is None:
         return error_code
 
-    error_code, hallux = init_hallux(solvers, run_path, config_path, verbose)
+    concurrent: bool = find_arg(argv, "--concurrent") > 0 or bool(config.get("concurrent", False))
+    journal = init_journal(argv, config, config_path, target)
+    issue_scheduler = init_issue_scheduler(argv, config, journal)
+    error_code, hallux = init_hallux(solvers, run_path, config_path, verbose, concurrent, journal, issue_scheduler)
     if hallux is None:
         return error_code
 
-    if (error_code := process_hallux(hallux, query_backend, target, verbose)) != 0:
-        return error_code
+    trace_path = init_profile(argv, config, config_path)
+    try:
+        if (error_code := process_hallux(hallux, query_backend, target, verbose)) != 0:
+            return error_code
+    finally:
+        if trace_path is not None:
+            report_profile(trace_path)
+        if validity_cache is not None:
+            validity_cache.close()
 
     return 0
 
@@ -207,9 +276,13 @@ def validate_command_dir(argv):
     return None
 
 
-def init_backend(argv, config, config_path, verbose):
+def init_backend(argv, config, config_path, verbose, warm_state=None):
     try:
-        query_backend: QueryBackend = BackendFactory.init_backend(argv, config, config_path)
+        query_backend: QueryBackend
+        if warm_state is not None:
+            query_backend = warm_state.init_backend(argv, config, config_path)
+        else:
+            query_backend = BackendFactory.init_backend(argv, config, config_path)
         return 0, query_backend
     except Exception as e:
         logger.error(f"Error during BACKEND initialization: {e}")
@@ -231,7 +304,7 @@ def init_target(argv, config, verbose):
         return 3, None
 
 
-def init_solvers(argv, config, config_path, run_path, command_dir, verbose):
+def init_solvers(argv, config, config_path, run_path, command_dir, verbose, validity_cache=None):
     try:
         solvers: list[IssueSolver] = ToolsFactory.init_solvers(
             argv,
@@ -240,6 +313,11 @@ def init_solvers(argv, config, config_path, run_path, command_dir, verbose):
             config_path=config_path,
             run_path=run_path,
             command_dir=command_dir,
+            jobs=int(find_argvalue(argv, "--jobs") or config.get("jobs", 1)),
+            pipeline=True if find_arg(argv, "--pipeline") > 0 else config.get("pipeline"),
+            batch=int(find_argvalue(argv, "--batch") or config.get("batch", 1)),
+            speculative=find_arg(argv, "--speculative") > 0 or bool(config.get("speculative", False)),
+            validity_cache=validity_cache,
         )
         return 0, solvers
     except Exception as e:
@@ -250,12 +328,97 @@ def init_solvers(argv, config, config_path, run_path, command_dir, verbose):
         return 4, None
 
 
-def init_hallux(solvers, run_path, config_path, verbose):
+def init_journal(argv, config, config_path, target):
+    """
+    Issue outcomes are journaled with `--resume`, or `journal: true|FILE` config setting
+    """
+    resume = find_arg(argv, "--resume") > 0
+    setting = config.get("journal", False) or resume
+    if not setting:
+        return None
+    try:
+        if isinstance(setting, str):
+            journal_path = config_path.joinpath(setting)
+        else:
+            journal_path = RunJournal.default_path(config_path)
+        return RunJournal(journal_path, resume=resume, skip_fixed=not target.requires_refresh())
+    except OSError as e:
+        logger.warning(f"Run journal is not available: {e}")
+        return None
+
+
+def init_validity_cache(argv, config, config_path):
+    """
+    Outcomes of validity tests are cached with `--validity-cache`, or `validity_cache: true|FILE` config setting
+    """
+    setting = True if find_arg(argv, "--validity-cache") > 0 else config.get("validity_cache", False)
+    if not setting:
+        return None
+    try:
+        if isinstance(setting, str):
+            return ValidityCache(config_path.joinpath(setting))
+        return ValidityCache(ValidityCache.default_path(config_path))
+    except OSError as e:
+        logger.warning(f"Validity test cache is not available: {e}")
+        return None
+
+
+def init_issue_scheduler(argv, config, journal):
+    """
+    Issues are prioritized, when time or token budget is given, or with `prioritize: true` config setting
+    """
+    budget_config: dict = config.get("budget") or {}
+    max_time = find_argvalue(argv, "--max-time") or budget_config.get("time")
+    max_tokens = find_argvalue(argv, "--max-tokens") or budget_config.get("tokens")
+    if max_time is None and max_tokens is None and not config.get("prioritize", False):
+        return None
+    budget = RunBudget(
+        max_time=float(max_time) if max_time is not None else None,
+        max_tokens=int(max_tokens) if max_tokens is not None else None,
+    )
+    return IssueScheduler(budget, history=journal.history if journal is not None else None)
+
+
+def init_profile(argv, config, config_path):
+    """
+    `--profile` or `--profile=trace.json` (`profile` config setting) traces the run
+    :return: path for Chrome trace JSON, or None if profiling is off
+    """
+    profile_index = find_arg(argv, "--profile")
+    profile = argv[profile_index] if profile_index > 0 else config.get("profile")
+    if not profile:
+        return None
+    if isinstance(profile, str) and "=" in profile:
+        trace_path = Path(profile.split("=", 1)[1].strip('"').strip("'")).resolve()
+    elif isinstance(profile, str) and not profile.startswith("--"):
+        trace_path = config_path.joinpath(profile)
+    else:
+        trace_path = Path.home().joinpath(".cache", "hallux", "trace.json")
+    tracer.start()
+    return trace_path
+
+
+def report_profile(trace_path):
+    tracer.stop()
+    print("\nProfile:")
+    print(tracer.summary())
+    try:
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        tracer.write_trace(trace_path)
+        print(f"Chrome trace written to {trace_path}")
+    except OSError as e:
+        logger.warning(f"Unable to write trace: {e}")
+
+
+def init_hallux(solvers, run_path, config_path, verbose, concurrent=False, journal=None, issue_scheduler=None):
     try:
         hallux = Hallux(
             solvers=solvers,
             run_path=run_path,
             config_path=config_path,
+            concurrent=concurrent,
+            journal=journal,
+            issue_scheduler=issue_scheduler,
         )
         return 0, hallux
     except Exception as e:
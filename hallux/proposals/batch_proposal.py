@@ -0,0 +1,61 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+from typing import Final
+
+from ..issues.issue import IssueDescriptor
+from .simple_proposal import SimpleProposal
+
+
+class BatchProposal(SimpleProposal):
+    """
+    Fixes several nearby issues of the same file with one backend request:
+    code range covers all issues, every issue line gets its own line comment, and the prompt lists all descriptions.
+    """
+
+    def __init__(self, issues: list[IssueDescriptor], radius: int = 4):
+        """
+        :param issues: issues of the same file, sorted by issue_line
+        :param radius: "safety buffer" around the first and the last issue lines
+        """
+        self.issues: Final[list[IssueDescriptor]] = issues
+        first_line: int = min(issue.issue_line for issue in issues)
+        last_line: int = max(issue.issue_line for issue in issues)
+        super().__init__(issues[0], (first_line - radius, last_line + radius))
+        self.safety_radius = min(first_line - self.start_line, self.end_line - last_line)
+        self.description = f"{len(issues)} issues: " + "; ".join(issue.description for issue in issues)
+
+    def _set_issue_lines(self):
+        super()._set_issue_lines()
+        # base class commented only the first issue
+        for issue in self.issues[1:]:
+            if issue.line_comment is not None:
+                index = issue.issue_line - self.start_line
+                lines = self.issue_lines[index].split("\n")
+                lines[0] += issue.line_comment
+                self.issue_lines[index] = "\n".join(lines)
+
+    def issue_data(self) -> dict[str, str]:
+        data = super().issue_data()
+        data["ISSUE_TYPE"] = ", ".join(sorted({issue.issue_type for issue in self.issues}))
+        data["ISSUE_DESCRIPTION"] = "; ".join(f"line {issue.issue_line}: {issue.description}" for issue in self.issues)
+        return data
+
+    def _merge_lines(self, proposed_lines: list[str]) -> bool:
+        if proposed_lines[0].startswith("```"):
+            proposed_lines = proposed_lines[1:-1]
+            if proposed_lines[-1].startswith("```"):
+                proposed_lines = proposed_lines[:-1]
+
+        # remove line comments of all issues, from both issue_lines and proposed_lines
+        comments = [issue.line_comment for issue in self.issues if issue.line_comment]
+        for lines in [self.issue_lines, proposed_lines]:
+            for i, line in enumerate(lines):
+                for comment in comments:
+                    if comment in line:
+                        line = line.replace(comment, "", 1)
+                lines[i] = line
+
+        # issue lines might be gone in the answer, hence only the merge from both ends is reliable
+        return self._merge_from_both_ends(proposed_lines)
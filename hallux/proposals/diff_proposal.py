@@ -6,7 +6,10 @@ import difflib
 from abc import ABC, abstractmethod
 from typing import Any
 
+from ..tracing import traced_methods
 
+
+@traced_methods("proposal", "_merge_lines")
 class DiffProposal(ABC):
     # This class does not contain any fancy members like IssueDescriptor to avoid circular imports
     def __init__(
@@ -25,14 +28,32 @@ class DiffProposal(ABC):
     def try_fixing(self, query_backend, diff_target) -> bool:
         pass
 
-    def try_fixing_with_priority(self, query_backend, diff_target, used_backend) -> tuple[bool, Any]:
+    def try_fixing_with_priority(self, query_backend, diff_target, used_backend, next_backend=None) -> tuple[bool, Any]:
+        """
+        Queries the highest priority backend after used_backend
+        :param next_backend: backend, following query_backend in the chain, used as hedge by HedgingPolicy
+        :return: True if fix was applied, and the last queried backend
+        """
         previous_backend = query_backend.previous_backend()
 
         if previous_backend is not None and previous_backend != used_backend:
-            return self.try_fixing_with_priority(previous_backend, diff_target, used_backend)
+            return self.try_fixing_with_priority(previous_backend, diff_target, used_backend, query_backend)
+        elif next_backend is not None and query_backend.hedging is not None and not query_backend.is_cache:
+            return query_backend.hedging.race(self, query_backend, next_backend, diff_target)
         else:
             return self.try_fixing(query_backend, diff_target), query_backend
 
+    def shift_line(self, line: int) -> int:
+        """
+        Maps line number from the file before this proposal was applied, onto the file after.
+        Lines within replaced code range are kept inside the new range.
+        """
+        if line < self.start_line:
+            return line
+        if line > self.end_line:
+            return line + len(self.proposed_lines) - (self.end_line - self.start_line + 1)
+        return max(1, min(line, self.start_line + len(self.proposed_lines) - 1))
+
     def print_diff(self, lines1, lines2):
         diff = difflib.unified_diff(lines1, lines2, fromfile=self.filename, tofile=self.filename)
         for line in diff:
@@ -85,15 +85,7 @@ class SimpleProposal(DiffProposal):
             else query_backend.backend.prompt.get("user")
         )
 
-        issue_data = {
-            "ISSUE_LANGUAGE": self.issue.language,
-            "ISSUE_TYPE": self.issue.issue_type,
-            "ISSUE_DESCRIPTION": self.issue.description,
-            "ISSUE_FILEPATH": self.issue.filename,
-            "ISSUE_LINES": "".join(self.issue_lines),
-        }
-
-        user_message = user_message_template.format(**issue_data)
+        user_message = user_message_template.format(**self.issue_data())
         query_results: list[str] = query_backend.query(user_message, self.issue, issue_lines=self.issue_lines)
         if len(query_results) == 0:
             return False
@@ -106,6 +98,18 @@ class SimpleProposal(DiffProposal):
 
         return False
 
+    def issue_data(self) -> dict[str, str]:
+        """
+        :return: values for the placeholders of the user prompt template
+        """
+        return {
+            "ISSUE_LANGUAGE": self.issue.language,
+            "ISSUE_TYPE": self.issue.issue_type,
+            "ISSUE_DESCRIPTION": self.issue.description,
+            "ISSUE_FILEPATH": self.issue.filename,
+            "ISSUE_LINES": "".join(self.issue_lines),
+        }
+
     def _split_lines(self, code: str) -> list[str]:
         return code.splitlines(keepends=True)
 
@@ -142,23 +146,31 @@ class SimpleProposal(DiffProposal):
 
         return merge_result
 
+    @staticmethod
+    def _matching_ends(lines1: list[str], lines2: list[str]) -> tuple[tuple[int, int], tuple[int, int]]:
+        """
+        Line-level alignment of hashed lines. Unlike difflib.ndiff, no character-level hints are computed,
+        which cost is quadratic in the length of replaced lines.
+        Decisions might differ from ndiff on 200+ lines with many repeated ones (blank lines, braces): ndiff turns
+        autojunk on, which ignores lines repeated in more than 1% of lines, so ends made of them are not matched.
+        autojunk=False matches every line, so a snippet is merged the same way, whatever its length.
+        :return: (index1, index2) of the first matching line, and offsets (from the end) of the last matching line.
+                 Both are (len(lines1), len(lines2)) if there are no matching lines at all
+        """
+        matcher = difflib.SequenceMatcher(None, lines1, lines2, autojunk=False)
+        blocks = [block for block in matcher.get_matching_blocks() if block.size > 0]
+        if len(blocks) == 0:
+            return (len(lines1), len(lines2)), (len(lines1), len(lines2))
+        first, last = blocks[0], blocks[-1]
+        return (first.a, first.b), (len(lines1) - last.a - last.size, len(lines2) - last.b - last.size)
+
     def _merge_from_both_ends(self, proposed_lines: list[str]) -> bool:
-        # merge starting code
-        line_diff: list[str] = list(difflib.ndiff(self.issue_lines, proposed_lines))
-        issue_lines_index: int = 0
-        prop_lines_index: int = 0
-
-        for i in range(len(line_diff)):  # loop until we find matching line
-            if line_diff[i].startswith("+ "):
-                prop_lines_index += 1
-            elif line_diff[i].startswith("- "):
-                issue_lines_index += 1
-            elif line_diff[i].startswith("  "):
-                proposed_lines = self.issue_lines[:issue_lines_index] + proposed_lines[prop_lines_index:]
-                break
-            else:
-                prop_lines_index += 1
-                issue_lines_index += 1
+        (issue_lines_index, prop_lines_index), bottom_indexes = self._matching_ends(self.issue_lines, proposed_lines)
+        found_match: bool = issue_lines_index < len(self.issue_lines)
+
+        # merge starting code: everything above the first matching line is taken from the original
+        if found_match:
+            proposed_lines = self.issue_lines[:issue_lines_index] + proposed_lines[prop_lines_index:]
 
         # safety_radius is a parameter to a Proposal, telling how many lines before and after the issue line to take
         # if issue_lines_index > self.safety_radius - we are outside of safety radius, so the code we want to fix
@@ -168,23 +180,11 @@ class SimpleProposal(DiffProposal):
             self.print_diff(self.issue_lines, proposed_lines)
             return False
 
-        # merge ending code
-        # line_diff = list(difflib.ndiff(self.issue_lines, proposed_lines))
+        # merge ending code: everything below the last matching line is taken from the original
         # even though these indexes are positive, they intend to measure offsets from bottom to up
-        issue_lines_index = 0
-        prop_lines_index = 0
-
-        for i in range(len(line_diff)):  # loop until we find matching line
-            if line_diff[-i - 1].startswith("+ "):
-                prop_lines_index += 1
-            elif line_diff[-i - 1].startswith("- "):
-                issue_lines_index += 1
-            elif line_diff[-i - 1].startswith("  "):
-                proposed_lines = proposed_lines[: -prop_lines_index - 1] + self.issue_lines[-issue_lines_index - 1 :]
-                break
-            else:
-                prop_lines_index += 1
-                issue_lines_index += 1
+        issue_lines_index, prop_lines_index = bottom_indexes
+        if found_match:
+            proposed_lines = proposed_lines[: -prop_lines_index - 1] + self.issue_lines[-issue_lines_index - 1 :]
 
         if issue_lines_index > self.safety_radius:
             # unsuccessful merge
@@ -205,22 +205,6 @@ class SimpleProposal(DiffProposal):
         :return:
         """
 
-        def find_first_match(list1: list[str], list2: list[str]) -> tuple[int, int]:
-            index1: int = 0
-            index2: int = 0
-            line_diff: list[str] = list(difflib.ndiff(list1, list2))
-            for i in range(len(line_diff)):  # loop until we find matching line
-                if line_diff[i].startswith("+ "):
-                    index2 += 1
-                elif line_diff[i].startswith("- "):
-                    index1 += 1
-                elif line_diff[i].startswith("  "):
-                    return index1, index2
-                else:
-                    index1 += 1
-                    index2 += 1
-            return index1, index2
-
         orig_issue_line_index: Final[int] = self.issue.issue_line - self.start_line
         issue_lines_start = self.issue_lines[:orig_issue_line_index]
         proposed_lines_start = proposed_lines[:found_issue_line_index]
@@ -230,8 +214,8 @@ class SimpleProposal(DiffProposal):
         issue_lines_end = self.issue_lines[orig_issue_line_index:]
         proposed_lines_end = proposed_lines[found_issue_line_index:]
 
-        issue_index_above, proposed_index_above = find_first_match(issue_lines_start, proposed_lines_start)
-        issue_index_below, proposed_index_below = find_first_match(issue_lines_end, proposed_lines_end)
+        issue_index_above, proposed_index_above = self._matching_ends(issue_lines_start, proposed_lines_start)[0]
+        issue_index_below, proposed_index_below = self._matching_ends(issue_lines_end, proposed_lines_end)[0]
 
         self.proposed_lines = (
             self.issue_lines[: orig_issue_line_index - issue_index_above]
@@ -0,0 +1,194 @@
+# Copyright: Hallux team, 2024
+
+# `hallux serve`: long-living daemon, which accepts fix jobs over a Unix domain socket.
+# Modules are imported once, while parsed configs, backends (with loaded caches)
+# and C++ build directories stay warm between jobs.
+
+from __future__ import annotations
+
+import copy
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import traceback
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Final
+
+import yaml
+
+from .auxiliary import find_argvalue, set_directory
+from .backends.query_backend import QueryBackend
+from .logger import handler, logger
+from .main import SOCKET_ENV
+
+
+def default_socket_path() -> Path:
+    return Path(os.environ.get(SOCKET_ENV, Path(tempfile.gettempdir()).joinpath(f"hallux-{os.getuid()}.sock")))
+
+
+class WarmState:
+    """
+    State, which is kept between jobs of the daemon.
+    Configs are re-loaded only when the config file changes, backends only when their settings change.
+    """
+
+    def __init__(self):
+        # config file -> (modification time, config)
+        self.configs: Final[dict[Path, tuple[float, dict]]] = {}
+        self.backends: Final[dict[str, QueryBackend]] = {}
+
+    def find_config(self, run_path: Path) -> tuple[dict, Path]:
+        from .main import CONFIG_FILE, Hallux
+
+        config_path = run_path
+        while not config_path.joinpath(CONFIG_FILE).exists() and config_path.parent != config_path:
+            config_path = config_path.parent
+        config_file = config_path.joinpath(CONFIG_FILE)
+        if not config_file.exists():
+            return {}, run_path
+
+        mtime = config_file.stat().st_mtime
+        if config_file not in self.configs or self.configs[config_file][0] != mtime:
+            config, config_path = Hallux.find_config(run_path)
+            self.configs[config_file] = (mtime, config)
+        # config might be modified by the job, e.g. by --model option
+        return copy.deepcopy(self.configs[config_file][1]), config_path
+
+    def init_backend(self, argv: list[str], config: dict, config_path: Path) -> QueryBackend:
+        from .backends.factory import BackendFactory
+
+        # all command-line options (DIR excluded) might select or override backends
+        key = yaml.dump(
+            [str(config_path), config.get("backends"), config.get("prompt.system"), config.get("hedge"), argv[1:-1]]
+        )
+        if key not in self.backends:
+            self.backends[key] = BackendFactory.init_backend(argv, config, config_path)
+        return self.backends[key]
+
+    def save(self) -> None:
+        for backend in self.backends.values():
+            backend.save()
+
+
+class SocketWriter(io.TextIOBase):
+    """
+    Forwards job output to the client, line by line
+    """
+
+    def __init__(self, wfile: Any):
+        self.wfile = wfile
+
+    def write(self, text: str) -> int:
+        send_message(self.wfile, {"output": text})
+        return len(text)
+
+
+def send_message(wfile: Any, message: dict) -> None:
+    wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+    wfile.flush()
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    """
+    Runs one job: {"argv": [...], "cwd": "..."} -> {"output": "..."}, ..., {"exit_code": N}
+    """
+
+    server: HalluxServer
+
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline().decode("utf-8"))
+        exit_code = self.server.run_job(request["argv"], Path(request["cwd"]), SocketWriter(self.wfile))
+        send_message(self.wfile, {"exit_code": exit_code})
+
+
+class HalluxServer(socketserver.UnixStreamServer):
+    """
+    Jobs are processed one at a time, since every job runs inside its own working directory
+    """
+
+    def __init__(self, socket_path: Path):
+        self.socket_path: Final[Path] = socket_path
+        self.state: Final[WarmState] = WarmState()
+        super().__init__(str(socket_path), JobHandler)
+
+    def run_job(self, argv: list[str], cwd: Path, output: io.TextIOBase) -> int:
+        from .main import main
+
+        log_level = logger.level
+        log_stream = handler.setStream(output)
+        try:
+            with set_directory(cwd), redirect_stdout(output):
+                return main(argv, run_path=cwd, warm_state=self.state)
+        except Exception:
+            output.write(traceback.format_exc())
+            return 1
+        finally:
+            self.state.save()
+            handler.setStream(log_stream)
+            logger.setLevel(log_level)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+def is_listening(socket_path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(socket_path))
+            return True
+        except OSError:
+            return False
+
+
+def serve(argv: list[str]) -> int:
+    """
+    `hallux serve [--socket PATH]`: runs daemon until interrupted
+    """
+    socket_path = Path(find_argvalue(argv, "--socket") or default_socket_path())
+    if socket_path.exists():
+        if is_listening(socket_path):
+            logger.error(f"Another hallux daemon already listens on {socket_path}")
+            return 1
+        socket_path.unlink()  # left by the crashed daemon
+
+    server = HalluxServer(socket_path)
+    logger.setLevel(logging.INFO)
+    logger.info(f"Hallux daemon listens on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.state.save()
+    return 0
+
+
+def run_client(argv: list[str], socket_path: Path, cwd: Path | None = None) -> int | None:
+    """
+    Sends job to the daemon and prints its output
+    :return: exit code of the job, or None if daemon is not available
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(socket_path))
+        except OSError:
+            return None
+        cwd = cwd or Path().resolve()
+        client.sendall((json.dumps({"argv": argv, "cwd": str(cwd)}) + "\n").encode("utf-8"))
+        with client.makefile("rb") as rfile:
+            for line in rfile:
+                message = json.loads(line.decode("utf-8"))
+                if "exit_code" in message:
+                    return message["exit_code"]
+                sys.stdout.write(message["output"])
+                sys.stdout.flush()
+    logger.error(f"Hallux daemon on {socket_path} closed connection unexpectedly")
+    return 1
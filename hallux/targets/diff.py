@@ -12,6 +12,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 
 from ..proposals.diff_proposal import DiffProposal
+from ..tracing import traced_methods
 
 
 # Interface for DiffTarget implementations
@@ -20,6 +21,7 @@ from ..proposals.diff_proposal import DiffProposal
 # * then checked/tested by some other means,
 # * if check was successful DiffProposal shall be finally committed
 # * otherwise reverted
+@traced_methods("target", "apply_diff", "revert_diff", "commit_diff")
 class DiffTarget(ABC):
     @abstractmethod
     def apply_diff(self, diff: DiffProposal) -> bool:
@@ -40,3 +42,10 @@ class DiffTarget(ABC):
                  Could be due-to line-numbers change, or other reasons.
         """
         pass
+
+    def scope(self) -> dict[str, set[int]] | None:
+        """
+        :return: files and their lines, which are able to receive fixes, e.g. changed lines of a pull-request.
+                 None if any line of any file might be fixed
+        """
+        return None
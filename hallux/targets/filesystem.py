@@ -4,7 +4,6 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from ..auxiliary import set_directory
 from ..proposals.diff_proposal import DiffProposal
 from .diff import DiffTarget
 
@@ -42,13 +41,13 @@ class FilesystemTarget(DiffTarget):
 
     def revert_diff(self) -> None:
         if self.existing_proposal is not None:
-            with set_directory(self.base_path):
-                with open(self.existing_proposal.filename, "wt") as file:
-                    all_lines = self.existing_proposal.all_lines
-                    for line in range(len(all_lines)):
-                        file.write(all_lines[line])
-                        # if line < len(all_lines) - 1:
-                        #     file.write("\n") #ToDo: do we need it now?
+            # same as open() from base_path, but without chdir, which affects all threads
+            with open(self.base_path.joinpath(self.existing_proposal.filename), "wt") as file:
+                all_lines = self.existing_proposal.all_lines
+                for line in range(len(all_lines)):
+                    file.write(all_lines[line])
+                    # if line < len(all_lines) - 1:
+                    #     file.write("\n") #ToDo: do we need it now?
 
             self.existing_proposal = None
             self.base_path = None
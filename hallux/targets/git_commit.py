@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import os
 import subprocess
+import threading
 from pathlib import Path
+from typing import Final
 
 from hallux.logger import logger
 
@@ -17,6 +19,9 @@ class GitCommitTarget(FilesystemTarget):
     Saves fixes into local git repo as individual commits
     """
 
+    # git index is shared by all copies of the target
+    git_lock: Final[threading.Lock] = threading.Lock()
+
     def __init__(self):
         # ToDo: assert we're in GIT repo, crash if not
         FilesystemTarget.__init__(self)
@@ -31,31 +36,29 @@ class GitCommitTarget(FilesystemTarget):
         FilesystemTarget.revert_diff(self)
 
     def commit_diff(self) -> bool:
-        curr_dir: str = os.getcwd()
         git_dir: str = str(Path(self.existing_proposal.filename).parent)
-        os.chdir(git_dir)
         success: bool = True
-        try:
-            logger.debug(f"git add {os.path.relpath(self.existing_proposal.filename, start=git_dir)}")
-            output = subprocess.check_output(
-                ["git", "add", os.path.relpath(self.existing_proposal.filename, start=git_dir)]
-            )
-            git_message = "HALLUX: " + self.existing_proposal.description.replace('"', "")
-
-            logger.debug(output.decode("utf8"))
-            logger.debug(f"git commit -m {git_message}")
-
-            output = subprocess.check_output(["git", "commit", "-m", f"{git_message}"])
-
-            logger.debug(output.decode("utf8"))
-            FilesystemTarget.commit_diff(self)
-        except subprocess.CalledProcessError as e:
-            logger.debug("ERROR:")
-            logger.debug(e.output.decode("utf8"))
-            FilesystemTarget.revert_diff(self)
-            success = False
-        finally:
-            os.chdir(curr_dir)
+        # `git -C` instead of chdir, since solvers might run concurrently in the same process
+        with GitCommitTarget.git_lock:
+            try:
+                logger.debug(f"git add {os.path.relpath(self.existing_proposal.filename, start=git_dir)}")
+                output = subprocess.check_output(
+                    ["git", "-C", git_dir, "add", os.path.relpath(self.existing_proposal.filename, start=git_dir)]
+                )
+                git_message = "HALLUX: " + self.existing_proposal.description.replace('"', "")
+
+                logger.debug(output.decode("utf8"))
+                logger.debug(f"git commit -m {git_message}")
+
+                output = subprocess.check_output(["git", "-C", git_dir, "commit", "-m", f"{git_message}"])
+
+                logger.debug(output.decode("utf8"))
+                FilesystemTarget.commit_diff(self)
+            except subprocess.CalledProcessError as e:
+                logger.debug("ERROR:")
+                logger.debug(e.output.decode("utf8"))
+                FilesystemTarget.revert_diff(self)
+                success = False
 
         return success
 
@@ -7,6 +7,7 @@ import os
 import subprocess
 
 from github import Github, GithubObject, PullRequest, Repository
+from unidiff import PatchSet
 
 from ..logger import logger
 from ..proposals.diff_proposal import DiffProposal
@@ -31,6 +32,8 @@ class GithubSuggestion(FilesystemTarget):
         self.github = Github(os.environ["GITHUB_TOKEN"], base_url=base_url)
         self.repo: Repository = self.github.get_repo(repo_name)
         self.pull_request: PullRequest = self.repo.get_pull(PR_ID)
+        # filename -> lines of its diff hunks, which might receive review comments. Filled on first use
+        self.changed_lines: dict[str, set[int]] | None = None
 
         if self.pull_request.closed_at is not None:  # self.pull_request.is_merged :
             raise SystemError(f"Pull Request {PR_ID} is either closed or merged already")
@@ -76,6 +79,33 @@ class GithubSuggestion(FilesystemTarget):
                 return base_url, repo_name, pr_id
         return None, None, None
 
+    @staticmethod
+    def patch_lines(patch: str, filename: str) -> set[int]:
+        """
+        :param patch: unified diff of a single file, with or without "---"/"+++" headers
+        :return: line numbers in the new file version, covered by diff hunks (added and context lines)
+        """
+        if not patch.startswith("--- "):
+            # github provides bare hunks
+            patch = f"--- a/{filename}\n+++ b/{filename}\n{patch}"
+        if not patch.endswith("\n"):
+            patch += "\n"
+        lines: set[int] = set()
+        for patched_file in PatchSet(patch):
+            for hunk in patched_file:
+                lines.update(line.target_line_no for line in hunk if line.target_line_no is not None)
+        return lines
+
+    def scope(self) -> dict[str, set[int]]:
+        if self.changed_lines is None:
+            # binary and too large files come without patch, and cannot be commented
+            self.changed_lines = {
+                file.filename: self.patch_lines(file.patch, file.filename) if file.patch else set()
+                for file in self.pull_request.get_files()
+                if file.status != "removed"
+            }
+        return self.changed_lines
+
     def apply_diff(self, diff: DiffProposal) -> bool:
         for file in self.pull_request.get_files():
             if diff.filename == file.filename:
@@ -52,6 +52,8 @@ class GitlabSuggestion(FilesystemTarget):
         self.changed_files: Final[dict[str, str]] = {}
         # mapping for diffs of changed files
         self.changed_diffs: Final[dict[str, str]] = {}
+        # filename -> lines of its diff hunks, which might receive suggestions. Filled on first use
+        self.changed_lines: dict[str, set[int]] | None = None
         for change in self.mr_json["changes"]:
             new_path = change["new_path"]
             if new_path is not None:  # new_path is None when file is deleted
@@ -113,6 +115,14 @@ class GitlabSuggestion(FilesystemTarget):
 
         return None
 
+    def scope(self) -> dict[str, set[int]]:
+        if self.changed_lines is None:
+            self.changed_lines = {
+                filename: GithubSuggestion.patch_lines(diff, filename) if diff else set()
+                for filename, diff in self.changed_diffs.items()
+            }
+        return self.changed_lines
+
     def apply_diff(self, diff: DiffProposal) -> bool:
         for file in self.changed_files:
             if diff.filename == file or file.endswith(diff.filename):
@@ -0,0 +1,32 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+from typing import Final
+
+from .filesystem import FilesystemTarget
+
+
+class SandboxTarget(FilesystemTarget):
+    """
+    Writes fixes into a sandbox copy of the project, used while solving issues in parallel.
+    Committed proposals are replayed afterwards through the real DiffTarget,
+    so here we only mimic how the real target changes local files.
+    """
+
+    def __init__(self, keep_changes: bool = True):
+        """
+        :param keep_changes: shall be equal to real_target.requires_refresh(),
+               i.e. False for targets, which revert local files after commit (Github/Gitlab suggestions)
+        """
+        FilesystemTarget.__init__(self)
+        self.keep_changes: Final[bool] = keep_changes
+
+    def commit_diff(self) -> bool:
+        if self.keep_changes:
+            return FilesystemTarget.commit_diff(self)
+        FilesystemTarget.revert_diff(self)
+        return True
+
+    def requires_refresh(self) -> bool:
+        return self.keep_changes
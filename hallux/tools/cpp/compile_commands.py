@@ -0,0 +1,58 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import json
+import shlex
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final
+
+# diagnostics only: no object files are written, fix-it hints are printed in machine-readable form
+CHECK_FLAGS: Final[list[str]] = ["-fsyntax-only", "-fdiagnostics-parseable-fixits"]
+
+
+@dataclass
+class CompileCommand:
+    """
+    Compilation of one translation unit, as recorded in compile_commands.json
+    """
+
+    directory: Path
+    file: Path
+    arguments: list[str]
+
+    @staticmethod
+    def load(path: Path) -> list[CompileCommand]:
+        """
+        :param path: compile_commands.json, e.g. generated by CMake with CMAKE_EXPORT_COMPILE_COMMANDS
+        :return: one command per source file, the first one if the file is compiled by several targets
+        """
+        try:
+            with open(path) as file:
+                entries = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            raise SystemError(f"Cannot read {path}: {e}") from e
+
+        commands: dict[Path, CompileCommand] = {}
+        for entry in entries:
+            directory = Path(entry["directory"])
+            source = directory.joinpath(entry["file"])
+            arguments = entry["arguments"] if "arguments" in entry else shlex.split(entry["command"])
+            if source not in commands:
+                commands[source] = CompileCommand(directory=directory, file=source, arguments=list(arguments))
+        return list(commands.values())
+
+    def check(self) -> str:
+        """
+        Compiles the translation unit for its diagnostics only, safe to run in parallel with other units
+        :return: compiler output, or empty string if compilation succeeded
+        """
+        try:
+            subprocess.check_output(self.arguments + CHECK_FLAGS, cwd=self.directory, stderr=subprocess.STDOUT)
+        except subprocess.CalledProcessError as e:
+            return e.output.decode("utf-8", errors="replace")
+        except OSError as e:
+            raise SystemError(f"Cannot compile {self.file}: {e}") from e
+        return ""
@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Final
@@ -15,7 +16,11 @@ from ...auxiliary import set_directory
 from ...backends.query_backend import QueryBackend
 from ...issues.issue import IssueDescriptor
 from ...targets.diff import DiffTarget
+from ..validity_cache import ValidityCache
+from .compile_commands import CompileCommand
+from .issue import CppIssue
 from .make_target_solver import IssueSolver, MakeTargetSolver
+from .translation_unit_solver import TranslationUnitSolver
 
 
 @dataclass
@@ -27,6 +32,11 @@ class CompileTarget:
 class Cpp_IssueSolver(IssueSolver):
     makefile: Final[str] = "Makefile"
     cmakelists: Final[str] = "CMakeLists.txt"
+    compile_commands_json: Final[str] = "compile_commands.json"
+    # solves issues inside Makefile directory, i.e. changes working directory of the whole process
+    concurrent_safe: bool = False
+    # CMake build directories, one per CMakeLists.txt directory
+    build_dirs: dict[Path, tempfile.TemporaryDirectory] = {}
 
     def __init__(
         self,
@@ -34,14 +44,47 @@ class Cpp_IssueSolver(IssueSolver):
         run_path: Path,
         command_dir: str = ".",
         validity_test: str | None = None,
+        jobs: int = 1,
+        pipeline: dict[str, int] | bool | None = None,
+        batch: int = 1,
+        speculative: bool = False,
+        validity_cache: ValidityCache | None = None,
+        test_impact: dict[str, str | int] | bool | None = None,
+        warm_runner: dict[str, str | list[str]] | bool | None = None,
+        compile_commands: bool | str = False,
     ):
-        super().__init__(config_path, run_path, command_dir, validity_test=validity_test)
+        """
+        :param compile_commands: compile translation units of compile_commands.json in parallel, instead of
+            making object targets one by one. True looks for it in command_dir, build/ or CMake build directory
+        """
+        super().__init__(
+            config_path,
+            run_path,
+            command_dir,
+            validity_test=validity_test,
+            jobs=jobs,
+            pipeline=pipeline,
+            batch=batch,
+            speculative=speculative,
+            validity_cache=validity_cache,
+            test_impact=test_impact,
+            warm_runner=warm_runner,
+        )
         self.tmp_dir: tempfile.TemporaryDirectory | None = None
+        self.compile_commands: Final[bool | str] = compile_commands
 
     def list_issues(self) -> list[IssueDescriptor]:
         return []
 
     def solve_issues(self, diff_target: DiffTarget, query_backend: QueryBackend):
+        if self.compile_commands:
+            compile_commands_path = self.find_compile_commands()
+            if compile_commands_path is not None:
+                print("Process C/C++:")
+                self.solve_compile_commands(diff_target, query_backend, compile_commands_path)
+                return
+            logger.warning(f"Process C/C++: cannot find `{self.compile_commands_json}`, making Makefile targets")
+
         makefile_path: Path
         # Try some options for searching Makefile / CMakelists.txt
         if self.run_path.joinpath(self.command_dir, self.makefile).exists():
@@ -61,11 +104,31 @@ class Cpp_IssueSolver(IssueSolver):
         with set_directory(makefile_path.parent):
             self.solve_make_compile(diff_target, query_backend, makefile_path)
 
+    @staticmethod
+    def fixit_flags(env_flags: str) -> str:
+        """
+        :param env_flags: environment variable, which CMake would otherwise use for initial compiler flags
+        :return: flags, which make GCC and Clang print machine-readable fix-it hints along with diagnostics
+        """
+        return " ".join(filter(None, [os.environ.get(env_flags, ""), "-fdiagnostics-parseable-fixits"]))
+
     def makefile_from_cmake(self, cmake_path: Path) -> Path | None:
-        self.tmp_dir = tempfile.TemporaryDirectory()
+        # build directory lives as long as the process, so `hallux serve` re-configures and re-builds incrementally
+        if cmake_path not in Cpp_IssueSolver.build_dirs:
+            Cpp_IssueSolver.build_dirs[cmake_path] = tempfile.TemporaryDirectory()
+        self.tmp_dir = Cpp_IssueSolver.build_dirs[cmake_path]
         with set_directory(Path(self.tmp_dir.name)):
             try:
-                subprocess.check_output(["cmake", f"{str(cmake_path)}"])
+                subprocess.check_output(
+                    [
+                        "cmake",
+                        "--no-warn-unused-cli",
+                        "-DCMAKE_EXPORT_COMPILE_COMMANDS=ON",
+                        f"-DCMAKE_C_FLAGS={self.fixit_flags('CFLAGS')}",
+                        f"-DCMAKE_CXX_FLAGS={self.fixit_flags('CXXFLAGS')}",
+                        f"{str(cmake_path)}",
+                    ]
+                )
                 logger.info("CMake initialized successfully")
             except subprocess.CalledProcessError as e:
                 cmake_output = e.output.decode("utf-8")
@@ -74,6 +137,55 @@ class Cpp_IssueSolver(IssueSolver):
 
             return Path(self.tmp_dir.name).joinpath(self.makefile)
 
+    def find_compile_commands(self) -> Path | None:
+        if isinstance(self.compile_commands, str):
+            path = self.run_path.joinpath(self.compile_commands)
+            if not path.exists():
+                raise SystemError(f"compile_commands: {path} does not exist")
+            return path
+        for path in [
+            self.run_path.joinpath(self.command_dir, self.compile_commands_json),
+            self.run_path.joinpath("build", self.compile_commands_json),
+        ]:
+            if path.exists():
+                return path
+        if self.run_path.joinpath(self.command_dir, self.cmakelists).exists():
+            makefile_path = self.makefile_from_cmake(self.run_path.joinpath(self.command_dir))
+            path = makefile_path.parent.joinpath(self.compile_commands_json)
+            if path.exists():
+                return path
+        return None
+
+    def solve_compile_commands(self, diff_target: DiffTarget, query_backend: QueryBackend, path: Path):
+        """
+        Compiles all translation units in parallel for the initial diagnostics,
+        then solves diagnostics of every unit by its own TranslationUnitSolver
+        """
+        commands: list[CompileCommand] = CompileCommand.load(path)
+        logger.info(f"{len(commands)} translation units found")
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="compile") as executor:
+            outputs: list[str] = list(executor.map(CompileCommand.check, commands))
+
+        attempted: set[tuple[str, str, str]] = set()
+        fixed: int = 0
+        for command, output in zip(commands, outputs):
+            with set_directory(command.directory):
+                issues: list[CppIssue] = CppIssue.parseMakeIssues(output)
+            if len(issues) == 0:
+                continue
+            solver = TranslationUnitSolver(
+                command,
+                batch=self.batch,
+                speculative=self.speculative,
+                # committed fixes, e.g. of shared headers, might have changed diagnostics of this unit
+                issues=issues if fixed == 0 else None,
+                attempted=attempted,
+            )
+            solver.journal = self.journal
+            solver.issue_scheduler = self.issue_scheduler
+            solver.solve_issues(diff_target=diff_target, query_backend=query_backend)
+            fixed += solver.fixed
+
     def solve_make_compile(self, diff_target: DiffTarget, query_backend: QueryBackend, makefile_path: Path):
         makefile_dir: Path = makefile_path.parent
 
@@ -83,7 +195,14 @@ class Cpp_IssueSolver(IssueSolver):
         logger.info(f"{len(compile_targets)} Makefile targets found")
         target: CompileTarget
         for target in compile_targets:
-            solver = MakeTargetSolver(run_path=target.makefile_dir, make_target=target.target)
+            solver = MakeTargetSolver(
+                run_path=target.makefile_dir,
+                make_target=target.target,
+                batch=self.batch,
+                speculative=self.speculative,
+            )
+            solver.journal = self.journal
+            solver.issue_scheduler = self.issue_scheduler
             solver.solve_issues(diff_target=diff_target, query_backend=query_backend)
 
     def list_compile_targets(self, makefile_dir: Path, compile_targets: list[CompileTarget]):
@@ -0,0 +1,115 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+from ...proposals.diff_proposal import DiffProposal
+
+if TYPE_CHECKING:
+    from .issue import CppIssue
+
+# fix-it:"file.cpp":{3:13-3:13}:";" as printed by GCC and Clang with -fdiagnostics-parseable-fixits
+FIXIT_LINE: Final[re.Pattern] = re.compile(
+    r'^fix-it:"(?P<filename>(?:[^"\\]|\\.)*)":\{(?P<start_line>\d+):(?P<start_column>\d+)-'
+    r'(?P<end_line>\d+):(?P<end_column>\d+)\}:"(?P<replacement>(?:[^"\\]|\\.)*)"$'
+)
+ESCAPES: Final[dict[str, bytes]] = {"n": b"\n", "t": b"\t", "r": b"\r", "\\": b"\\", '"': b'"'}
+
+
+def unescape(text: str) -> str:
+    """
+    Compilers escape quotes, backslashes, control characters, and every byte of non-ASCII characters in octal
+    """
+    result = bytearray()
+    for match in re.finditer(r"\\([0-7]{3}|.)|([^\\]+)", text, flags=re.DOTALL):
+        escaped, plain = match.groups()
+        if plain is not None:
+            result += plain.encode("utf-8")
+        elif len(escaped) == 3:
+            result.append(int(escaped, 8))
+        else:
+            result += ESCAPES.get(escaped, escaped.encode("utf-8"))
+    return result.decode("utf-8", errors="replace")
+
+
+@dataclass
+class FixIt:
+    """
+    Replacement of [start, end) range, lines and byte columns are 1-based
+    """
+
+    filename: str
+    start_line: int
+    start_column: int
+    end_line: int
+    end_column: int
+    replacement: str
+
+    @staticmethod
+    def parse(line: str) -> FixIt | None:
+        match = FIXIT_LINE.match(line)
+        if match is None:
+            return None
+        return FixIt(
+            filename=unescape(match.group("filename")),
+            start_line=int(match.group("start_line")),
+            start_column=int(match.group("start_column")),
+            end_line=int(match.group("end_line")),
+            end_column=int(match.group("end_column")),
+            replacement=unescape(match.group("replacement")),
+        )
+
+
+class FixItProposal(DiffProposal):
+    """
+    Applies compiler fix-it hints of the issue directly, without querying backends
+    """
+
+    def __init__(self, issue: CppIssue):
+        super().__init__(issue.filename, issue.description, issue.issue_line)
+        with open(issue.filename) as file:
+            self.all_lines = file.read().splitlines(keepends=True)
+
+        path = Path(issue.filename).resolve()
+        fixits: list[FixIt] = []
+        for fixit in issue.fixits:
+            if Path(fixit.filename).resolve() != path or (fixit.start_line, fixit.start_column) > (
+                fixit.end_line,
+                fixit.end_column,
+            ):
+                continue
+            # notes might suggest alternatives: the first hint wins, overlapping or touching ones are dropped
+            if all(
+                (fixit.end_line, fixit.end_column) < (other.start_line, other.start_column)
+                or (other.end_line, other.end_column) < (fixit.start_line, fixit.start_column)
+                for other in fixits
+            ):
+                fixits.append(fixit)
+        self.fixits: list[FixIt] = fixits
+
+        if len(fixits) == 0 or max(fixit.end_line for fixit in fixits) > len(self.all_lines) + 1:
+            return
+        self.start_line = min(fixit.start_line for fixit in fixits)
+        self.end_line = min(max(fixit.end_line for fixit in fixits), len(self.all_lines))
+        self.issue_lines = self.all_lines[self.start_line - 1 : self.end_line]
+
+        code: bytes = "".join(self.issue_lines).encode("utf-8")
+        # byte offset of every line start within the code, and of the line after
+        offsets: list[int] = [0]
+        for line in self.issue_lines:
+            offsets.append(offsets[-1] + len(line.encode("utf-8")))
+        for fixit in sorted(fixits, key=lambda hint: (hint.start_line, hint.start_column), reverse=True):
+            start = offsets[fixit.start_line - self.start_line] + fixit.start_column - 1
+            end = offsets[fixit.end_line - self.start_line] + fixit.end_column - 1
+            code = code[:start] + fixit.replacement.encode("utf-8") + code[end:]
+        self.proposed_lines = code.decode("utf-8", errors="replace").splitlines(keepends=True)
+
+    def is_applicable(self) -> bool:
+        return len(self.fixits) > 0 and self.start_line > 0
+
+    def try_fixing(self, query_backend, diff_target) -> bool:
+        return self.is_applicable() and diff_target.apply_diff(self)
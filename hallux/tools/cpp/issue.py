@@ -7,6 +7,7 @@ from pathlib import Path
 from ...issues.issue import IssueDescriptor
 from ...proposals.proposal_engine import ProposalEngine, ProposalList
 from ...proposals.simple_proposal import SimpleProposal
+from .fixit import FixIt
 
 
 class CppIssue(IssueDescriptor):
@@ -15,6 +16,8 @@ class CppIssue(IssueDescriptor):
             language="cpp", tool="compile", filename=filename, issue_line=issue_line, description=description
         )
         self.issue_type = "compilation"
+        # machine-applicable hints of the diagnostic and its notes, with -fdiagnostics-parseable-fixits
+        self.fixits: list[FixIt] = []
 
     def list_proposals(self) -> ProposalEngine:
         return ProposalList(
@@ -54,7 +57,10 @@ class CppIssue(IssueDescriptor):
                 current_issue.debug = debug
 
             elif current_issue is not None:
-                if output_lines[line_num].startswith("make"):
+                fixit = FixIt.parse(output_lines[line_num])
+                if fixit is not None:
+                    current_issue.fixits.append(fixit)
+                elif output_lines[line_num].startswith("make"):
                     issues.append(current_issue)
                     current_issue = None
                 else:
@@ -11,14 +11,20 @@ from hallux.logger import logger
 from ...auxiliary import set_directory
 from ...backends.query_backend import QueryBackend
 from ...issues.issue import IssueDescriptor
+from ...proposals.diff_proposal import DiffProposal
 from ...targets.diff import DiffTarget
+from ...tools.cpp.fixit import FixItProposal
 from ...tools.cpp.issue import CppIssue
 from ...tools.issue_solver import IssueSolver
 
 
 class MakeTargetSolver(IssueSolver):
-    def __init__(self, run_path: Path, make_target: str, config_path: Path = Path()):
-        super().__init__(config_path=config_path, run_path=run_path)
+    concurrent_safe: bool = False
+
+    def __init__(
+        self, run_path: Path, make_target: str, config_path: Path = Path(), batch: int = 1, speculative: bool = False
+    ):
+        super().__init__(config_path=config_path, run_path=run_path, batch=batch, speculative=speculative)
         # self.makefile_dir: Final[Path] = makefile_dir
         self.make_target: Final[str] = make_target
 
@@ -27,6 +33,25 @@ class MakeTargetSolver(IssueSolver):
         with set_directory(self.run_path):
             super().solve_issues(diff_target, query_backend)
 
+    def solve_issue(
+        self, issue: IssueDescriptor, diff_target: DiffTarget, query_backend: QueryBackend
+    ) -> DiffProposal | None:
+        """
+        Applies compiler fix-it hints first, backends are only queried if there are none or they do not compile
+        """
+        if isinstance(issue, CppIssue) and len(issue.fixits) > 0:
+            proposal = FixItProposal(issue)
+            if (
+                proposal.try_fixing(query_backend, diff_target)
+                and self.is_issue_fixed(issue, proposal)
+                and diff_target.commit_diff()
+            ):
+                logger.info(f"{issue.filename}:{issue.issue_line}: fixed by compiler fix-it hints")
+                self.used_backend = None
+                return proposal
+            diff_target.revert_diff()
+        return super().solve_issue(issue, diff_target, query_backend)
+
     def list_issues(self) -> list[IssueDescriptor]:
         issues: list[IssueDescriptor] = []
 
@@ -0,0 +1,84 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Final
+
+from hallux.logger import logger
+
+from ...auxiliary import set_directory
+from ...backends.query_backend import QueryBackend
+from ...issues.issue import IssueDescriptor
+from ...proposals.diff_proposal import DiffProposal
+from ...targets.diff import DiffTarget
+from ...tools.cpp.compile_commands import CompileCommand
+from ...tools.cpp.issue import CppIssue
+from ...tools.issue_solver import IssueSolver
+from .make_target_solver import MakeTargetSolver
+
+
+class TranslationUnitSolver(MakeTargetSolver):
+    """
+    Solves diagnostics of one translation unit, re-compiling only this unit by its compile_commands.json command
+    """
+
+    def __init__(
+        self,
+        command: CompileCommand,
+        config_path: Path = Path(),
+        batch: int = 1,
+        speculative: bool = False,
+        issues: list[CppIssue] | None = None,
+        attempted: set[tuple[str, str, str]] | None = None,
+    ):
+        """
+        :param issues: diagnostics of the initial parallel compilation, listed instead of compiling the unit again
+        :param attempted: fingerprints of issues, already tried by solvers of other units, e.g. in shared headers
+        """
+        super().__init__(
+            run_path=command.directory,
+            make_target=str(command.file),
+            config_path=config_path,
+            batch=batch,
+            speculative=speculative,
+        )
+        self.command: Final[CompileCommand] = command
+        self.initial_issues: list[CppIssue] | None = issues
+        self.attempted: Final[set[tuple[str, str, str]]] = attempted if attempted is not None else set()
+        # fingerprints of issues tried by this solver, shared with the next units once it is finished
+        self.tried: set[tuple[str, str, str]] = set()
+        # number of committed fixes, diagnostics of other units might be outdated since
+        self.fixed: int = 0
+
+    def solve_issues(self, diff_target: DiffTarget, query_backend: QueryBackend):
+        logger.info(f"{self.command.file} : compile_commands.json")
+        try:
+            with set_directory(self.run_path):
+                IssueSolver.solve_issues(self, diff_target, query_backend)
+        finally:
+            self.attempted.update(self.tried)
+
+    def list_issues(self) -> list[IssueDescriptor]:
+        if self.initial_issues is not None:
+            issues: list[IssueDescriptor] = list(self.initial_issues)
+            self.initial_issues = None
+            return issues
+        return list(CppIssue.parseMakeIssues(self.command.check()))
+
+    def is_finished(self, issue: IssueDescriptor) -> bool:
+        if issue.fingerprint() in self.attempted:
+            return True
+        return super().is_finished(issue)
+
+    def report_outcome(
+        self,
+        issue: IssueDescriptor,
+        fixed: bool,
+        proposal: DiffProposal | None = None,
+        backend: QueryBackend | None = None,
+    ) -> None:
+        self.tried.add(issue.fingerprint())
+        if fixed:
+            self.fixed += 1
+        super().report_outcome(issue, fixed, proposal, backend)
@@ -4,12 +4,9 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from ..auxiliary import find_arg, find_argvalue
-from ..tools.cpp.cpp import Cpp_IssueSolver
+from ..auxiliary import find_arg, find_argvalue, load_class
 from ..tools.issue_solver import IssueSolver
-from ..tools.mypy.solver import Mypy_IssueSolver
-from ..tools.ruff.solver import Ruff_IssueSolver
-from ..tools.sonarqube.solver import Sonar_IssueSolver
+from ..tools.validity_cache import ValidityCache
 
 
 class ToolsFactory:
@@ -21,13 +18,19 @@ class ToolsFactory:
         config_path: Path,
         run_path: Path,
         command_dir: str = ".",
+        jobs: int = 1,
+        pipeline: dict[str, int] | bool | None = None,
+        batch: int = 1,
+        speculative: bool = False,
+        validity_cache: ValidityCache | None = None,
     ) -> list[IssueSolver]:
         tools_config = tools_config if tools_config is not None else {}
-        mapping: dict = {
-            "ruff": Ruff_IssueSolver,
-            "mypy": Mypy_IssueSolver,
-            "sonar": Sonar_IssueSolver,
-            "cpp": Cpp_IssueSolver,
+        # solver modules are imported only when requested
+        mapping: dict[str, str] = {
+            "ruff": "hallux.tools.ruff.solver:Ruff_IssueSolver",
+            "mypy": "hallux.tools.mypy.solver:Mypy_IssueSolver",
+            "sonar": "hallux.tools.sonarqube.solver:Sonar_IssueSolver",
+            "cpp": "hallux.tools.cpp.cpp:Cpp_IssueSolver",
         }
 
         groups = (
@@ -59,7 +62,7 @@ class ToolsFactory:
 
         solvers: list[IssueSolver] = []
         for name in requested_names:
-            classname = mapping[name]
+            classname = load_class(mapping[name])
             config_params = tools_config.get(name, {})
             argvalue = find_argvalue(argv, "--" + name)
             if argvalue is not None:
@@ -72,6 +75,11 @@ class ToolsFactory:
                     if composite_value is not None:
                         config_params[composite_name] = composite_value
 
+            config_params.setdefault("jobs", jobs)
+            config_params.setdefault("pipeline", pipeline)
+            config_params.setdefault("batch", batch)
+            config_params.setdefault("speculative", speculative)
+            config_params.setdefault("validity_cache", validity_cache)
             solver = classname(**config_params, config_path=config_path, run_path=run_path, command_dir=command_dir)
             solvers.append(solver)
 
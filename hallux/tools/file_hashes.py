@@ -0,0 +1,53 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import hashlib
+import os
+import stat
+import threading
+import time
+from typing import Final
+
+
+class FileHashes:
+    """
+    Content hashes of files, re-computed only when file is modified (by mtime, ctime, inode and size).
+    Rewrite of the same size within timestamp granularity of the filesystem keeps all of them, e.g. a fix,
+    reverted right after validation. Hence hashes of files, modified within the last second, are never reused.
+    """
+
+    # files modified that recently are re-hashed on every request
+    racy_ns: Final[int] = 1_000_000_000
+
+    def __init__(self):
+        self.lock: Final[threading.Lock] = threading.Lock()
+        # absolute filename -> ((mtime_ns, ctime_ns, inode, size), content hash)
+        self.hashes: Final[dict[str, tuple[tuple[int, int, int, int], str]]] = {}
+
+    def get(self, filename: str) -> str:
+        """
+        :return: sha256 of file contents, "-" for missing files and non-regular files
+        """
+        try:
+            file_stat = os.stat(filename)
+        except OSError:
+            # deleted, but still tracked by git
+            return "-"
+        if not stat.S_ISREG(file_stat.st_mode):
+            # e.g. git submodule
+            return "-"
+        signature = (file_stat.st_mtime_ns, file_stat.st_ctime_ns, file_stat.st_ino, file_stat.st_size)
+        with self.lock:
+            cached = self.hashes.get(filename)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        racy = time.time_ns() - file_stat.st_mtime_ns < self.racy_ns
+        with open(filename, "rb") as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+        with self.lock:
+            if racy:
+                self.hashes.pop(filename, None)
+            else:
+                self.hashes[filename] = (signature, digest)
+        return digest
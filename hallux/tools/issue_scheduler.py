@@ -0,0 +1,124 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import math
+import re
+import subprocess
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Final
+
+from ..backends.query_backend import QueryBackend
+from ..issues.issue import IssueDescriptor
+from ..logger import logger
+
+
+class RunBudget:
+    """
+    Wall-clock and token limits of the whole run, shared by all solvers
+    """
+
+    def __init__(self, max_time: float | None = None, max_tokens: int | None = None):
+        """
+        :param max_time: seconds since budget creation
+        :param max_tokens: tokens, spent by all backends of the chain since the first check of the budget
+        """
+        self.max_time: Final[float | None] = max_time
+        self.max_tokens: Final[int | None] = max_tokens
+        self.start_time: Final[float] = time.monotonic()
+        # spent before the run, e.g. by backends, which `hallux serve` keeps between jobs
+        self.start_tokens: int | None = None
+
+    def spent_tokens(self, query_backend: QueryBackend, parallel_tokens: int = 0) -> int:
+        """
+        :param parallel_tokens: spent by parallel workers, not counted by backends of this process
+        """
+        total_tokens = query_backend.total_tokens()
+        if self.start_tokens is None:
+            self.start_tokens = total_tokens
+        return total_tokens - self.start_tokens + parallel_tokens
+
+    def exhausted(self, query_backend: QueryBackend, parallel_tokens: int = 0) -> bool:
+        if self.max_time is not None and time.monotonic() - self.start_time >= self.max_time:
+            return True
+        return self.max_tokens is not None and self.spent_tokens(query_backend, parallel_tokens) >= self.max_tokens
+
+
+class IssueScheduler:
+    """
+    Orders issues by expected value, so limited budget brings as many fixes as possible.
+    Expected value = chance of success (historical success rate of the rule) * severity * file churn bonus.
+    Stops solving, when RunBudget is used up.
+    Success rates come from previous runs only, so the order stays the same while issues are re-listed.
+    """
+
+    severity: Final[dict[str, float]] = {"error": 3.0, "bug": 3.0, "vulnerability": 3.0, "warning": 2.0}
+    default_severity: Final[float] = 1.0
+
+    def __init__(self, budget: RunBudget | None = None, history: list[dict] | None = None, churn_commits: int = 500):
+        """
+        :param history: RunJournal records of the previous runs
+        :param churn_commits: how many latest git commits are used to count file changes
+        """
+        self.budget: Final[RunBudget | None] = budget
+        self.churn_commits: Final[int] = churn_commits
+        self.churn: Counter[str] | None = None
+        # (tool, rule) -> [fixed, attempted]
+        self.success: Final[dict[tuple[str, str], list[int]]] = {}
+        for record in history or []:
+            self.update(record["tool"], self.rule_code(record["description"]), record["fixed"])
+        self.budget_reported: bool = False
+
+    @staticmethod
+    def rule_code(description: str) -> str:
+        """
+        Extracts rule code, like ruff's "F401 ..." or mypy's "... [attr-defined]"
+        """
+        match = re.search(r"\[([\w-]+)]\s*$", description)
+        if match is not None:
+            return match.group(1)
+        first_word = description.split(" ", 1)[0]
+        return first_word if re.fullmatch(r"[A-Z]+\d+", first_word) else description
+
+    def update(self, tool: str, rule: str, fixed: bool) -> None:
+        stats = self.success.setdefault((tool, rule), [0, 0])
+        stats[0] += int(fixed)
+        stats[1] += 1
+
+    def file_churn(self, filename: str) -> int:
+        if self.churn is None:
+            self.churn = Counter()
+            try:
+                git_log = subprocess.check_output(
+                    ["git", "log", f"-{self.churn_commits}", "--format=", "--name-only", "--relative"],
+                    stderr=subprocess.DEVNULL,
+                )
+                self.churn.update(line for line in git_log.decode("utf8").splitlines() if line != "")
+            except (subprocess.CalledProcessError, OSError):
+                logger.debug("File churn is not available outside of git repo")
+        return self.churn[str(Path(filename))]
+
+    def expected_value(self, issue: IssueDescriptor) -> float:
+        fixed, attempted = self.success.get((issue.tool, self.rule_code(issue.description)), [0, 0])
+        # Laplace smoothing: unknown rules get 50% chance
+        success_rate = (fixed + 1) / (attempted + 2)
+        severity = self.severity.get(issue.issue_type.lower(), self.default_severity)
+        if issue.description.startswith("error"):
+            severity = max(severity, self.severity["error"])
+        return success_rate * severity * (1.0 + math.log1p(self.file_churn(issue.filename)))
+
+    def order(self, issues: list[IssueDescriptor]) -> list[IssueDescriptor]:
+        """
+        Stable ordering: the same issues are ordered the same way after re-listing
+        """
+        return sorted(issues, key=lambda issue: (-self.expected_value(issue), issue.filename, issue.issue_line))
+
+    def exhausted(self, query_backend: QueryBackend, parallel_tokens: int = 0) -> bool:
+        if self.budget is None or not self.budget.exhausted(query_backend, parallel_tokens):
+            return False
+        if not self.budget_reported:
+            self.budget_reported = True
+            logger.warning("Time or token budget is used up, remaining issues are left unsolved")
+        return True
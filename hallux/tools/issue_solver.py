@@ -2,51 +2,123 @@
 
 from __future__ import annotations
 
+import copy
+import os
 import subprocess
+import threading
 from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Final
+from typing import TYPE_CHECKING, ContextManager, Final
 
 from hallux.logger import logger
 
-from ..auxiliary import set_directory
 from ..backends.query_backend import QueryBackend
 from ..issues.issue import IssueDescriptor
+from ..proposals.batch_proposal import BatchProposal
 from ..proposals.diff_proposal import DiffProposal
 from ..targets.diff import DiffTarget
+from ..targets.sandbox import SandboxTarget
+from ..tracing import traced_methods
+from .sandbox import Sandbox
+from .test_impact import TestImpact
+from .warm_runner import WarmTestRunner
 
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from multiprocessing.sharedctypes import Synchronized
 
+    from .issue_scheduler import IssueScheduler
+    from .journal import RunJournal
+    from .scheduler import FileLockManager
+    from .validity_cache import ValidityCache
+
+
+@traced_methods("tool", "list_issues", "list_file_issues", "solve_issue", "is_issue_fixed")
 class IssueSolver(ABC):
     """
     Base abstract class for issue solving.
     For every tool such as 'ruff', or 'make', one need to inherit a class out and define list_issues()
     Issues repeatedly solved one-by-one, with check that fix was appropriate (is_issue_fixed func is used).
     If fix wasn't successful, we ignore issue (and revert corresponding fix) and go to the next one.
+    With jobs > 1 issues from different files are solved in parallel, each worker inside its own Sandbox.
+    With pipeline settings issues are solved by IssuePipeline, which overlaps backend queries with validation.
+    With batch > 1 nearby issues of the same file are first tried together, by one BatchProposal.
+    With speculative=True all proposals of an issue are queried at once, and validated in their order.
+    Solvers of different tools might run concurrently in SolverScheduler, locking every file they modify.
     """
 
+    # False for solvers, which change working directory of the whole process while solving
+    concurrent_safe: bool = True
+    # code lines around the first and the last issue of the batch
+    batch_radius: Final[int] = 4
+    # issues of the same batch are at most that many lines apart
+    batch_span: Final[int] = 20
+    # TODO: parametrize
+    multi_backend_iters: Final[int] = 10
+
     def __init__(
         self,
         config_path: Path,
         run_path: Path,
         command_dir: str = ".",
         validity_test: str | None = None,
+        jobs: int = 1,
+        pipeline: dict[str, int] | bool | None = None,
+        batch: int = 1,
+        speculative: bool = False,
+        validity_cache: ValidityCache | None = None,
+        test_impact: dict[str, str | int] | bool | None = None,
+        warm_runner: dict[str, str | list[str]] | bool | None = None,
     ):
         self.config_path: Final[Path] = config_path
         self.run_path: Final[Path] = run_path
         self.command_dir: Final[str] = command_dir
         self.validity_test: Final[str] = validity_test
+        self.jobs: Final[int] = max(1, int(jobs))
+        # `pipeline: true` in config turns pipeline on with default limits
+        self.pipeline: Final[dict[str, int] | None] = {} if pipeline is True else (pipeline or None)
+        # max number of issues, fixed by one backend request
+        self.batch: Final[int] = max(1, int(batch))
+        # query backends for all proposals of an issue at once, see solve_issue_speculatively()
+        self.speculative: Final[bool] = bool(speculative)
+        # outcomes of validity_test for already tested project trees
+        self.validity_cache: Final[ValidityCache | None] = validity_cache
+        # validates fixes by tests, which execute changed lines. `test_impact: true` in config uses defaults
+        self.test_impact: Final[TestImpact | None] = (
+            TestImpact(config_path, **({} if test_impact is True else test_impact))
+            if test_impact and validity_test is not None
+            else None
+        )
+        # runs validity tests with pytest in forks of a warm worker. `warm_runner: true` in config uses defaults
+        self.warm_runner: Final[WarmTestRunner | None] = (
+            WarmTestRunner(**({} if warm_runner is True else warm_runner))
+            if warm_runner and validity_test is not None and hasattr(os, "fork")
+            else None
+        )
+        # (filename, issues) listed by the latest is_issue_fixed() call, reused by refresh_issues().
+        # filename is None, when the whole command_dir was listed
+        self.rechecked_issues: tuple[str | None, list[IssueDescriptor]] | None = None
+        self.target_issues: list[IssueDescriptor] = []
+        # set by SolverScheduler, while running concurrently with other solvers
+        self.file_locks: FileLockManager | None = None
+        # set by Hallux, records outcome of every issue, and skips issues, finished by the previous run
+        self.journal: RunJournal | None = None
+        # set by Hallux, orders issues by expected value and stops when time or token budget is used up
+        self.issue_scheduler: IssueScheduler | None = None
+        # backend, which provided the latest successful fix
+        self.used_backend: QueryBackend | None = None
+        # files and lines, able to receive fixes, set from DiffTarget.scope() by solve_issues(). None means all
+        self.scope: dict[str, set[int]] | None = None
 
         if validity_test is not None:
-            try:
-                logger.info(f"Try running validity test: {validity_test} ...")
-
-                with set_directory(self.config_path):
-                    subprocess.check_output(
-                        ["bash"] + validity_test.split(" "),
-                    )
-                    logger.info("\033[92m PASSED\033[0m")
-            except subprocess.CalledProcessError as e:
-                raise SystemError(f"Validity Test '{validity_test}' is failing right from the start") from e
+            logger.info(f"Try running validity test: {validity_test} ...")
+            if not self.run_validity_test():
+                raise SystemError(f"Validity Test '{validity_test}' is failing right from the start")
+            if self.test_impact is not None:
+                self.test_impact.build_map()
 
     @abstractmethod
     def list_issues(self) -> list[IssueDescriptor]:
@@ -56,81 +128,702 @@ class IssueSolver(ABC):
         """
         pass
 
-    def is_issue_fixed(self) -> bool:
+    def list_file_issues(self, filename: str) -> list[IssueDescriptor] | None:
         """
+        May be implemented in child class, in order to re-check single file instead of the whole command_dir
+        :return: List of issues for the file, or None if solver is not able to check single files
+        """
+        return None
+
+    def list_issues_in_files(self, filenames: list[str]) -> list[IssueDescriptor] | None:
+        """
+        May be implemented in child class, in order to check only given files instead of the whole command_dir
+        :param filenames: existing files under command_dir
+        :return: List of issues for the files, or None if solver is not able to check selected files
+        """
+        return None
+
+    def list_scoped_issues(self) -> list[IssueDescriptor]:
+        """
+        Lists issues on lines of self.scope, checking only files of the scope when solver is able to.
+        Nothing is sent to backends for code, which diff target would not accept
+        """
+        if self.scope is None:
+            return self.list_issues()
+        command_dir = self.run_path.joinpath(self.command_dir).resolve()
+        filenames: list[str] = []
+        for filename in sorted(self.scope):
+            path = self.run_path.joinpath(filename)
+            try:
+                path.resolve().relative_to(command_dir)
+            except ValueError:
+                continue
+            if path.is_file():
+                filenames.append(filename)
+        issues = self.list_issues_in_files(filenames)
+        if issues is None:
+            issues = self.list_issues()
+        scoped = self.in_scope(issues)
+        logger.info(f"{len(scoped)} of {len(issues)} issues are on changed lines of {len(self.scope)} files")
+        return scoped
+
+    def in_scope(self, issues: list[IssueDescriptor]) -> list[IssueDescriptor]:
+        if self.scope is None:
+            return issues
+        return [issue for issue in issues if issue.issue_line in self.scope_lines(issue.filename)]
+
+    def scope_lines(self, filename: str) -> set[int]:
+        filename = os.path.normpath(filename)
+        lines = self.scope.get(filename)
+        if lines is None:
+            # tool might report paths relative to another directory, as GitlabSuggestion.apply_diff() allows
+            lines = next((lines for name, lines in self.scope.items() if name.endswith(os.sep + filename)), set())
+        return lines
+
+    def is_issue_fixed(self, issue: IssueDescriptor | None = None, proposal: DiffProposal | None = None) -> bool:
+        """
+        :param issue: issue, which latest fix was aimed at
+        :param proposal: latest applied fix, lets self.test_impact select tests
         :returns: True, if latest fix was successful
         """
+        self.rechecked_issues = None
         if self.validity_test is None:
-            new_issues = self.list_issues()
+            file_issues = self.list_file_issues(issue.filename) if issue is not None else None
+            if file_issues is not None:
+                file_issues = self.in_scope(file_issues)
+                self.rechecked_issues = (issue.filename, file_issues)
+                # Exactly this issue disappeared from the file => FIX SUCCESSFUL
+                fingerprint = issue.fingerprint()
+                old_count = sum(1 for old_issue in self.target_issues if old_issue.fingerprint() == fingerprint)
+                new_count = sum(1 for new_issue in file_issues if new_issue.fingerprint() == fingerprint)
+                return new_count < old_count
+
+            new_issues = self.list_scoped_issues()
+            self.rechecked_issues = (None, new_issues)
             # Number of issues decreased => FIX SUCCESFULL
             return len(new_issues) < len(self.target_issues)
 
-        try:
-            with set_directory(self.config_path):
-                subprocess.check_output(["bash"] + self.validity_test.split(" "))
-            logger.info(f"validity test: {self.validity_test} PASSED")
-            return True
-        except subprocess.CalledProcessError:
-            logger.info(f"\033[91m validity test: {self.validity_test} FAILED\033[0m")
-            return False
+        if self.test_impact is not None and proposal is not None:
+            tests = self.test_impact.select(proposal)
+            if tests is not None:
+                passed = self.run_validity_test(tests)
+                if passed:
+                    self.test_impact.unverified.append(f"{proposal.filename}:{proposal.issue_line}")
+                return passed
+
+        passed = self.run_validity_test()
+        if passed and self.test_impact is not None:
+            self.test_impact.unverified.clear()
+        return passed
+
+    def run_validity_test(self, tests: list[str] | None = None) -> bool:
+        """
+        Runs validity_test, unless its outcome for the same project files is found in self.validity_cache
+        :param tests: run only these tests with self.test_impact command, instead of validity_test
+        :returns: True, if validity test passed
+        """
+        command: list[str]
+        if self.warm_runner is not None:
+            command = self.warm_runner.args if tests is None else tests
+            key_command = self.warm_runner.command(command)
+        elif tests is None:
+            command = ["bash"] + self.validity_test.split(" ")
+            key_command = self.validity_test
+        else:
+            command = self.test_impact.test_command(tests)
+            key_command = " ".join(command)
+        label: str = self.validity_test if tests is None else f"{len(tests)} impacted tests"
+
+        key: str | None = None
+        if self.validity_cache is not None:
+            key = self.validity_cache.key(key_command, self.config_path)
+            passed = self.validity_cache.get(key)
+            if passed is not None:
+                logger.info(f"validity test: {label} {'PASSED' if passed else 'FAILED'} (cached)")
+                return passed
+
+        if self.warm_runner is not None:
+            passed = self.warm_runner.run(self.config_path, command)
+        else:
+            try:
+                # no chdir here: other solvers might be running concurrently in the same process
+                subprocess.check_output(command, cwd=self.config_path)
+                passed = True
+            except subprocess.CalledProcessError:
+                passed = False
+        if passed:
+            logger.info(f"validity test: {label} PASSED")
+        else:
+            logger.info(f"\033[91m validity test: {label} FAILED\033[0m")
+
+        if key is not None:
+            self.validity_cache.put(key, passed)
+        return passed
+
+    def verify_impacted_fixes(self, force: bool = False) -> None:
+        """
+        Safety net of test impact selection: runs the whole validity_test after the last fix.
+        Committed fixes can not be taken back from every diff target (e.g. pull-request suggestions),
+        hence the run fails, when the whole validity_test fails.
+        :param force: run even if no fixes are known to be unverified, e.g. after solving in forked workers
+        """
+        if self.test_impact is None or (len(self.test_impact.unverified) == 0 and not force):
+            return
+        if not self.run_validity_test():
+            raise SystemError(
+                f"Validity test '{self.validity_test}' fails after fixes, validated by impacted tests only: "
+                + ", ".join(self.test_impact.unverified)
+            )
+        self.test_impact.unverified.clear()
+
+    def refresh_issues(self, fixed_issue: IssueDescriptor, proposal: DiffProposal) -> None:
+        """
+        Refreshes self.target_issues after successful fix.
+        Reuses issues, listed by is_issue_fixed(), or re-checks only the fixed file when possible.
+        Otherwise keeps cached issues and shifts their line numbers, without running the tool again.
+        """
+        if self.test_impact is not None:
+            self.test_impact.shift_lines(proposal)
+        rechecked, self.rechecked_issues = self.rechecked_issues, None
+        if rechecked is not None and rechecked[0] is None:
+            self.target_issues = self.order_issues(rechecked[1])
+            return
+
+        filename: str = fixed_issue.filename
+        file_issues: list[IssueDescriptor] | None
+        if rechecked is not None and rechecked[0] == filename:
+            file_issues = rechecked[1]
+        else:
+            file_issues = self.list_file_issues(filename)
+            if file_issues is not None:
+                file_issues = self.in_scope(file_issues)
+
+        if file_issues is None:
+            self.target_issues = [issue for issue in self.target_issues if issue is not fixed_issue]
+            for issue in self.target_issues:
+                if issue.filename == proposal.filename:
+                    issue.remap_lines(proposal)
+            return
+
+        position = next(
+            (index for index, issue in enumerate(self.target_issues) if issue.filename == filename),
+            len(self.target_issues),
+        )
+        other_issues = [issue for issue in self.target_issues if issue.filename != filename]
+        self.target_issues = self.order_issues(other_issues[:position] + file_issues + other_issues[position:])
+
+    def close(self) -> None:
+        """
+        May be implemented in child class, in order to release processes, kept between checks
+        """
+        pass
+
+    def order_issues(self, issues: list[IssueDescriptor]) -> list[IssueDescriptor]:
+        """
+        :return: issues in the order of solving: by expected value with IssueScheduler, as listed by the tool otherwise
+        """
+        return self.issue_scheduler.order(issues) if self.issue_scheduler is not None else issues
+
+    def budget_exhausted(self, query_backend: QueryBackend, parallel_tokens: int = 0) -> bool:
+        """
+        :param parallel_tokens: spent by other parallel workers, see solve_issues_in_parallel()
+        """
+        return self.issue_scheduler is not None and self.issue_scheduler.exhausted(query_backend, parallel_tokens)
 
     def solve_issues(self, diff_target: DiffTarget, query_backend: QueryBackend):
+        self.scope = diff_target.scope()
+        if self.jobs == 1 and self.pipeline is not None:
+            # asyncio is imported only, when pipeline is used
+            from .pipeline import IssuePipeline
+
+            IssuePipeline(self, self.pipeline).run(diff_target, query_backend)
+            self.verify_impacted_fixes()
+            return
+
+        # concurrent solvers list and refresh issues under the tree lock, so unvalidated fixes of others are not seen
+        with self.lock_tree():
+            self.target_issues = self.order_issues(self.list_scoped_issues())
+        if self.jobs > 1 and self.solve_issues_in_parallel(diff_target, query_backend):
+            self.verify_impacted_fixes(force=True)
+            return
+
+        if self.batch > 1 and diff_target.requires_refresh():
+            self.solve_batches(diff_target, query_backend)
+
         issue_index: int = 0
-        self.target_issues = self.list_issues()
-        while issue_index < len(self.target_issues):
+        while issue_index < len(self.target_issues) and not self.budget_exhausted(query_backend):
             issue = self.target_issues[issue_index]
+            if self.is_finished(issue):
+                issue_index += 1
+                continue
 
-            proposals = issue.list_proposals()
-            fixing_successful: bool = False
-
-            proposal: DiffProposal | None = None
-            for proposal in proposals:
-                applying_successful: bool
-                used_backend = None
-
-                # TODO: parametrize
-                multi_backend_iters = 10
-                while used_backend != query_backend and multi_backend_iters > 0:
-                    multi_backend_iters -= 1
-                    try:
-                        applying_successful, used_backend = proposal.try_fixing_with_priority(
-                            diff_target=diff_target, query_backend=query_backend, used_backend=used_backend
-                        )
-                    except Exception as e:
-                        diff_target.revert_diff()
-                        raise e
-
-                    if applying_successful:
-                        fixing_successful = self.is_issue_fixed()
-                    else:
-                        diff_target.revert_diff()
-                        continue
+            with self.lock_file(issue.filename):
+                proposal = self.solve_issue(issue, diff_target, query_backend)
+                if proposal is not None and diff_target.requires_refresh():
+                    if self.file_locks is not None:
+                        self.file_locks.committed(self, proposal)
+                    with self.lock_tree():
+                        self.refresh_issues(issue, proposal)
 
-                    if fixing_successful:
-                        # this is a good place for "multi-step proposal" extension
-                        fixing_successful = diff_target.commit_diff()
-                        # commit_diff() might not be OK
-                        if fixing_successful:
-                            break
+            if proposal is not None:
+                # provide feedback, in order to collect training data
+                query_backend.report_successful_fix(issue, proposal)
+            if proposal is None or not diff_target.requires_refresh():
+                issue_index += 1
+            self.report_outcome(issue, proposal is not None, proposal, self.used_backend)
+        self.verify_impacted_fixes()
 
-                if fixing_successful:
-                    break
+    def group_batches(self, issues: list[IssueDescriptor]) -> list[list[IssueDescriptor]]:
+        """
+        :return: groups of at least 2 and at most self.batch nearby issues of the same file
+        """
+        file_issues: dict[str, list[IssueDescriptor]] = {}
+        for issue in issues:
+            file_issues.setdefault(issue.filename, []).append(issue)
+
+        batches: list[list[IssueDescriptor]] = []
+        for filename in file_issues:
+            batch: list[IssueDescriptor] = []
+            for issue in sorted(file_issues[filename], key=lambda issue: issue.issue_line):
+                if len(batch) > 0 and (
+                    len(batch) >= self.batch or issue.issue_line - batch[0].issue_line > self.batch_span
+                ):
+                    batches.append(batch)
+                    batch = []
+                batch.append(issue)
+            batches.append(batch)
+        return [batch for batch in batches if len(batch) > 1]
+
+    def solve_batches(self, diff_target: DiffTarget, query_backend: QueryBackend) -> None:
+        """
+        Tries fixing groups of nearby issues with one backend request each.
+        Issues, which stay unfixed, remain in self.target_issues and are solved one-by-one afterwards.
+        Only for targets, which keep changes in local files, since fixed issues are found by re-listing
+        """
+        for batch in self.group_batches(self.target_issues):
+            if self.budget_exhausted(query_backend):
+                return
+            with self.lock_file(batch[0].filename):
+                proposal = self.solve_batch(batch, diff_target, query_backend)
+                if proposal is None:
+                    continue
+                if self.file_locks is not None:
+                    self.file_locks.committed(self, proposal)
+
+                old_counts = Counter(issue.fingerprint() for issue in self.target_issues)
+                with self.lock_tree():
+                    self.refresh_issues(batch[0], proposal)
+                new_counts = Counter(issue.fingerprint() for issue in self.target_issues)
+
+            query_backend.report_successful_fix(batch[0], proposal)
+            for issue in batch:
+                fingerprint = issue.fingerprint()
+                if new_counts[fingerprint] < old_counts[fingerprint]:
+                    old_counts[fingerprint] -= 1
+                    self.report_outcome(issue, True, proposal, self.used_backend)
+
+    def solve_batch(
+        self, issues: list[IssueDescriptor], diff_target: DiffTarget, query_backend: QueryBackend
+    ) -> DiffProposal | None:
+        """
+        :return: committed BatchProposal, or None if fix was not accepted
+        """
+        try:
+            proposal = BatchProposal(issues, radius=self.batch_radius)
+        except SystemError as e:
+            logger.debug(f"Cannot batch issues of {issues[0].filename}: {e}")
+            return None
 
-                # if whole loop passed, but there were no successful fix, revert the change
+        used_backend = None
+        multi_backend_iters = self.multi_backend_iters
+        while used_backend != query_backend and multi_backend_iters > 0:
+            multi_backend_iters -= 1
+            try:
+                applying_successful, used_backend = proposal.try_fixing_with_priority(
+                    diff_target=diff_target, query_backend=query_backend, used_backend=used_backend
+                )
+                if applying_successful and self.is_batch_fixed(issues) and diff_target.commit_diff():
+                    self.used_backend = used_backend
+                    return proposal
+            except Exception as e:
                 diff_target.revert_diff()
+                raise e
+            diff_target.revert_diff()
+        return None
+
+    def is_batch_fixed(self, issues: list[IssueDescriptor]) -> bool:
+        """
+        Same as is_issue_fixed(), but any decrease of the number of issues is accepted.
+        Always leaves re-listed issues in self.rechecked_issues, since refresh_issues() cannot guess, which were fixed
+        """
+        filename: str = issues[0].filename
+        if self.validity_test is not None:
+            if not self.is_issue_fixed():
+                return False
+            file_issues = self.list_file_issues(filename)
+            self.rechecked_issues = (
+                (filename, self.in_scope(file_issues)) if file_issues is not None else (None, self.list_scoped_issues())
+            )
+            return True
+
+        file_issues = self.list_file_issues(filename)
+        if file_issues is None:
+            return self.is_issue_fixed()
+        file_issues = self.in_scope(file_issues)
+        self.rechecked_issues = (filename, file_issues)
+        return len(file_issues) < sum(1 for issue in self.target_issues if issue.filename == filename)
+
+    def lock_file(self, filename: str) -> ContextManager:
+        """
+        :return: lock of the file, while running concurrently with other solvers, no-op otherwise
+        """
+        if self.file_locks is None:
+            return nullcontext()
+        return self.file_locks.locked(filename)
+
+    def lock_tree(self) -> ContextManager:
+        """
+        :return: lock of the working tree, while running concurrently with other solvers, no-op otherwise.
+                 Shall be taken after file locks, for changes made without diff target
+        """
+        if self.file_locks is None:
+            return nullcontext()
+        return self.file_locks.locked_tree()
+
+    def can_run_concurrently(self) -> bool:
+        """
+        Sandboxes (jobs > 1) and pipeline manage their own concurrency, hence solver is left alone
+        """
+        return self.concurrent_safe and self.jobs == 1 and self.pipeline is None
+
+    def solve_issue(
+        self, issue: IssueDescriptor, diff_target: DiffTarget, query_backend: QueryBackend
+    ) -> DiffProposal | None:
+        """
+        Tries every proposal of the issue with every backend, until some fix is validated and committed
+        :return: committed proposal, or None if issue was not fixed
+        """
+        proposals = list(issue.list_proposals())
+        # the same proposal object might be repeated (ProposalRepeat), but it cannot be queried concurrently with itself
+        distinct: bool = len({id(proposal) for proposal in proposals}) == len(proposals)
+        if self.speculative and len(proposals) > 1 and distinct:
+            return self.solve_issue_speculatively(issue, proposals, diff_target, query_backend)
 
+        for proposal in proposals:
+            fixing_successful, used_backend = self.try_backends(issue, proposal, diff_target, query_backend)
             if fixing_successful:
-                # provide feedback, in order to collect training data
-                query_backend.report_successful_fix(issue, proposal)
-                if diff_target.requires_refresh():
-                    self.target_issues = self.list_issues()
-                else:
-                    issue_index += 1
-                logger.message(
-                    f"{issue.filename}:{issue.issue_line}: {issue.description}  \033[92m successfully fixed\033[0m"
+                self.used_backend = used_backend
+                return proposal
+
+            # if whole loop passed, but there were no successful fix, revert the change
+            diff_target.revert_diff()
+
+        return None
+
+    def try_backends(
+        self,
+        issue: IssueDescriptor,
+        proposal: DiffProposal,
+        diff_target: DiffTarget,
+        query_backend: QueryBackend,
+        used_backend: QueryBackend | None = None,
+    ) -> tuple[bool, QueryBackend | None]:
+        """
+        Queries backends of the chain one-by-one, starting after used_backend, until fix is validated and committed
+        :return: whether fix was committed, and the latest queried backend
+        """
+        fixing_successful: bool = False
+        multi_backend_iters = self.multi_backend_iters
+        while used_backend != query_backend and multi_backend_iters > 0:
+            multi_backend_iters -= 1
+            try:
+                applying_successful, used_backend = proposal.try_fixing_with_priority(
+                    diff_target=diff_target, query_backend=query_backend, used_backend=used_backend
                 )
+            except Exception as e:
+                diff_target.revert_diff()
+                raise e
+
+            if applying_successful:
+                fixing_successful = self.is_issue_fixed(issue, proposal)
             else:
-                issue_index += 1
-                logger.message(
-                    f"{issue.filename}:{issue.issue_line}: {issue.description}  \033[91m unable to fix\033[0m"
+                diff_target.revert_diff()
+                continue
+
+            if fixing_successful:
+                # this is a good place for "multi-step proposal" extension
+                fixing_successful = diff_target.commit_diff()
+                # commit_diff() might not be OK
+                if fixing_successful:
+                    break
+        return fixing_successful, used_backend
+
+    def solve_issue_speculatively(
+        self,
+        issue: IssueDescriptor,
+        proposals: list[DiffProposal],
+        diff_target: DiffTarget,
+        query_backend: QueryBackend,
+    ) -> DiffProposal | None:
+        """
+        Queries backends for all proposals of the issue at once, instead of waiting for validation of the previous one.
+        Answers are validated in the order of proposals. Proposal, which answer failed validation,
+        continues with the remaining backends of the chain one-by-one, same as in solve_issue().
+        Outstanding requests are cancelled, once some fix is committed.
+        """
+        from .pipeline import DeferredTarget
+
+        cancelled = threading.Event()
+
+        def query(proposal: DiffProposal) -> tuple[bool, QueryBackend | None]:
+            # the first backend in the chain, which answer is merged into the proposal. No local files are touched
+            used_backend = None
+            for _ in range(self.multi_backend_iters):
+                if cancelled.is_set() or used_backend == query_backend:
+                    break
+                merged, used_backend = proposal.try_fixing_with_priority(
+                    diff_target=DeferredTarget(), query_backend=query_backend, used_backend=used_backend
+                )
+                if merged:
+                    return True, used_backend
+            return False, used_backend
+
+        executor = ThreadPoolExecutor(max_workers=len(proposals), thread_name_prefix="speculative")
+        futures = [executor.submit(query, proposal) for proposal in proposals]
+        try:
+            for proposal, future in zip(proposals, futures):
+                merged, used_backend = future.result()
+                fixing_successful = (
+                    merged
+                    and diff_target.apply_diff(proposal)
+                    and self.is_issue_fixed(issue, proposal)
+                    and diff_target.commit_diff()
                 )
+                if not fixing_successful:
+                    diff_target.revert_diff()
+                    fixing_successful, used_backend = self.try_backends(
+                        issue, proposal, diff_target, query_backend, used_backend
+                    )
+                if fixing_successful:
+                    self.used_backend = used_backend
+                    return proposal
+                diff_target.revert_diff()
+            return None
+        finally:
+            cancelled.set()
+            # shutdown(cancel_futures=True) is not available in Python 3.8
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def is_finished(self, issue: IssueDescriptor) -> bool:
+        """
+        :return: True, if issue was already attempted by the previous (interrupted) run
+        """
+        if self.journal is not None and self.journal.is_finished(issue):
+            logger.info(f"{issue.filename}:{issue.issue_line}: {issue.description}  skipped, finished by previous run")
+            return True
+        return False
+
+    def report_outcome(
+        self,
+        issue: IssueDescriptor,
+        fixed: bool,
+        proposal: DiffProposal | None = None,
+        backend: QueryBackend | None = None,
+    ) -> None:
+        if self.journal is not None:
+            self.journal.record(issue, fixed, proposal, backend)
+        if fixed:
+            logger.message(
+                f"{issue.filename}:{issue.issue_line}: {issue.description}  \033[92m successfully fixed\033[0m"
+            )
+        else:
+            logger.message(f"{issue.filename}:{issue.issue_line}: {issue.description}  \033[91m unable to fix\033[0m")
+
+    def solve_issues_in_parallel(self, diff_target: DiffTarget, query_backend: QueryBackend) -> bool:
+        """
+        Issues are grouped by file, file groups are distributed among `jobs` workers (forked processes).
+        Every worker solves its files inside its own Sandbox copy of the project,
+        then successful proposals are merged back through diff_target, in the order of sorted filenames.
+        Workers share the token budget: tokens, spent by every worker, are counted in shared spent_tokens,
+        and added to the backends of this process afterwards.
+        :return: False, if self.target_issues are not suitable for parallel solving
+        """
+        file_issues: dict[str, list[IssueDescriptor]] = {}
+        for issue in self.target_issues:
+            file_issues.setdefault(issue.filename, []).append(issue)
+
+        if len(file_issues) < 2 or any(Path(filename).is_absolute() for filename in file_issues):
+            logger.info("Parallel solving is not applicable, falling back to one-by-one solving")
+            return False
+
+        # the biggest files go first, each to the least loaded worker
+        lanes: list[list[str]] = [[] for _ in range(min(self.jobs, len(file_issues)))]
+        for filename in sorted(file_issues, key=lambda name: (-len(file_issues[name]), name)):
+            lane = min(lanes, key=lambda files: sum(len(file_issues[name]) for name in files))
+            lane.append(filename)
+
+        root = self.config_path.resolve()
+        try:
+            Path.cwd().relative_to(root)
+        except ValueError:
+            root = Path.cwd()
+
+        # captures tokens, spent before the run, prior to making copies of the backends
+        if self.budget_exhausted(query_backend):
+            return True
+
+        import multiprocessing
+
+        context = multiprocessing.get_context("fork")
+        spent_tokens = context.Value("q", 0)
+        chain = self.backend_chain(query_backend)
+        sandboxes: list[Sandbox] = []
+        outcomes: dict[str, list[tuple[IssueDescriptor, DiffProposal | None, int | None]]] = {}
+        errors: list[BaseException] = []
+        try:
+            workers = []
+            for lane in lanes:
+                sandbox = Sandbox(root)
+                sandboxes.append(sandbox)
+                receiver, sender = context.Pipe(duplex=False)
+                worker = context.Process(
+                    target=self._solve_in_sandbox,
+                    args=(
+                        lane,
+                        file_issues,
+                        sandbox,
+                        diff_target.requires_refresh(),
+                        query_backend,
+                        spent_tokens,
+                        sender,
+                    ),
+                )
+                worker.start()
+                sender.close()
+                workers.append((worker, receiver))
+
+            for worker, receiver in workers:
+                try:
+                    lane_outcomes, lane_tokens, error = receiver.recv()
+                except EOFError:
+                    lane_outcomes, lane_tokens = {}, []
+                    error = SystemError(f"Sandbox worker {worker.pid} died unexpectedly")
+                worker.join()
+                outcomes.update(lane_outcomes)
+                for backend, tokens in zip(chain, lane_tokens):
+                    backend.tokens_used += tokens
+                if error is not None:
+                    errors.append(error)
+        finally:
+            for sandbox in sandboxes:
+                sandbox.cleanup()
+
+        for filename in sorted(outcomes):
+            for issue, proposal, backend_index in outcomes[filename]:
+                fixed = proposal is not None and self.merge_proposal(proposal, diff_target)
+                if fixed:
+                    query_backend.report_successful_fix(issue, proposal)
+                self.report_outcome(issue, fixed, proposal, chain[backend_index] if backend_index is not None else None)
+
+        if len(errors) > 0:
+            raise errors[0]
+        return True
+
+    def _solve_in_sandbox(
+        self,
+        filenames: list[str],
+        file_issues: dict[str, list[IssueDescriptor]],
+        sandbox: Sandbox,
+        keep_changes: bool,
+        query_backend: QueryBackend,
+        spent_tokens: Synchronized,
+        connection: Connection,
+    ):
+        """
+        Runs inside forked worker process: solves issues of given files, sends back outcomes for every issue.
+        Backends are copies of the parent ones, hence the used backend is sent as its index in the chain,
+        and tokens, spent by this worker, are sent for every backend of the chain
+        :param spent_tokens: tokens, spent by all workers, shared between processes
+        """
+        outcomes: dict[str, list[tuple[IssueDescriptor, DiffProposal | None, int | None]]] = {}
+        error: BaseException | None = None
+        solver: IssueSolver | None = None
+        chain = self.backend_chain(query_backend)
+        start_tokens = [backend.tokens_used for backend in chain]
+        # spent by this worker, already counted in spent_tokens
+        lane_tokens: int = 0
+        try:
+            os.chdir(sandbox.rebase(Path.cwd()))
+            solver = copy.copy(self)
+            vars(solver).update(
+                config_path=sandbox.rebase(self.config_path),
+                run_path=sandbox.rebase(self.run_path),
+                command_dir=(
+                    str(sandbox.rebase(self.command_dir)) if Path(self.command_dir).is_absolute() else self.command_dir
+                ),
+                jobs=1,
+                pipeline=None,
+            )
+            sandbox_target = SandboxTarget(keep_changes)
+
+            for filename in filenames:
+                outcomes[filename] = []
+                issues = file_issues[filename]
+                issue_index: int = 0
+                while issue_index < len(issues) and not solver.budget_exhausted(
+                    query_backend, spent_tokens.value - lane_tokens
+                ):
+                    issue = issues[issue_index]
+                    if solver.is_finished(issue):
+                        issue_index += 1
+                        continue
+                    proposal = solver.solve_issue(issue, sandbox_target, query_backend)
+                    spent = query_backend.total_tokens() - sum(start_tokens)
+                    with spent_tokens.get_lock():
+                        spent_tokens.value += spent - lane_tokens
+                    lane_tokens = spent
+                    backend_index = next(
+                        (index for index, backend in enumerate(chain) if backend is solver.used_backend), None
+                    )
+                    outcomes[filename].append((issue, proposal, backend_index))
+                    if proposal is not None and sandbox_target.requires_refresh():
+                        solver.refresh_issues(issue, proposal)
+                        issues = [new_issue for new_issue in solver.target_issues if new_issue.filename == filename]
+                    else:
+                        issue_index += 1
+        except Exception as e:
+            error = e
+        finally:
+            if solver is not None:
+                solver.close()
+            tokens = [backend.tokens_used - start for backend, start in zip(chain, start_tokens)]
+            connection.send((outcomes, tokens, error))
+            connection.close()
+
+    @staticmethod
+    def backend_chain(query_backend: QueryBackend) -> list[QueryBackend]:
+        """
+        :return: query_backend and all its previous backends
+        """
+        chain: list[QueryBackend] = []
+        backend: QueryBackend | None = query_backend
+        while backend is not None:
+            chain.append(backend)
+            backend = backend.previous_backend()
+        return chain
+
+    @staticmethod
+    def merge_proposal(proposal: DiffProposal, diff_target: DiffTarget) -> bool:
+        """
+        Re-applies proposal, already validated inside the Sandbox, onto the real diff_target
+        """
+        try:
+            if diff_target.apply_diff(proposal) and diff_target.commit_diff():
+                return True
+        except Exception as e:
+            diff_target.revert_diff()
+            raise e
+        diff_target.revert_diff()
+        return False
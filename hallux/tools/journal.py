@@ -0,0 +1,107 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Final
+
+from ..backends.query_backend import QueryBackend
+from ..issues.issue import IssueDescriptor
+from ..logger import logger
+from ..proposals.diff_proposal import DiffProposal
+
+
+class RunJournal:
+    """
+    Append-only journal of solved issues: one JSON line per attempted issue, flushed to disk right away,
+    so it survives crashes of the run. With resume=True issues, finished by the previous run, are skipped.
+    """
+
+    def __init__(self, path: Path, resume: bool = False, skip_fixed: bool = False):
+        """
+        :param path: journal file, created if not exists
+        :param resume: continue previous run, otherwise journal is started from scratch
+        :param skip_fixed: shall be True for targets, which do not keep fixes in local files (Github/Gitlab),
+               since fixed issues are listed again by the tools
+        """
+        self.path: Final[Path] = path
+        self.lock: Final[threading.Lock] = threading.Lock()
+        # fingerprint -> how many issues with that fingerprint are still to be skipped
+        self.finished: Final[Counter[tuple[str, str, str]]] = Counter()
+
+        # records of the previous run, e.g. for success rates of IssueScheduler
+        self.history: Final[list[dict]] = self.read(path) if path.exists() else []
+        if resume:
+            for record in self.history:
+                if not record["fixed"] or skip_fixed:
+                    self.finished[(record["tool"], record["filename"], record["description"])] += 1
+            logger.info(f"Resuming from {path}: {sum(self.finished.values())} finished issues are skipped")
+
+        self.file = open(path, "at" if resume else "wt")
+
+    @staticmethod
+    def default_path(config_path: Path) -> Path:
+        """
+        Journal is kept outside of the project, so it never makes git tree dirty
+        """
+        project_hash = hashlib.md5(str(config_path.resolve()).encode("utf8")).hexdigest()
+        journal_dir = Path.home().joinpath(".cache", "hallux")
+        journal_dir.mkdir(parents=True, exist_ok=True)
+        return journal_dir.joinpath(f"journal-{project_hash}.jsonl")
+
+    @staticmethod
+    def read(path: Path) -> list[dict]:
+        records: list[dict] = []
+        with open(path) as file:
+            for line in file:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # last line might be cut by the crash
+                    logger.debug(f"Skipping broken journal line: {line}")
+        return records
+
+    def is_finished(self, issue: IssueDescriptor) -> bool:
+        """
+        :return: True, if issue was finished by the previous run. Every journal record skips only one issue
+        """
+        with self.lock:
+            fingerprint = issue.fingerprint()
+            if self.finished[fingerprint] > 0:
+                self.finished[fingerprint] -= 1
+                return True
+            return False
+
+    def record(
+        self,
+        issue: IssueDescriptor,
+        fixed: bool,
+        proposal: DiffProposal | None = None,
+        backend: QueryBackend | None = None,
+    ) -> None:
+        tool, filename, description = issue.fingerprint()
+        record = {
+            "tool": tool,
+            "filename": filename,
+            "description": description,
+            "line": issue.issue_line,
+            "fixed": fixed,
+            "backend": type(backend).__name__ if backend is not None else None,
+            "proposal": (
+                {"start_line": proposal.start_line, "end_line": proposal.end_line, "lines": proposal.proposed_lines}
+                if fixed and proposal is not None
+                else None
+            ),
+        }
+        with self.lock:
+            self.file.write(json.dumps(record) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        self.file.close()
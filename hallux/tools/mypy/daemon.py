@@ -0,0 +1,169 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import configparser
+import os
+import re
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Final
+
+from ...logger import logger
+
+
+class MypyDaemon:
+    """
+    mypy daemon (dmypy), started on the first check and kept until close().
+    It keeps incremental state of the whole command_dir in memory, so a check after a fix re-processes only
+    the fixed files, instead of a cold mypy run.
+    Forked processes (--jobs N) start their own daemon for their Sandbox.
+    """
+
+    # daemon stops by itself, when left idle that long, e.g. after the run was killed
+    idle_timeout: Final[int] = 3600
+    # looked up by mypy in this order, unless --config-file is given; the first one with mypy section is used
+    config_files: Final[tuple[str, ...]] = (
+        "mypy.ini",
+        ".mypy.ini",
+        "pyproject.toml",
+        "setup.cfg",
+        "~/.config/mypy/config",
+        "~/.mypy.ini",
+    )
+
+    def __init__(self, run_path: Path):
+        """
+        :param run_path: directory, where the daemon is started
+        """
+        self.run_path: Final[Path] = run_path
+        self.status_file: Path | None = None
+        # process, which started the daemon
+        self.owner_pid: int | None = None
+        # daemon notices changes of its files by stat with mtime rounded to seconds, which misses fixes
+        # of the same size within a second. Hence changed files are passed explicitly with --remove and --update,
+        # which re-checks them unconditionally. Not supported, when mypy follows imports (--follow-imports=normal,
+        # the default), then the daemon relies on stat, and mtimes of changed files are moved forward
+        self.update_files: bool = True
+        # changed file -> mtime, given to it before the previous check
+        self.mtimes: Final[dict[str, int]] = {}
+        # the last command re-checked files with --remove and --update
+        self.updating: bool = False
+        # file of the previous check, it might have been reverted since
+        self.previous_changed: list[str] = []
+
+    def command(self, args: list[str], paths: list[str], changed: str | None = None) -> list[str]:
+        """
+        :param args: mypy arguments, only used when the daemon is started
+        :param paths: directories and files checked by the daemon, only used when the daemon is started
+        :param changed: file, modified since the previous check
+        :return: dmypy command, which starts the daemon and checks paths, or re-checks changed files
+        """
+        changed_files = list(dict.fromkeys(self.previous_changed + ([changed] if changed is not None else [])))
+        self.previous_changed = [changed] if changed is not None else []
+        self.updating = False
+        if self.status_file is not None and self.owner_pid == os.getpid():
+            command = ["dmypy", "--status-file", str(self.status_file), "recheck"]
+            if self.update_files and len(changed_files) > 0:
+                command += ["--remove"] + changed_files + ["--update"] + changed_files
+                self.updating = True
+            else:
+                self.bump_mtimes(changed_files)
+            return command
+
+        self.owner_pid = os.getpid()
+        self.status_file = Path(tempfile.gettempdir()).joinpath(f"hallux-dmypy-{os.getpid()}-{id(self)}.json")
+        if self.follow_imports(args) == "normal":
+            self.update_files = False
+        logger.info(f"Starting mypy daemon in {self.run_path}")
+        return (
+            ["dmypy", "--status-file", str(self.status_file), "run", "--timeout", str(self.idle_timeout), "--"]
+            + args
+            + paths
+        )
+
+    def follow_imports(self, args: list[str]) -> str:
+        """
+        :return: follow_imports option of mypy, given by args or by its config file, "normal" by default
+        """
+        option = re.search(r"--follow-imports[= ](\w+)", " ".join(args))
+        if option is not None:
+            return option.group(1)
+        config_file = re.search(r"--config-file[= ](\S+)", " ".join(args))
+        for name in [config_file.group(1)] if config_file is not None else self.config_files:
+            section = self.read_config(self.run_path.joinpath(Path(name).expanduser()))
+            if section is not None:
+                return str(section.get("follow_imports", "normal"))
+        return "normal"
+
+    @staticmethod
+    def read_config(path: Path) -> dict | None:
+        """
+        :return: global options of mypy config file, None if the file has no mypy section
+        """
+        if not path.is_file():
+            return None
+        if path.suffix != ".toml":
+            parser = configparser.ConfigParser()
+            try:
+                parser.read(path)
+            except configparser.Error as e:
+                logger.debug(f"Unable to read mypy config {path}: {e}")
+                return None
+            return dict(parser["mypy"]) if parser.has_section("mypy") else None
+
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib  # type: ignore[no-redef]
+            except ImportError:
+                # without TOML parser, mypy is assumed to follow imports
+                return {} if "[tool.mypy]" in path.read_text() else None
+        try:
+            with open(path, "rb") as file:
+                return tomllib.load(file).get("tool", {}).get("mypy")
+        except tomllib.TOMLDecodeError as e:
+            logger.debug(f"Unable to read mypy config {path}: {e}")
+            return None
+
+    def bump_mtimes(self, filenames: list[str]) -> None:
+        """
+        Daemon compares sizes and mtimes, rounded down to seconds. Changed files get mtime later than the one
+        of their previous check, so rewrites of the same size within a second are not missed
+        """
+        for filename in filenames:
+            path = self.run_path.joinpath(filename)
+            try:
+                mtime = max(int(path.stat().st_mtime), self.mtimes.get(filename, 0)) + 1
+                os.utime(path, (mtime, mtime))
+            except OSError:
+                continue
+            self.mtimes[filename] = mtime
+
+    def recheck_failed(self) -> bool:
+        """
+        Called, when the last command failed. --remove and --update crash the daemon, when mypy follows imports
+        by its config file, then the daemon is restarted and re-checks files by stat afterwards
+        :return: True, if the command should be repeated
+        """
+        if not self.updating:
+            return False
+        logger.info("mypy daemon does not support --update, while following imports: restarting it")
+        self.update_files = False
+        self.close()
+        return True
+
+    def close(self) -> None:
+        """
+        Stops the daemon; the next command() starts it again
+        """
+        if self.status_file is not None and self.owner_pid == os.getpid():
+            subprocess.run(
+                ["dmypy", "--status-file", str(self.status_file), "stop"],
+                cwd=self.run_path,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        self.status_file = None
@@ -4,11 +4,15 @@ from __future__ import annotations
 
 import subprocess
 from pathlib import Path
+from typing import Final
 
-from ...auxiliary import set_directory
 from ...issues.issue import IssueDescriptor
+from ...logger import logger
 from ...tools.issue_solver import IssueSolver
+from ...tools.python.lint_cache import LintCache
 from ...tools.python.python_issue import PythonIssue
+from ...tools.validity_cache import ValidityCache
+from .daemon import MypyDaemon
 
 
 class Mypy_IssueSolver(IssueSolver):
@@ -18,24 +22,121 @@ class Mypy_IssueSolver(IssueSolver):
         run_path: Path,
         command_dir: str = ".",
         validity_test: str | None = None,
+        jobs: int = 1,
+        pipeline: dict[str, int] | bool | None = None,
+        batch: int = 1,
+        speculative: bool = False,
+        validity_cache: ValidityCache | None = None,
+        test_impact: dict[str, str | int] | bool | None = None,
+        warm_runner: dict[str, str | list[str]] | bool | None = None,
         args: str | None = None,
+        incremental: bool = False,
+        daemon: bool = False,
+        lint_cache: bool | str = False,
     ):
-        super().__init__(config_path, run_path, command_dir, validity_test=validity_test)
+        super().__init__(
+            config_path,
+            run_path,
+            command_dir,
+            validity_test=validity_test,
+            jobs=jobs,
+            pipeline=pipeline,
+            batch=batch,
+            speculative=speculative,
+            validity_cache=validity_cache,
+            test_impact=test_impact,
+            warm_runner=warm_runner,
+        )
         self.args: str = args if args is not None else "--ignore-missing-imports"
+        # re-check only fixed files, instead of the whole command_dir
+        self.incremental: Final[bool] = incremental
+        # reset, when installed mypy does not support JSON output (before 1.11)
+        self.json_output: bool = True
+        # checks with dmypy, which keeps state of the whole command_dir between checks
+        self.daemon: Final[MypyDaemon | None] = MypyDaemon(run_path) if daemon else None
+        # issues of unchanged trees of Python files. `lint_cache: true` in config keeps them in ~/.cache/hallux
+        self.lint_cache: Final[LintCache | None] = (
+            LintCache(
+                Path(lint_cache) if isinstance(lint_cache, str) else LintCache.default_path(config_path, "mypy"),
+                "mypy",
+                f"{self.args} {command_dir}",
+                run_path,
+            )
+            if lint_cache
+            else None
+        )
 
     def list_issues(self) -> list[IssueDescriptor]:
+        if self.lint_cache is None:
+            return self._run_mypy([self.command_dir])
+        key = self.lint_cache.tree_key(LintCache.python_files(self.run_path))
+        issues = self.lint_cache.get(key)
+        if issues is not None:
+            logger.info("mypy: issues are found in lint cache")
+            return issues
+        issues = self._run_mypy([self.command_dir])
+        self.lint_cache.put(key, issues)
+        return issues
+
+    def list_file_issues(self, filename: str) -> list[IssueDescriptor] | None:
+        if not self.incremental and self.daemon is None:
+            return None
+        # daemon re-checks only changed files anyway, and also notices errors in dependent modules
+        path = self.command_dir if self.daemon is not None else filename
+        # mypy also reports errors from imported modules, keep only the requested file
+        return [issue for issue in self._run_mypy([path], changed=filename) if issue.filename == filename]
+
+    def list_issues_in_files(self, filenames: list[str]) -> list[IssueDescriptor] | None:
+        python_files = [filename for filename in filenames if filename.endswith((".py", ".pyi"))]
+        return self._run_mypy(python_files) if len(python_files) > 0 else []
+
+    def _mypy_command(self, args: list[str], paths: list[str], changed: str | None) -> list[str]:
+        if self.daemon is not None:
+            return self.daemon.command([self.args] + args, paths, changed)
+        return ["mypy", self.args] + args + paths
+
+    def _run_mypy(self, paths: list[str], changed: str | None = None) -> list[IssueDescriptor]:
         issues: list[IssueDescriptor] = []
+        if self.json_output:
+            json_issues = PythonIssue.stream_issues(
+                self._mypy_command(["-O", "json"], paths, changed), self.run_path, PythonIssue.parseMypyJson
+            )
+            if json_issues is None and self.daemon is not None and self.daemon.recheck_failed():
+                json_issues = PythonIssue.stream_issues(
+                    self._mypy_command(["-O", "json"], paths, changed), self.run_path, PythonIssue.parseMypyJson
+                )
+            if json_issues is not None:
+                return json_issues
+            logger.info("mypy does not support JSON output, parsing text output instead")
+            self.json_output = False
+            if self.daemon is not None:
+                # output format is fixed, when the daemon starts
+                self.daemon.close()
 
-        with set_directory(self.run_path):
-            try:
-                mypy_output = subprocess.check_output(["mypy", self.args, self.command_dir])
-            except subprocess.CalledProcessError as e:
-                mypy_output = e.output
+        # traceback of the daemon, crashed by --update, is not shown
+        stderr = subprocess.DEVNULL if self.daemon is not None else None
+        mypy_run = subprocess.run(
+            self._mypy_command([], paths, changed), cwd=self.run_path, stdout=subprocess.PIPE, stderr=stderr
+        )
+        # exit code 2 is a crash, 1 only means found issues
+        if mypy_run.returncode == 2 and self.daemon is not None and self.daemon.recheck_failed():
+            mypy_run = subprocess.run(
+                self._mypy_command([], paths, changed), cwd=self.run_path, stdout=subprocess.PIPE, stderr=stderr
+            )
 
-        issues.extend(PythonIssue.parseIssues(mypy_output.decode("utf-8"), tool="mypy", keyword="error:"))
+        issues.extend(PythonIssue.parseIssues(mypy_run.stdout.decode("utf-8"), tool="mypy", keyword="error:"))
 
         return issues
 
     def solve_issues(self, diff_target, query_backend):
         print("Process mypy:")
-        super().solve_issues(diff_target, query_backend)
+        try:
+            super().solve_issues(diff_target, query_backend)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self.daemon is not None:
+            self.daemon.close()
+        if self.lint_cache is not None:
+            self.lint_cache.close()
@@ -0,0 +1,223 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Final, Iterator
+
+from ..backends.query_backend import QueryBackend
+from ..issues.issue import IssueDescriptor
+from ..proposals.diff_proposal import DiffProposal
+from ..targets.diff import DiffTarget
+
+if TYPE_CHECKING:
+    from .issue_solver import IssueSolver
+
+
+class DeferredTarget(DiffTarget):
+    """
+    Accepts every diff without touching local files.
+    Lets proposals query backends concurrently, while the real DiffTarget is used by the working-tree stage only.
+    """
+
+    def apply_diff(self, diff: DiffProposal) -> bool:
+        return True
+
+    def revert_diff(self) -> None:
+        pass
+
+    def commit_diff(self) -> bool:
+        return True
+
+    def requires_refresh(self) -> bool:
+        return False
+
+
+@dataclass
+class FileTask:
+    filename: str
+    issues: list[IssueDescriptor]
+    index: int = 0
+
+
+@dataclass
+class IssueJob:
+    task: FileTask
+    issue: IssueDescriptor
+    proposals: Iterator[DiffProposal]
+    proposal: DiffProposal | None = None
+    used_backend: QueryBackend | None = None
+    backend_iters: int = 0
+    applied: bool = False
+
+
+class IssuePipeline:
+    """
+    Solves issues of one IssueSolver as asyncio pipeline: list -> propose -> query -> apply -> validate -> commit.
+    Stages are connected by bounded queues. Issues of the same file pass the pipeline strictly one-by-one,
+    since every commit changes the file, but issues of other files are proposed and queried in the meantime,
+    so next LLM requests are in flight while the current fix is being validated.
+    Stages touching the working tree (list, propose, apply, validate, commit) share one thread,
+    only backend queries run concurrently.
+    """
+
+    # files: how many files are in flight at once, query: how many backend requests are sent at once
+    default_limits: Final[dict[str, int]] = {"files": 4, "query": 4}
+    # TODO: parametrize, same as in IssueSolver.solve_issue()
+    multi_backend_iters: Final[int] = 10
+
+    def __init__(self, solver: IssueSolver, limits: dict[str, int] | None = None):
+        self.solver: Final[IssueSolver] = solver
+        self.limits: Final[dict[str, int]] = dict(self.default_limits)
+        for stage, limit in (limits or {}).items():
+            if stage not in self.default_limits:
+                raise SystemError(f"Unknown pipeline stage '{stage}', supported: {list(self.default_limits)}")
+            if int(limit) < 1:
+                raise SystemError(f"Pipeline limit for '{stage}' must be positive, got: {limit}")
+            self.limits[stage] = int(limit)
+        self.deferred_target: Final[DeferredTarget] = DeferredTarget()
+
+    def run(self, diff_target: DiffTarget, query_backend: QueryBackend) -> None:
+        self.diff_target = diff_target
+        self.query_backend = query_backend
+        asyncio.run(self._run())
+
+    async def _run(self) -> None:
+        files_limit: int = self.limits["files"]
+        # every queue is at least as big as the number of files in flight, so put() never blocks forever
+        self.propose_queue: asyncio.Queue[FileTask] = asyncio.Queue(maxsize=files_limit)
+        self.query_queue: asyncio.Queue[IssueJob] = asyncio.Queue(maxsize=files_limit)
+        self.apply_queue: asyncio.Queue[IssueJob] = asyncio.Queue(maxsize=files_limit)
+        self.admission = asyncio.Semaphore(files_limit)
+        self.finished = asyncio.Event()
+        self.active_files: int = 0
+        self.listing_done: bool = False
+
+        self.tree_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hallux-tree")
+        self.query_executor = ThreadPoolExecutor(max_workers=self.limits["query"], thread_name_prefix="hallux-query")
+
+        stages = [self._list(), self._propose(), self._apply()] + [self._query() for _ in range(self.limits["query"])]
+        workers = [asyncio.ensure_future(stage) for stage in stages]
+        pending = set(workers) | {asyncio.ensure_future(self.finished.wait())}
+        try:
+            while not self.finished.is_set():
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()  # re-raises exception from a failed stage
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            self.query_executor.shutdown(wait=True)
+            self.tree_executor.shutdown(wait=True)
+
+    async def _in_tree(self, func: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.tree_executor, partial(func, *args))
+
+    async def _list(self) -> None:
+        self.solver.target_issues = self.solver.order_issues(await self._in_tree(self.solver.list_scoped_issues))
+        file_issues: dict[str, list[IssueDescriptor]] = {}
+        for issue in self.solver.target_issues:
+            file_issues.setdefault(issue.filename, []).append(issue)
+
+        for filename, issues in file_issues.items():
+            await self.admission.acquire()
+            self.active_files += 1
+            await self.propose_queue.put(FileTask(filename, issues))
+
+        self.listing_done = True
+        self._check_finished()
+
+    async def _propose(self) -> None:
+        while True:
+            task = await self.propose_queue.get()
+            if self.solver.budget_exhausted(self.query_backend):
+                task.index = len(task.issues)
+            if task.index >= len(task.issues):
+                self.active_files -= 1
+                self.admission.release()
+                self._check_finished()
+                continue
+
+            issue = task.issues[task.index]
+            if self.solver.is_finished(issue):
+                task.index += 1
+                await self.propose_queue.put(task)
+                continue
+
+            proposals = await self._in_tree(lambda: iter(issue.list_proposals()))
+            job = IssueJob(task=task, issue=issue, proposals=proposals)
+            if await self._in_tree(self._next_proposal, job):
+                await self.query_queue.put(job)
+            else:
+                await self._finish_issue(job, fixed=False)
+
+    async def _query(self) -> None:
+        while True:
+            job = await self.query_queue.get()
+            job.backend_iters -= 1
+            job.applied, job.used_backend = await asyncio.get_running_loop().run_in_executor(
+                self.query_executor,
+                partial(
+                    job.proposal.try_fixing_with_priority,
+                    diff_target=self.deferred_target,
+                    query_backend=self.query_backend,
+                    used_backend=job.used_backend,
+                ),
+            )
+            await self.apply_queue.put(job)
+
+    async def _apply(self) -> None:
+        while True:
+            job = await self.apply_queue.get()
+            if await self._in_tree(self._apply_validate_commit, job):
+                # provide feedback, in order to collect training data
+                self.query_backend.report_successful_fix(job.issue, job.proposal)
+                await self._finish_issue(job, fixed=True)
+            elif job.used_backend != self.query_backend and job.backend_iters > 0:
+                await self.query_queue.put(job)
+            elif await self._in_tree(self._next_proposal, job):
+                await self.query_queue.put(job)
+            else:
+                await self._finish_issue(job, fixed=False)
+
+    def _apply_validate_commit(self, job: IssueJob) -> bool:
+        try:
+            if (
+                job.applied
+                and self.diff_target.apply_diff(job.proposal)
+                and self.solver.is_issue_fixed(job.issue, job.proposal)
+                and self.diff_target.commit_diff()
+            ):
+                if self.diff_target.requires_refresh():
+                    self.solver.refresh_issues(job.issue, job.proposal)
+                return True
+        except Exception as e:
+            self.diff_target.revert_diff()
+            raise e
+
+        self.diff_target.revert_diff()
+        return False
+
+    def _next_proposal(self, job: IssueJob) -> bool:
+        job.proposal = next(job.proposals, None)
+        job.used_backend = None
+        job.backend_iters = self.multi_backend_iters
+        return job.proposal is not None
+
+    async def _finish_issue(self, job: IssueJob, fixed: bool) -> None:
+        self.solver.report_outcome(job.issue, fixed, job.proposal, job.used_backend)
+        task = job.task
+        if fixed and self.diff_target.requires_refresh():
+            # line numbers of the file might change, continue with refreshed issues
+            task.issues = [issue for issue in self.solver.target_issues if issue.filename == task.filename]
+        else:
+            task.index += 1
+        await self.propose_queue.put(task)
+
+    def _check_finished(self) -> None:
+        if self.listing_done and self.active_files == 0:
+            self.finished.set()
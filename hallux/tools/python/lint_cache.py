@@ -0,0 +1,136 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import hashlib
+import json
+import subprocess
+import threading
+from pathlib import Path
+from typing import Final, TextIO
+
+from ...logger import logger
+from ..file_hashes import FileHashes
+from ..validity_cache import ValidityCache
+from .python_issue import PythonIssue
+
+
+class LintCache:
+    """
+    Issues of Python linters, keyed by contents of the checked files, tool version, arguments and configs.
+    Ruff issues are cached per file, so only modified files are linted again.
+    Mypy issues of a file depend on the modules it imports, hence they are cached for the whole tree of Python files.
+    Issues are appended to JSON lines file, so later runs reuse them too.
+    """
+
+    # project configs, which might change issues of every file
+    config_files: Final[list[str]] = ["pyproject.toml", "ruff.toml", ".ruff.toml", "setup.cfg", "mypy.ini", ".mypy.ini"]
+
+    def __init__(self, path: Path, tool: str, args: str, run_path: Path):
+        """
+        :param path: cache file, created if not exists
+        :param tool: "ruff" or "mypy", its version is a part of every key
+        :param args: tool arguments, a part of every key
+        :param run_path: directory, where the tool runs; filenames of issues are relative to it
+        """
+        self.path: Final[Path] = path
+        self.tool: Final[str] = tool
+        self.run_path: Final[Path] = run_path
+        self.lock: Final[threading.Lock] = threading.Lock()
+        # key -> issues as dictionaries
+        self.issues: Final[dict[str, list[dict]]] = self.read(path) if path.exists() else {}
+        self.file_hashes: Final[FileHashes] = FileHashes()
+        self.file: TextIO | None = None
+
+        context = hashlib.sha256(f"{tool}\0{self.tool_version(tool)}\0{args}".encode("utf8"))
+        for name in self.config_files:
+            context.update(f"\0{name}\0{self.file_hashes.get(str(run_path.joinpath(name)))}".encode("utf8"))
+        self.context: Final[str] = context.hexdigest()
+
+    @staticmethod
+    def default_path(config_path: Path, tool: str) -> Path:
+        project_hash = hashlib.md5(str(config_path.resolve()).encode("utf8")).hexdigest()
+        cache_dir = Path.home().joinpath(".cache", "hallux")
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return cache_dir.joinpath(f"lint-{tool}-{project_hash}.jsonl")
+
+    @staticmethod
+    def tool_version(tool: str) -> str:
+        try:
+            return subprocess.check_output([tool, "--version"], stderr=subprocess.DEVNULL).decode("utf8").strip()
+        except (subprocess.CalledProcessError, OSError):
+            return "unknown"
+
+    @staticmethod
+    def read(path: Path) -> dict[str, list[dict]]:
+        issues: dict[str, list[dict]] = {}
+        with open(path) as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                    issues[record["key"]] = list(record["issues"])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.debug(f"Skipping broken lint cache line: {line}")
+        return issues
+
+    @staticmethod
+    def python_files(root: Path) -> list[str]:
+        """
+        :return: relative names of Python files under root, tracked or not ignored by git
+        """
+        return [name for name in ValidityCache.list_files(root) if name.endswith((".py", ".pyi"))]
+
+    def file_key(self, filename: str) -> str:
+        """
+        :param filename: relative to run_path
+        :return: hash of the file name and contents, within the context of the tool
+        """
+        content_hash = self.file_hashes.get(str(self.run_path.joinpath(filename)))
+        return hashlib.sha256(f"{self.context}\0{filename}\0{content_hash}".encode("utf8")).hexdigest()
+
+    def tree_key(self, filenames: list[str]) -> str:
+        """
+        :param filenames: relative to run_path
+        :return: hash of names and contents of all the files, within the context of the tool
+        """
+        tree = hashlib.sha256(self.context.encode("utf8"))
+        for filename in sorted(filenames):
+            tree.update(f"\0{filename}\0{self.file_hashes.get(str(self.run_path.joinpath(filename)))}".encode("utf8"))
+        return tree.hexdigest()
+
+    def get(self, key: str) -> list[PythonIssue] | None:
+        """
+        :return: new issue objects every time, since issues are modified while solving, or None if key is unknown
+        """
+        with self.lock:
+            records = self.issues.get(key)
+        if records is None:
+            return None
+        return [PythonIssue(**record) for record in records]
+
+    def put(self, key: str, issues: list[PythonIssue]) -> None:
+        records = [
+            {
+                "filename": issue.filename,
+                "issue_line": issue.issue_line,
+                "description": issue.description,
+                "tool": issue.tool,
+                "code": issue.code,
+                "end_line": issue.end_line,
+                "column": issue.column,
+                "fixable": issue.fixable,
+            }
+            for issue in issues
+        ]
+        with self.lock:
+            self.issues[key] = records
+            if self.file is None:
+                self.file = open(self.path, "at")
+            self.file.write(json.dumps({"key": key, "issues": records}) + "\n")
+            self.file.flush()
+
+    def close(self) -> None:
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+            self.file = None
@@ -2,16 +2,58 @@
 
 from __future__ import annotations
 
+import json
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Callable, Final, Iterable, Iterator
+
 from ...issues.issue import IssueDescriptor
+from ...proposals.diff_proposal import DiffProposal
 from ...proposals.proposal_engine import ProposalEngine, ProposalList
 from ...proposals.python_proposal import PythonProposal
 
+# "filename:line:[column:] description", filename might contain spaces
+TEXT_ISSUE: Final[re.Pattern] = re.compile(
+    r"^(?P<filename>.+?):(?P<line>\d+):(?:(?P<column>\d+):)? (?P<description>.+)$"
+)
+# rule code of a text description: "F401 `os` imported but unused" for ruff, "error: ...  [assignment]" for mypy.
+# "[*]" after ruff code marks issues, which ruff is able to fix by itself
+RUFF_CODE: Final[re.Pattern] = re.compile(r"^(?P<code>[A-Z]+[0-9]+) (?P<fixable>\[\*\] )?")
+MYPY_CODE: Final[re.Pattern] = re.compile(r"  \[(?P<code>[a-z0-9-]+)\]$")
+
 
 class PythonIssue(IssueDescriptor):
-    def __init__(self, filename: str, issue_line: int = 0, description: str = "", tool: str = "ruff"):
+    def __init__(
+        self,
+        filename: str,
+        issue_line: int = 0,
+        description: str = "",
+        tool: str = "ruff",
+        code: str | None = None,
+        end_line: int | None = None,
+        column: int | None = None,
+        fixable: bool = False,
+    ):
+        """
+        :param code: rule code, e.g. "F401" for ruff or "assignment" for mypy
+        :param end_line: last line of the reported code
+        :param column: 1-based column of the reported code
+        :param fixable: tool is able to fix the issue by itself (ruff safe fix)
+        """
         super().__init__(
             language="python", tool=tool, filename=filename, issue_line=issue_line, description=description
         )
+        self.code: Final[str | None] = code
+        self.end_line: int | None = end_line
+        self.column: Final[int | None] = column
+        self.fixable: Final[bool] = fixable
+
+    def remap_lines(self, proposal: DiffProposal) -> None:
+        super().remap_lines(proposal)
+        if self.end_line is not None:
+            self.end_line = max(self.issue_line, proposal.shift_line(self.end_line))
 
     def list_proposals(self) -> ProposalEngine:
         return ProposalList(
@@ -24,25 +66,113 @@ class PythonIssue(IssueDescriptor):
 
     @staticmethod
     def parseIssues(ruff_output: str, tool: str = "ruff", keyword: str = "") -> list[PythonIssue]:
+        """
+        Parses human-readable "filename:line:[column:] description" output, lines of other kind are skipped
+        """
         issues: list[PythonIssue] = []
-        warnings: list[str] = ruff_output.split("\n")
-        for warn in warnings[:-2]:
-            warn_arr = warn.split(" ")
-            if len(warn_arr) < 3:
-                break
-            filename_line_col = warn_arr[0].split(":")
-            if len(filename_line_col) < 3:
-                break
-            filename = filename_line_col[0]
-            issue_line = int(filename_line_col[1])
-
-            if len(keyword) == 0 or str(warn_arr[1:]).startswith(keyword):
-                issue = PythonIssue(
-                    filename=filename,
-                    issue_line=issue_line,
-                    description=str(" ".join(warn_arr[1:]).lstrip(" ")),
-                    tool=tool,
+        for warn in ruff_output.splitlines():
+            match = TEXT_ISSUE.match(warn)
+            if match is None:
+                continue
+            description = match.group("description").lstrip(" ")
+            if len(keyword) == 0 or description.startswith(keyword):
+                code = (RUFF_CODE if tool == "ruff" else MYPY_CODE).search(description)
+                issues.append(
+                    PythonIssue(
+                        filename=match.group("filename"),
+                        issue_line=int(match.group("line")),
+                        description=description,
+                        tool=tool,
+                        code=code.group("code") if code is not None else None,
+                        column=int(match.group("column")) if match.group("column") is not None else None,
+                        fixable=code is not None and tool == "ruff" and code.group("fixable") is not None,
+                    )
                 )
-                issues.append(issue)
+        return issues
+
+    @staticmethod
+    def parseRuffJson(lines: Iterable[str], cwd: Path) -> Iterator[PythonIssue]:
+        """
+        Parses `ruff --output-format json-lines` output as it comes,
+        or `ruff --format json` output of older ruff versions, which is a single JSON array
+        :param cwd: working directory of ruff: absolute filenames are made relative to it, as in the text output
+        """
+        root = os.path.join(str(Path(cwd).resolve()), "")
+        for record in PythonIssue._json_records(lines):
+            filename: str = record["filename"]
+            if filename.startswith(root):
+                filename = filename[len(root) :]
+            fix = record.get("fix")
+            # older ruff versions apply "Automatic" and "Unspecified" fixes, as marked with "[*]" in the text output
+            fixable = fix is not None and fix.get("applicability", "safe") in ["safe", "Automatic", "Unspecified"]
+            code = record.get("code")
+            # same description as in the text output, which is a part of issue identity, e.g. for cache backend
+            description = " ".join(part for part in [code, "[*]" if fixable else None, record["message"]] if part)
+            yield PythonIssue(
+                filename=filename,
+                issue_line=int(record["location"]["row"]),
+                description=description,
+                tool="ruff",
+                code=code,
+                end_line=int(record["end_location"]["row"]) if record.get("end_location") else None,
+                column=int(record["location"]["column"]),
+                fixable=fixable,
+            )
 
+    @staticmethod
+    def _json_records(lines: Iterable[str]) -> Iterator[dict]:
+        """
+        Yields JSON objects of JSON lines, or of a JSON array, which is read till the end. Other lines are skipped
+        """
+        line_iter = iter(lines)
+        for line in line_iter:
+            if line.lstrip().startswith("["):
+                try:
+                    records = json.loads(line + "".join(line_iter))
+                except json.JSONDecodeError:
+                    return
+                yield from (record for record in records if isinstance(record, dict))
+                return
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+    @staticmethod
+    def parseMypyJson(lines: Iterable[str], tool: str = "mypy", severity: str = "error") -> Iterator[PythonIssue]:
+        """
+        Parses `mypy -O json` output as it comes, keeping only messages of the given severity
+        """
+        for record in PythonIssue._json_records(lines):
+            if record.get("severity") != severity:
+                continue
+            code = record.get("code")
+            # same description as in the text output
+            description = f"{severity}: {record['message']}" + (f"  [{code}]" if code else "")
+            yield PythonIssue(
+                filename=record["file"],
+                issue_line=int(record["line"]),
+                description=description,
+                tool=tool,
+                code=code,
+                end_line=int(record["end_line"]) if record.get("end_line") is not None else None,
+                # mypy columns are 0-based
+                column=int(record["column"]) + 1 if record.get("column") is not None else None,
+            )
+
+    @staticmethod
+    def stream_issues(
+        command: list[str], cwd: Path, parser: Callable[[Iterable[str]], Iterator[PythonIssue]]
+    ) -> list[PythonIssue] | None:
+        """
+        Runs the tool and parses its machine-readable output line by line, while the tool is still running
+        :return: issues, or None if the tool failed without output, e.g. it does not support JSON output
+        """
+        process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        with process:
+            issues = list(parser(process.stdout))
+        if process.returncode not in [0, 1] and len(issues) == 0:
+            return None
         return issues
@@ -0,0 +1,63 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+
+from ...proposals.diff_proposal import DiffProposal
+from ..python.python_issue import PythonIssue
+
+
+class RuffFixProposal(DiffProposal):
+    """
+    One changed range of ruff's own fix of a file, applied to diff target without backends
+    """
+
+    def __init__(self, filename: str, issues: list[PythonIssue], start_line: int, end_line: int, lines: list[str]):
+        """
+        :param issues: fixable issues, reported within the range
+        :param lines: fixed code of the range
+        """
+        super().__init__(
+            filename,
+            description="ruff fix: " + ", ".join(issue.description for issue in issues),
+            issue_line=issues[0].issue_line,
+            start_line=start_line,
+            end_line=end_line,
+        )
+        self.issues: list[PythonIssue] = issues
+        self.proposed_lines = lines
+
+    @staticmethod
+    def from_fix(
+        filename: str, original: list[str], fixed: list[str], issues: list[PythonIssue]
+    ) -> list[RuffFixProposal]:
+        """
+        Splits ruff fix of the file into changed ranges, keeping only ranges with given issues
+        :return: proposals in the order of lines
+        """
+        proposals: list[RuffFixProposal] = []
+        for tag, i1, i2, j1, j2 in SequenceMatcher(None, original, fixed, autojunk=False).get_opcodes():
+            if tag == "equal":
+                continue
+            if i1 == i2 and i1 > 0:
+                # pure insertion also replaces the line before, so the range is never empty
+                i1, j1 = i1 - 1, j1 - 1
+            range_issues = [issue for issue in issues if i1 < issue.issue_line <= max(i2, i1 + 1)]
+            if len(range_issues) > 0:
+                proposals.append(RuffFixProposal(filename, range_issues, i1 + 1, i2, fixed[j1:j2]))
+        return proposals
+
+    @staticmethod
+    def apply_all(original: list[str], proposals: list[RuffFixProposal]) -> list[str]:
+        lines = list(original)
+        # from the bottom, so line numbers of remaining proposals stay valid
+        for proposal in reversed(proposals):
+            lines[proposal.start_line - 1 : proposal.end_line] = proposal.proposed_lines
+        return lines
+
+    def try_fixing(self, query_backend, diff_target) -> bool:
+        with open(self.filename) as file:
+            self.all_lines = file.read().splitlines(keepends=True)
+        self.issue_lines = self.all_lines[self.start_line - 1 : self.end_line]
+        return diff_target.apply_diff(self)
@@ -2,40 +2,258 @@
 
 from __future__ import annotations
 
+import os
 import subprocess
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Final
 
-from ...auxiliary import set_directory
 from ...issues.issue import IssueDescriptor
+from ...logger import logger
+from ...targets.diff import DiffTarget
 from ..issue_solver import IssueSolver
+from ..python.lint_cache import LintCache
 from ..python.python_issue import PythonIssue
+from ..validity_cache import ValidityCache
+from .autofix import RuffFixProposal
 
 
 class Ruff_IssueSolver(IssueSolver):
+    # files not found in lint cache are linted by chunks, keeping command line short
+    files_per_run: Final[int] = 1000
+    # JSON output arguments, tried in order: older ruff versions (as pinned in requirements.txt) only know
+    # `--format json`, newer ones dropped it in favour of streaming `--output-format json-lines`
+    json_formats: Final[list[list[str]]] = [["--format", "json"], ["--output-format", "json-lines"]]
+
     def __init__(
         self,
         config_path: Path,
         run_path: Path,
         command_dir: str = ".",
         validity_test: str | None = None,
+        jobs: int = 1,
+        pipeline: dict[str, int] | bool | None = None,
+        batch: int = 1,
+        speculative: bool = False,
+        validity_cache: ValidityCache | None = None,
+        test_impact: dict[str, str | int] | bool | None = None,
+        warm_runner: dict[str, str | list[str]] | bool | None = None,
         args: str | None = None,
+        incremental: bool = False,
+        lint_cache: bool | str = False,
+        autofix: bool = False,
     ):
-        super().__init__(config_path, run_path, command_dir, validity_test=validity_test)
+        super().__init__(
+            config_path,
+            run_path,
+            command_dir,
+            validity_test=validity_test,
+            jobs=jobs,
+            pipeline=pipeline,
+            batch=batch,
+            speculative=speculative,
+            validity_cache=validity_cache,
+            test_impact=test_impact,
+            warm_runner=warm_runner,
+        )
 
         self.args: str = args if args is not None else "check"
+        # re-lint only fixed files, instead of the whole command_dir
+        self.incremental: Final[bool] = incremental
+        # JSON output arguments, which are not yet known to be unsupported by installed ruff
+        self.json_output: list[list[str]] = list(self.json_formats)
+        # issues of unchanged files. `lint_cache: true` in config keeps them in ~/.cache/hallux
+        self.lint_cache: Final[LintCache | None] = (
+            LintCache(
+                Path(lint_cache) if isinstance(lint_cache, str) else LintCache.default_path(config_path, "ruff"),
+                "ruff",
+                self.args,
+                run_path,
+            )
+            if lint_cache
+            else None
+        )
+        # apply ruff's own safe fixes before solving the remaining issues with backends
+        self.autofix: Final[bool] = autofix
+        # issues, fixed by ruff and not refreshed by diff target, e.g. posted as pull-request suggestions
+        self.autofixed: set[tuple[str, str, str]] = set()
 
     def list_issues(self) -> list[IssueDescriptor]:
+        return self._list_ruff([self.command_dir])
+
+    def list_file_issues(self, filename: str) -> list[IssueDescriptor] | None:
+        if not self.incremental:
+            return None
+        return self._list_ruff([filename])
+
+    def list_issues_in_files(self, filenames: list[str]) -> list[IssueDescriptor] | None:
+        python_files = [filename for filename in filenames if filename.endswith((".py", ".pyi"))]
+        return self._list_ruff(python_files) if len(python_files) > 0 else []
+
+    def _list_ruff(self, paths: list[str]) -> list[IssueDescriptor]:
+        """
+        Lints only files, which are not found in self.lint_cache
+        """
+        if self.lint_cache is None:
+            return self._run_ruff(paths)
+        filenames = self._ruff_files(paths)
+        if filenames is None:
+            return self._run_ruff(paths)
+
         issues: list[IssueDescriptor] = []
-        with set_directory(self.run_path):
-            try:
-                ruff_output = subprocess.check_output(["ruff", self.args, self.command_dir])
-            except subprocess.CalledProcessError as e:
-                ruff_output = e.output
+        missed: dict[str, str] = {}
+        for filename in filenames:
+            key = self.lint_cache.file_key(filename)
+            cached = self.lint_cache.get(key)
+            if cached is None:
+                missed[filename] = key
+            else:
+                issues.extend(cached)
+        logger.info(f"ruff: {len(filenames) - len(missed)} of {len(filenames)} files are found in lint cache")
+
+        missed_names = list(missed)
+        for start in range(0, len(missed_names), self.files_per_run):
+            chunk = missed_names[start : start + self.files_per_run]
+            file_issues: dict[str, list[IssueDescriptor]] = {filename: [] for filename in chunk}
+            for issue in self._run_ruff(chunk):
+                file_issues.setdefault(issue.filename, []).append(issue)
+                issues.append(issue)
+            for filename in chunk:
+                self.lint_cache.put(missed[filename], file_issues[filename])
+        return sorted(issues, key=lambda issue: (issue.filename, issue.issue_line, issue.column or 0))
+
+    def _ruff_files(self, paths: list[str]) -> list[str] | None:
+        """
+        :return: files, linted by ruff under paths, relative to run_path. None if ruff failed
+        """
+        try:
+            output = subprocess.check_output(
+                ["ruff", self.args, "--show-files"] + paths, cwd=self.run_path, stderr=subprocess.DEVNULL
+            )
+        except (subprocess.CalledProcessError, OSError):
+            return None
+        root = os.path.join(str(self.run_path.resolve()), "")
+        filenames = [line for line in output.decode("utf-8").splitlines() if line]
+        return [filename[len(root) :] if filename.startswith(root) else filename for filename in filenames]
+
+    def _run_ruff(self, paths: list[str]) -> list[IssueDescriptor]:
+        issues: list[IssueDescriptor] = []
+        while len(self.json_output) > 0:
+            json_issues = PythonIssue.stream_issues(
+                ["ruff", self.args] + self.json_output[0] + paths,
+                self.run_path,
+                lambda lines: PythonIssue.parseRuffJson(lines, self.run_path),
+            )
+            if json_issues is not None:
+                return json_issues
+            self.json_output.pop(0)
+            if len(self.json_output) == 0:
+                logger.info("ruff does not support JSON output, parsing text output instead")
+
+        try:
+            ruff_output = subprocess.check_output(["ruff", self.args] + paths, cwd=self.run_path)
+        except subprocess.CalledProcessError as e:
+            ruff_output = e.output
 
         issues.extend(PythonIssue.parseIssues(ruff_output.decode("utf-8")))
 
         return issues
 
+    def fix_natively(self, diff_target: DiffTarget) -> None:
+        """
+        Applies ruff's own safe fixes of all files at once, validates them with a single validity_test run
+        (file by file, if it fails), then commits every changed range through diff_target
+        """
+        self.scope = diff_target.scope()
+        file_issues: dict[str, list[PythonIssue]] = {}
+        for issue in self.list_scoped_issues():
+            if isinstance(issue, PythonIssue) and issue.fixable:
+                file_issues.setdefault(issue.filename, []).append(issue)
+
+        proposals: dict[str, list[RuffFixProposal]] = {}
+        originals: dict[str, list[str]] = {}
+        for filename, issues in file_issues.items():
+            with open(filename) as file:
+                originals[filename] = file.read().splitlines(keepends=True)
+            fixed = self._fixed_lines(filename, "".join(originals[filename]))
+            if fixed is not None:
+                file_proposals = RuffFixProposal.from_fix(filename, originals[filename], fixed, issues)
+                if len(file_proposals) > 0:
+                    proposals[filename] = file_proposals
+        if len(proposals) == 0:
+            return
+        fixable_count = sum(
+            len(proposal.issues) for file_proposals in proposals.values() for proposal in file_proposals
+        )
+        logger.info(f"ruff fixes {fixable_count} issues in {len(proposals)} files")
+
+        if self.validity_test is not None and not self._fixes_pass(proposals, originals):
+            proposals = {
+                filename: file_proposals
+                for filename, file_proposals in proposals.items()
+                if self._fixes_pass({filename: file_proposals}, originals)
+            }
+
+        for filename in sorted(proposals):
+            with self.lock_file(filename):
+                # from the bottom, so line numbers of remaining proposals stay valid
+                for proposal in reversed(proposals[filename]):
+                    fixed = False
+                    try:
+                        fixed = proposal.try_fixing(None, diff_target) and diff_target.commit_diff()
+                    finally:
+                        if not fixed:
+                            diff_target.revert_diff()
+                    for issue in proposal.issues:
+                        if fixed and not diff_target.requires_refresh():
+                            self.autofixed.add(issue.fingerprint())
+                        self.report_outcome(issue, fixed, proposal)
+
+    def _fixed_lines(self, filename: str, source: str) -> list[str] | None:
+        try:
+            fixed = subprocess.run(
+                ["ruff", self.args, "--fix-only", "--exit-zero", "--stdin-filename", filename, "-"],
+                input=source,
+                cwd=self.run_path,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        except (subprocess.CalledProcessError, OSError) as e:
+            logger.warning(f"ruff is not able to fix {filename}: {e}")
+            return None
+        return fixed.splitlines(keepends=True)
+
+    def _fixes_pass(self, proposals: dict[str, list[RuffFixProposal]], originals: dict[str, list[str]]) -> bool:
+        """
+        Writes fixes into files, runs validity_test and restores files
+        """
+        with ExitStack() as locks:
+            for filename in sorted(proposals):
+                locks.enter_context(self.lock_file(filename))
+            locks.enter_context(self.lock_tree())
+            try:
+                for filename, file_proposals in proposals.items():
+                    with open(filename, "wt") as file:
+                        file.writelines(RuffFixProposal.apply_all(originals[filename], file_proposals))
+                return self.run_validity_test()
+            finally:
+                for filename in proposals:
+                    with open(filename, "wt") as file:
+                        file.writelines(originals[filename])
+
+    def is_finished(self, issue: IssueDescriptor) -> bool:
+        return issue.fingerprint() in self.autofixed or super().is_finished(issue)
+
     def solve_issues(self, diff_target, query_backend):
         print("Process ruff:")
-        super().solve_issues(diff_target, query_backend)
+        try:
+            if self.autofix:
+                self.fix_natively(diff_target)
+            super().solve_issues(diff_target, query_backend)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self.lint_cache is not None:
+            self.lint_cache.close()
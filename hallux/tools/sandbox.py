@@ -0,0 +1,36 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Final
+
+
+class Sandbox:
+    """
+    Isolated copy of the project tree. Used for solving issues in parallel (--jobs N):
+    every worker fixes its own files inside its own copy, so workers never see each other's temporary changes.
+    """
+
+    ignore_patterns: Final[tuple[str, ...]] = (".git", "__pycache__", ".mypy_cache", ".ruff_cache", ".pytest_cache")
+
+    def __init__(self, root: Path):
+        self.root: Final[Path] = root.resolve()
+        self.tmp_dir = tempfile.TemporaryDirectory(prefix="hallux-sandbox-")
+        self.path: Final[Path] = Path(self.tmp_dir.name).joinpath(self.root.name)
+        shutil.copytree(self.root, self.path, symlinks=True, ignore=shutil.ignore_patterns(*self.ignore_patterns))
+
+    def rebase(self, path: Path | str) -> Path:
+        """
+        :return: corresponding path inside the sandbox, or original path if it lies outside the copied tree
+        """
+        absolute = Path(path).resolve()
+        try:
+            return self.path.joinpath(absolute.relative_to(self.root))
+        except ValueError:
+            return Path(path)
+
+    def cleanup(self) -> None:
+        self.tmp_dir.cleanup()
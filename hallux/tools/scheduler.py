@@ -0,0 +1,163 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, Iterator
+
+from ..backends.query_backend import QueryBackend
+from ..logger import logger
+from ..proposals.diff_proposal import DiffProposal
+from ..targets.diff import DiffTarget
+
+if TYPE_CHECKING:
+    from .issue_solver import IssueSolver
+
+
+class FileLockManager:
+    """
+    Per-file locks, shared by concurrently running solvers: every file is modified by one solver at a time.
+    Tree lock is held by a solver from applying a fix till its commit or revert, so validation of a fix never sees
+    unvalidated fixes of other solvers. Backend queries of different solvers still overlap.
+    Committed proposals are announced to other solvers, which shift line numbers of their pending issues.
+    """
+
+    def __init__(self, solvers: list[IssueSolver]):
+        self.solvers: Final[list[IssueSolver]] = solvers
+        self.mutex: Final[threading.Lock] = threading.Lock()
+        self.file_locks: Final[dict[Path, threading.Lock]] = {}
+        # always taken after file locks, never before
+        self.tree_lock: Final[threading.Lock] = threading.Lock()
+
+    @staticmethod
+    def file_key(filename: str) -> Path:
+        # different tools might report the same file by different relative names
+        return Path(filename).resolve()
+
+    @contextmanager
+    def locked(self, filename: str) -> Iterator[None]:
+        key = self.file_key(filename)
+        with self.mutex:
+            lock = self.file_locks.setdefault(key, threading.Lock())
+        with lock:
+            yield
+
+    @contextmanager
+    def locked_tree(self) -> Iterator[None]:
+        with self.tree_lock:
+            yield
+
+    def committed(self, solver: IssueSolver, proposal: DiffProposal) -> None:
+        """
+        Shall be called by solver, while it still holds the lock of proposal.filename
+        """
+        key = self.file_key(proposal.filename)
+        for other_solver in self.solvers:
+            if other_solver is solver:
+                continue
+            for issue in list(other_solver.target_issues):
+                if self.file_key(issue.filename) == key:
+                    issue.remap_lines(proposal)
+
+
+class TreeLockedTarget(DiffTarget):
+    """
+    DiffTarget of one of concurrently running solvers: holds the tree lock of FileLockManager
+    from apply_diff() till commit_diff() or revert_diff()
+    """
+
+    def __init__(self, diff_target: DiffTarget, file_locks: FileLockManager):
+        self.diff_target: Final[DiffTarget] = diff_target
+        self.file_locks: Final[FileLockManager] = file_locks
+        self.holding: bool = False
+
+    def apply_diff(self, diff: DiffProposal) -> bool:
+        if not self.holding:
+            self.file_locks.tree_lock.acquire()
+            self.holding = True
+        applied = False
+        try:
+            applied = self.diff_target.apply_diff(diff)
+        finally:
+            if not applied:
+                # nothing was written
+                self.release()
+        return applied
+
+    def revert_diff(self) -> None:
+        try:
+            self.diff_target.revert_diff()
+        finally:
+            self.release()
+
+    def commit_diff(self) -> bool:
+        committed = self.diff_target.commit_diff()
+        if committed:
+            self.release()
+        return committed
+
+    def requires_refresh(self) -> bool:
+        return self.diff_target.requires_refresh()
+
+    def scope(self) -> dict[str, set[int]] | None:
+        return self.diff_target.scope()
+
+    def release(self) -> None:
+        if self.holding:
+            self.holding = False
+            self.file_locks.tree_lock.release()
+
+
+class SolverScheduler:
+    """
+    Runs IssueSolvers concurrently, one thread per solver, so wall-clock time is close to the slowest solver.
+    Solvers coordinate through FileLockManager, so fixes of different tools never touch the same file at once,
+    and every fix is validated without pending fixes of other tools.
+    Solvers, which cannot share the process with others (see IssueSolver.can_run_concurrently()),
+    run afterwards one-by-one.
+    """
+
+    def __init__(self, solvers: list[IssueSolver]):
+        self.solvers: Final[list[IssueSolver]] = solvers
+
+    def run(self, diff_target: DiffTarget, query_backend: QueryBackend) -> None:
+        concurrent_solvers = [solver for solver in self.solvers if solver.can_run_concurrently()]
+        if len(concurrent_solvers) < 2:
+            concurrent_solvers = []
+        else:
+            self.run_concurrently(concurrent_solvers, diff_target, query_backend)
+
+        for solver in self.solvers:
+            if solver not in concurrent_solvers:
+                solver.solve_issues(diff_target, query_backend)
+
+    @staticmethod
+    def run_concurrently(solvers: list[IssueSolver], diff_target: DiffTarget, query_backend: QueryBackend) -> None:
+        logger.info(f"Running {len(solvers)} solvers concurrently")
+        file_locks = FileLockManager(solvers)
+        for solver in solvers:
+            solver.file_locks = file_locks
+
+        errors: list[BaseException] = []
+        try:
+            with ThreadPoolExecutor(max_workers=len(solvers), thread_name_prefix="hallux-solver") as executor:
+                # every solver needs own copy of diff_target, which keeps proposal between apply and commit
+                futures = [
+                    executor.submit(
+                        solver.solve_issues, TreeLockedTarget(copy.copy(diff_target), file_locks), query_backend
+                    )
+                    for solver in solvers
+                ]
+                for future in futures:
+                    if future.exception() is not None:
+                        errors.append(future.exception())
+        finally:
+            for solver in solvers:
+                solver.file_locks = None
+
+        if len(errors) > 0:
+            raise errors[0]
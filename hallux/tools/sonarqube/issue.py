@@ -7,6 +7,7 @@ from typing import Final
 from hallux.logger import logger
 
 from ...issues.issue import IssueDescriptor
+from ...proposals.diff_proposal import DiffProposal
 from ...proposals.proposal_engine import ProposalEngine, ProposalList
 from ...proposals.python_proposal import PythonProposal
 from ...proposals.simple_proposal import SimpleProposal
@@ -35,6 +36,13 @@ class SonarIssue(IssueDescriptor):
         self.text_range: dict = text_range
         self.already_fixed_files: Final[list[str]] = already_fixed_files
 
+    def remap_lines(self, proposal: DiffProposal) -> None:
+        super().remap_lines(proposal)
+        if isinstance(self.text_range, dict):
+            for key in ["startLine", "endLine"]:
+                if key in self.text_range:
+                    self.text_range[key] = proposal.shift_line(self.text_range[key])
+
     def list_proposals(self) -> ProposalEngine:
         start_line: int = self.text_range["startLine"]
         end_line: int = self.text_range["endLine"]
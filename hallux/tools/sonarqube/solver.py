@@ -12,8 +12,10 @@ import requests
 from hallux.logger import logger
 
 from ...backends.query_backend import QueryBackend
+from ...proposals.diff_proposal import DiffProposal
 from ...targets.diff import DiffTarget
 from ..issue_solver import IssueSolver
+from ..validity_cache import ValidityCache
 from .issue import IssueDescriptor, SonarIssue
 
 
@@ -46,6 +48,13 @@ class Sonar_IssueSolver(IssueSolver):
         run_path: Path,
         command_dir: str = ".",
         validity_test: str | None = None,
+        jobs: int = 1,
+        pipeline: dict[str, int] | bool | None = None,
+        batch: int = 1,
+        speculative: bool = False,
+        validity_cache: ValidityCache | None = None,
+        test_impact: dict[str, str | int] | bool | None = None,
+        warm_runner: dict[str, str | list[str]] | bool | None = None,
         url: str | None = None,
         token: str | None = None,
         project: str | None = None,
@@ -58,13 +67,32 @@ class Sonar_IssueSolver(IssueSolver):
         :param run_path: Directory, where hallux was run
         :param command_dir: Directory, passed to hallux in CLI
         :param validity_test: script
+        :param jobs: number of parallel workers, see IssueSolver.solve_issues_in_parallel()
+        :param pipeline: stage limits for IssuePipeline, or True for default ones
+        :param batch: max number of nearby issues, fixed by one backend request
+        :param speculative: query backends for all proposals of an issue at once
+        :param validity_cache: outcomes of validity_test for already tested project trees
+        :param test_impact: settings of TestImpact, validates fixes by tests, which execute changed lines
+        :param warm_runner: settings of WarmTestRunner, runs validity tests in forks of a warm pytest worker
         :param url:
         :param token:
         :param project:
         :param search_params:
         :param argvalue: It could be a path to a .json file, or a string with extra params
         """
-        super().__init__(config_path, run_path, command_dir, validity_test=validity_test)
+        super().__init__(
+            config_path,
+            run_path,
+            command_dir,
+            validity_test=validity_test,
+            jobs=jobs,
+            pipeline=pipeline,
+            batch=batch,
+            speculative=speculative,
+            validity_cache=validity_cache,
+            test_impact=test_impact,
+            warm_runner=warm_runner,
+        )
 
         self.token: Final[str | None] = token if token is not None else os.getenv(self.SONAR_TOKEN)
         self.url: Final[str | None] = url
@@ -87,11 +115,11 @@ class Sonar_IssueSolver(IssueSolver):
     def _check_file(self):
         return self.argvalue and self.argvalue.endswith(".json") and Path(self.argvalue).exists()
 
-    def is_issue_fixed(self) -> bool:
+    def is_issue_fixed(self, issue: IssueDescriptor | None = None, proposal: DiffProposal | None = None) -> bool:
         if self.validity_test is None:
             return True
         else:
-            return super().is_issue_fixed()
+            return super().is_issue_fixed(issue, proposal)
 
     def list_issues(self) -> list[IssueDescriptor]:
         issues: list[IssueDescriptor] = []
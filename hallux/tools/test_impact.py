@@ -0,0 +1,116 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import os
+import shlex
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Final
+
+from ..logger import logger
+from ..proposals.diff_proposal import DiffProposal
+
+
+class TestImpact:
+    """
+    Line -> test map of the project, collected once with coverage.py dynamic contexts (pytest-cov `--cov-context=test`).
+    Fixes are validated by tests, which execute changed lines, instead of the whole validity_test.
+    Whole validity_test still runs for every `full_every`-th fix, for lines executed on import, and for unknown files.
+    """
+
+    __test__ = False
+
+    # more tests are cheaper to run as the whole validity_test
+    max_tests: Final[int] = 500
+
+    def __init__(self, config_path: Path, command: str = "python -m pytest -q", tests: str = "", full_every: int = 10):
+        """
+        :param config_path: project root, tests are run from there
+        :param command: pytest command, test node ids are appended to it
+        :param tests: pytest arguments, selecting all tests for the line -> test map
+        :param full_every: every N-th check runs the whole validity_test
+        """
+        self.config_path: Final[Path] = config_path
+        self.command: Final[list[str]] = shlex.split(command)
+        self.tests: Final[list[str]] = shlex.split(tests)
+        self.full_every: Final[int] = max(1, int(full_every))
+        # relative filename -> line -> test node ids. Empty node id means the line is executed on import
+        self.line_tests: dict[str, dict[int, set[str]]] = {}
+        self.checks: int = 0
+        # fixes, validated by impacted tests only, since the last passed whole validity_test
+        self.unverified: list[str] = []
+
+    def build_map(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="hallux-coverage-") as tmp_dir:
+            data_file = Path(tmp_dir).joinpath(".coverage")
+            logger.info("Collecting line -> test map for test impact selection ...")
+            subprocess.run(
+                self.command + ["--cov=.", "--cov-context=test", "--cov-report="] + self.tests,
+                cwd=self.config_path,
+                env={**os.environ, "COVERAGE_FILE": str(data_file)},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            if not data_file.exists():
+                logger.warning("Test impact selection is not available: no coverage data, is pytest-cov installed?")
+                return
+            self.line_tests = self.read_map(data_file, self.config_path)
+        logger.info(f"Test impact map covers {len(self.line_tests)} files")
+
+    @staticmethod
+    def read_map(data_file: Path, root: Path) -> dict[str, dict[int, set[str]]]:
+        # coverage is installed together with pytest-cov, which is needed anyway
+        from coverage import CoverageData
+
+        data = CoverageData(basename=str(data_file))
+        data.read()
+        line_tests: dict[str, dict[int, set[str]]] = {}
+        for filename in data.measured_files():
+            lines = line_tests.setdefault(os.path.relpath(filename, root), {})
+            for line, contexts in data.contexts_by_lineno(filename).items():
+                # pytest-cov contexts are "node_id|setup", "node_id|run" and "node_id|teardown"
+                lines[line] = {context.rsplit("|", 1)[0] for context in contexts}
+        return line_tests
+
+    def relative_name(self, filename: str) -> str:
+        return os.path.relpath(Path(filename).resolve(), self.config_path.resolve())
+
+    def select(self, proposal: DiffProposal) -> list[str] | None:
+        """
+        :return: node ids of tests, which execute lines, replaced by the proposal.
+                 None, if the whole validity_test shall be run instead
+        """
+        self.checks += 1
+        lines = self.line_tests.get(self.relative_name(proposal.filename))
+        if lines is None or self.checks % self.full_every == 0:
+            return None
+
+        tests: set[str] = set()
+        for line in range(proposal.start_line, proposal.end_line + 1):
+            tests.update(lines.get(line, set()))
+        if "" in tests:
+            return None
+        if len(tests) == 0:
+            # changed lines are not executed by tests, but tests of the file still shall pass
+            tests = set().union(*lines.values()) - {""}
+        if len(tests) == 0 or len(tests) > self.max_tests:
+            return None
+        return sorted(tests)
+
+    def test_command(self, tests: list[str]) -> list[str]:
+        return self.command + tests
+
+    def shift_lines(self, proposal: DiffProposal) -> None:
+        """
+        Keeps the map in sync with the file, after proposal was committed
+        """
+        filename = self.relative_name(proposal.filename)
+        lines = self.line_tests.get(filename)
+        if lines is None:
+            return
+        shifted: dict[int, set[str]] = {}
+        for line, tests in lines.items():
+            shifted.setdefault(proposal.shift_line(line), set()).update(tests)
+        self.line_tests[filename] = shifted
@@ -0,0 +1,112 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Final
+
+from ..logger import logger
+from .file_hashes import FileHashes
+from .sandbox import Sandbox
+
+
+class ValidityCache:
+    """
+    Outcomes of validity tests, keyed by the test command and contents of the project files.
+    Reverted attempts often recreate already tested tree, then the test is not run again.
+    Passed outcomes are appended to JSON lines file, so later runs reuse them too. Failures are kept for the current
+    run only, so a flaky failure is not remembered for the same files forever.
+    """
+
+    def __init__(self, path: Path):
+        """
+        :param path: cache file, created if not exists
+        """
+        self.path: Final[Path] = path
+        self.lock: Final[threading.Lock] = threading.Lock()
+        # key -> True if validity test passed
+        self.outcomes: Final[dict[str, bool]] = self.read(path) if path.exists() else {}
+        # files are re-hashed only when modified
+        self.file_hashes: Final[FileHashes] = FileHashes()
+        self.file = open(path, "at")
+
+    @staticmethod
+    def default_path(config_path: Path) -> Path:
+        project_hash = hashlib.md5(str(config_path.resolve()).encode("utf8")).hexdigest()
+        cache_dir = Path.home().joinpath(".cache", "hallux")
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return cache_dir.joinpath(f"validity-{project_hash}.jsonl")
+
+    @staticmethod
+    def read(path: Path) -> dict[str, bool]:
+        outcomes: dict[str, bool] = {}
+        with open(path) as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                    # failures, written by older versions, are tested again
+                    if record["passed"]:
+                        outcomes[record["key"]] = True
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.debug(f"Skipping broken validity cache line: {line}")
+        return outcomes
+
+    @staticmethod
+    def list_files(root: Path) -> list[str]:
+        """
+        :return: relative names of files, tracked or not ignored by git. Whole tree, if root is not in git repo
+        """
+        try:
+            output = subprocess.check_output(
+                ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+                cwd=root,
+                stderr=subprocess.DEVNULL,
+            )
+            return sorted(name for name in output.decode("utf8").split("\0") if name)
+        except (subprocess.CalledProcessError, OSError):
+            pass
+
+        filenames: list[str] = []
+        for dirpath, dirnames, files in os.walk(root):
+            dirnames[:] = [name for name in dirnames if name not in Sandbox.ignore_patterns]
+            for name in files:
+                filenames.append(os.path.relpath(os.path.join(dirpath, name), root))
+        return sorted(filenames)
+
+    def file_hash(self, filename: str) -> str:
+        return self.file_hashes.get(filename)
+
+    def key(self, command: str, root: Path) -> str:
+        """
+        :return: hash of the test command, and of relative names and contents of all files under root
+        """
+        try:
+            # cache file itself might be kept inside the project
+            own_name: str | None = str(self.path.resolve().relative_to(root.resolve()))
+        except ValueError:
+            own_name = None
+        tree = hashlib.sha256(command.encode("utf8"))
+        for name in self.list_files(root):
+            if name == own_name:
+                continue
+            tree.update(f"\0{name}\0{self.file_hash(str(root.joinpath(name)))}".encode("utf8"))
+        return tree.hexdigest()
+
+    def get(self, key: str) -> bool | None:
+        with self.lock:
+            return self.outcomes.get(key)
+
+    def put(self, key: str, passed: bool) -> None:
+        with self.lock:
+            self.outcomes[key] = passed
+            if passed:
+                self.file.write(json.dumps({"key": key, "passed": passed}) + "\n")
+                self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
@@ -0,0 +1,86 @@
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import json
+import os
+import shlex
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Final
+
+from ..logger import logger
+
+
+class WarmTestRunner:
+    """
+    Runs validity tests with pytest in a forked child of a long-living worker (see warm_worker.py),
+    which has imported pytest and heavy dependencies once, so interpreter start-up and imports are not paid per check.
+    Worker is started on first use, and again in forked processes (--jobs N), which can not share its pipes.
+    """
+
+    def __init__(self, python: str | None = None, args: str = "", preload: list[str] | None = None):
+        """
+        :param python: interpreter of the tested project, the one of hallux by default
+        :param args: pytest arguments of the whole validity test, e.g. "tests -x -q"
+        :param preload: modules imported by the worker once, e.g. heavy third-party dependencies
+        """
+        self.python: Final[str] = python if python is not None else sys.executable
+        self.args: Final[list[str]] = shlex.split(args)
+        self.preload: Final[list[str]] = list(preload) if preload is not None else []
+        self.lock: Final[threading.Lock] = threading.Lock()
+        self.process: subprocess.Popen | None = None
+        # process, which started the worker
+        self.owner_pid: int | None = None
+
+    def command(self, args: list[str]) -> str:
+        """
+        :return: readable command, also a key for ValidityCache
+        """
+        return " ".join(["pytest"] + args)
+
+    def _start(self) -> subprocess.Popen:
+        if self.process is None or self.owner_pid != os.getpid() or self.process.poll() is not None:
+            logger.info(f"Starting warm test worker: {self.python}, preloading {self.preload}")
+            self.process = subprocess.Popen(
+                [self.python, str(Path(__file__).parent.joinpath("warm_worker.py"))] + self.preload,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            self.owner_pid = os.getpid()
+        return self.process
+
+    def run(self, root: Path, args: list[str] | None = None) -> bool:
+        """
+        :param root: directory, where pytest is run; project modules under it are imported again for every run
+        :param args: pytest arguments, self.args by default
+        :return: True if all tests passed
+        """
+        with self.lock:
+            process = self._start()
+            request = {"root": str(root.resolve()), "args": self.args if args is None else args}
+            try:
+                process.stdin.write(json.dumps(request) + "\n")
+                process.stdin.flush()
+                response = process.stdout.readline()
+            except (BrokenPipeError, OSError) as e:
+                raise SystemError(f"Warm test worker failed: {e}") from e
+            if not response:
+                raise SystemError(f"Warm test worker exited with code {process.wait()}")
+            return json.loads(response)["exit"] == 0
+
+    def close(self) -> None:
+        with self.lock:
+            if self.process is not None and self.owner_pid == os.getpid():
+                self.process.stdin.close()
+                self.process.wait()
+            self.process = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
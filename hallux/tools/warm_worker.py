@@ -0,0 +1,95 @@
+# Copyright: Hallux team, 2024
+
+# Fork server of WarmTestRunner, started with the interpreter of the tested project.
+# Imports pytest and heavy modules once, then forks a fresh child for every request:
+# project modules are dropped from sys.modules in the child, so the modified code is imported again.
+# Protocol: one JSON line per request on stdin {"root": DIR, "args": [PYTEST_ARGS]}, one line {"exit": CODE} back.
+# Kept free of hallux imports, since the project interpreter might not have hallux installed.
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+
+
+def project_modules(root: str) -> list[str]:
+    prefix = os.path.join(os.path.realpath(root), "")
+    names = []
+    for name, module in list(sys.modules.items()):
+        filename = getattr(module, "__file__", None)
+        if not filename:
+            continue
+        filename = os.path.realpath(filename)
+        if filename.startswith(prefix) and "site-packages" not in filename:
+            names.append(name)
+    return names
+
+
+def compile_from_source(root: str) -> None:
+    """
+    Bytecode of a file, modified within the same second with the same size, looks up-to-date.
+    Hence project files are always compiled from source, while bytecode of libraries is still used
+    """
+    from importlib.machinery import SourceFileLoader
+
+    prefix = os.path.join(os.path.realpath(root), "")
+    path_stats = SourceFileLoader.path_stats
+
+    def source_path_stats(self, path):
+        stats = path_stats(self, path)
+        if os.path.realpath(path).startswith(prefix):
+            # never matches the timestamp of bytecode
+            stats = {**stats, "mtime": -1}
+        return stats
+
+    SourceFileLoader.path_stats = source_path_stats
+    sys.dont_write_bytecode = True
+
+
+def run_child(root: str, args: list[str]) -> None:
+    # runs in the forked child, never returns
+    try:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        # stdout is the protocol channel of the parent
+        os.dup2(devnull, 1)
+        os.chdir(root)
+        compile_from_source(root)
+        for name in project_modules(root):
+            del sys.modules[name]
+        sys.path.insert(0, root)
+        import pytest
+
+        code = int(pytest.main(args))
+    except BaseException as e:
+        print(f"warm worker: {e}", file=sys.stderr)
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
+
+
+def main(preload: list[str]) -> int:
+    import pytest  # noqa: F401
+
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            print(f"warm worker: cannot preload {name}: {e}", file=sys.stderr)
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        pid = os.fork()
+        if pid == 0:
+            run_child(request["root"], request["args"])
+        _, status = os.waitpid(pid, 0)
+        code = os.WEXITSTATUS(status) if os.WIFEXITED(status) else 1
+        sys.stdout.write(json.dumps({"exit": code}) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
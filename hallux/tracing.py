@@ -0,0 +1,230 @@
+# Copyright: Hallux team, 2024
+
+# Built-in span tracing: where the time of a run goes (linters, backends, merging, file writes, validity tests).
+# Disabled by default, then traced methods cost one attribute check.
+# With `--profile` spans are written as Chrome trace JSON (chrome://tracing, ui.perfetto.dev)
+# and summarized per phase, per backend and per issue at the end of the run.
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Final, Iterator
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    start: float
+    thread: int
+    owner: Any = None
+    # Name of the class, which method was traced, e.g. backend type for `query`
+    cls: str | None = None
+    # "filename:line" of the issue, the span is working on
+    issue: str | None = None
+    duration: float = 0.0
+    # True, if enclosing span works on the same issue, so time is not counted twice for the issue
+    nested: bool = False
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+class Tracer:
+    """
+    Collects spans of all threads. Issue of the enclosing span is inherited by nested spans,
+    e.g. `commit_diff` within `solve_issue` is attributed to the solved issue.
+    """
+
+    def __init__(self):
+        self.enabled: bool = False
+        self.spans: Final[list[Span]] = []
+        self.start_time: float = time.perf_counter()
+        self.lock: Final[threading.Lock] = threading.Lock()
+        self.local: Final[threading.local] = threading.local()
+
+    def start(self) -> None:
+        with self.lock:
+            self.spans.clear()
+        self.start_time = time.perf_counter()
+        self.enabled = True
+
+    def stop(self) -> None:
+        self.enabled = False
+
+    def _stack(self) -> list[Span]:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    @contextmanager
+    def span(
+        self, name: str, category: str = "hallux", owner: Any = None, issue: str | None = None, **args
+    ) -> Iterator[Span | None]:
+        if not self.enabled:
+            yield None
+            return
+
+        stack = self._stack()
+        parent: Span | None = stack[-1] if len(stack) > 0 else None
+        if issue is None and parent is not None:
+            issue = parent.issue
+        span = Span(
+            name=name,
+            category=category,
+            start=time.perf_counter(),
+            thread=threading.get_ident(),
+            owner=owner,
+            cls=type(owner).__name__ if owner is not None else None,
+            issue=issue,
+            nested=parent is not None and parent.issue is not None and parent.issue == issue,
+            args=args,
+        )
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - span.start
+            stack.pop()
+            with self.lock:
+                self.spans.append(span)
+
+    def wrap(self, method: Callable, name: str, category: str) -> Callable:
+        @functools.wraps(method)
+        def traced(owner, *args, **kwargs):
+            if not self.enabled:
+                return method(owner, *args, **kwargs)
+            stack = self._stack()
+            if len(stack) > 0 and stack[-1].name == name and stack[-1].owner is owner:
+                # super() call of overridden method, already traced
+                return method(owner, *args, **kwargs)
+            with self.span(name, category, owner=owner, issue=issue_label(owner, *args)):
+                return method(owner, *args, **kwargs)
+
+        traced.__traced__ = True
+        return traced
+
+    def trace_events(self) -> dict:
+        """
+        :return: Chrome trace event format, complete ("X") events with microsecond timestamps
+        """
+        pid = os.getpid()
+        with self.lock:
+            spans = list(self.spans)
+        events = []
+        for span in spans:
+            args = {key: str(value) for key, value in span.args.items()}
+            if span.cls is not None:
+                args["class"] = span.cls
+            if span.issue is not None:
+                args["issue"] = span.issue
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": round((span.start - self.start_time) * 1e6, 1),
+                    "dur": round(span.duration * 1e6, 1),
+                    "pid": pid,
+                    "tid": span.thread,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: Path) -> None:
+        with open(path, "wt") as file:
+            json.dump(self.trace_events(), file)
+
+    def summary(self, max_issues: int = 10) -> str:
+        """
+        :return: per-phase, per-backend and per-issue tables. Phase times are inclusive, e.g. `is_issue_fixed`
+                 contains `list_issues`, when issues are re-listed
+        """
+        with self.lock:
+            spans = list(self.spans)
+
+        phases: dict[str, list[float]] = defaultdict(list)
+        backends: dict[str, list[float]] = defaultdict(list)
+        issues: dict[str, list[float]] = defaultdict(lambda: [0.0, 0])
+        for span in spans:
+            phases[span.name].append(span.duration)
+            if span.name == "query" and span.cls is not None:
+                backends[span.cls].append(span.duration)
+            if span.issue is not None:
+                if not span.nested:
+                    issues[span.issue][0] += span.duration
+                if span.name == "query":
+                    issues[span.issue][1] += 1
+
+        lines = [f"{'Phase':<24} {'Calls':>7} {'Total, s':>10} {'Mean, s':>10} {'Max, s':>10}"]
+        for name, durations in sorted(phases.items(), key=lambda item: -sum(item[1])):
+            lines.append(
+                f"{name:<24} {len(durations):>7} {sum(durations):>10.3f} {sum(durations) / len(durations):>10.3f}"
+                f" {max(durations):>10.3f}"
+            )
+        if len(backends) > 0:
+            lines.append("")
+            lines.append(f"{'Backend':<24} {'Queries':>7} {'Total, s':>10} {'Mean, s':>10} {'Max, s':>10}")
+            for cls, durations in sorted(backends.items(), key=lambda item: -sum(item[1])):
+                lines.append(
+                    f"{cls:<24} {len(durations):>7} {sum(durations):>10.3f} {sum(durations) / len(durations):>10.3f}"
+                    f" {max(durations):>10.3f}"
+                )
+        if len(issues) > 0:
+            lines.append("")
+            lines.append(f"{'Issue (slowest ' + str(max_issues) + ')':<40} {'Queries':>7} {'Total, s':>10}")
+            for issue, (total, queries) in sorted(issues.items(), key=lambda item: -item[1][0])[:max_issues]:
+                lines.append(f"{issue[-40:]:<40} {queries:>7} {total:>10.3f}")
+        return "\n".join(lines)
+
+
+def issue_label(*candidates: Any) -> str | None:
+    """
+    :return: "filename:line" of the first issue or proposal among candidates
+    """
+    for candidate in candidates:
+        filename = getattr(candidate, "filename", None)
+        issue_line = getattr(candidate, "issue_line", None)
+        if isinstance(filename, str) and isinstance(issue_line, int):
+            return f"{filename}:{issue_line}"
+    return None
+
+
+tracer: Final[Tracer] = Tracer()
+
+
+def traced_methods(category: str, *names: str) -> Callable[[type], type]:
+    """
+    Class decorator: listed methods of the class, and their overrides in all subclasses, are traced as spans
+    :param category: span category, e.g. "backend"
+    :param names: method names, also used as span names
+    """
+
+    def wrap_methods(cls: type) -> None:
+        for name in names:
+            method = cls.__dict__.get(name)
+            if callable(method) and not getattr(method, "__traced__", False):
+                setattr(cls, name, tracer.wrap(method, name, category))
+
+    def decorate(cls: type) -> type:
+        original = cls.__dict__.get("__init_subclass__")
+
+        def __init_subclass__(subclass, **kwargs):
+            if original is not None:
+                original.__func__(subclass, **kwargs)
+            else:
+                super(cls, subclass).__init_subclass__(**kwargs)
+            wrap_methods(subclass)
+
+        cls.__init_subclass__ = classmethod(__init_subclass__)
+        wrap_methods(cls)
+        return cls
+
+    return decorate
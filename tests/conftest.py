@@ -1,7 +1,12 @@
 # Copyright: Hallux team, 2023
+import os
+
 import pytest
 from utils import hallux_tmp_dir
 
+# litellm fetches model cost map from network in a background thread, which may race with lazy imports of tests
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
 
 def pytest_addoption(parser):
     parser.addoption("--real-openai-test", dest="real_test", action="store_true", default=False)
@@ -0,0 +1,109 @@
+#!/bin/env python
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+from unit.common.testing_issue import TestingIssue
+
+from hallux.backends.factory import BackendFactory
+from hallux.backends.hedging import HedgingPolicy
+from hallux.backends.query_backend import QueryBackend
+from hallux.proposals.simple_proposal import SimpleProposal
+from hallux.tools.pipeline import DeferredTarget
+
+
+class LatencyBackend(QueryBackend):
+    def __init__(self, answer: str, latency: float, previous_backend: QueryBackend | None = None):
+        super().__init__(previous_backend=previous_backend, prompt={"system": "", "user": "{ISSUE_LINES}"})
+        self.answer = answer
+        self.latency = latency
+        self.queries = 0
+
+    def query(self, request, issue=None, issue_lines=list):
+        self.queries += 1
+        time.sleep(self.latency)
+        return [self.answer] if self.answer else []
+
+
+class CacheBackend(LatencyBackend):
+    is_cache = True
+
+
+def make_proposal() -> SimpleProposal:
+    test_file = str(Path(__file__).resolve().parent.parent.joinpath("proposals", "simple_proposal_test.txt"))
+    return SimpleProposal(TestingIssue(test_file, issue_line=5), radius_or_range=1)
+
+
+def make_chain(primary_latency: float, secondary_latency: float) -> tuple[QueryBackend, ...]:
+    cache = CacheBackend("", 0.0)
+    primary = LatencyBackend("4\nprimary\n6\n", primary_latency, cache)
+    secondary = LatencyBackend("4\nsecondary\n6\n", secondary_latency, primary)
+    hedging = HedgingPolicy(delay=0.05)
+    for backend in [cache, primary, secondary]:
+        backend.hedging = hedging
+    return cache, primary, secondary
+
+
+def test_hedge_delay():
+    policy = HedgingPolicy(percentile=95, delay=3.0, min_samples=5)
+    backend = LatencyBackend("", 0.0)
+    assert policy.hedge_delay(backend) == 3.0
+    for latency in range(1, 21):
+        policy.record(backend, float(latency))
+    assert policy.hedge_delay(backend) == 19.0
+
+    assert HedgingPolicy.from_config(False) is None
+    assert HedgingPolicy.from_config({"percentile": 90}).percentile == 90
+    with pytest.raises(SystemError):
+        HedgingPolicy.from_config({"percentile": 0})
+
+
+def test_slow_primary_is_hedged():
+    cache, primary, secondary = make_chain(primary_latency=1.0, secondary_latency=0.0)
+    proposal = make_proposal()
+
+    start = time.monotonic()
+    fixed, used_backend = proposal.try_fixing_with_priority(secondary, DeferredTarget(), used_backend=cache)
+    assert time.monotonic() - start < 0.5
+    assert fixed and used_backend is secondary
+    assert proposal.proposed_lines == ["4\n", "secondary\n", "6\n"]
+    assert primary.queries == 1 and secondary.queries == 1
+
+
+def test_hung_backends_are_abandoned():
+    cache, primary, secondary = make_chain(primary_latency=1.0, secondary_latency=1.0)
+    hedging = HedgingPolicy(delay=0.05, timeout=0.1)
+    for backend in [cache, primary, secondary]:
+        backend.hedging = hedging
+    proposal = make_proposal()
+
+    assert proposal.try_fixing_with_priority(secondary, DeferredTarget(), used_backend=cache) == (False, secondary)
+    assert primary.queries == 1 and secondary.queries == 1
+
+
+def test_fast_primary_is_not_hedged():
+    cache, primary, secondary = make_chain(primary_latency=0.0, secondary_latency=0.0)
+    proposal = make_proposal()
+
+    # cache is queried first, without racing
+    assert proposal.try_fixing_with_priority(secondary, DeferredTarget(), used_backend=None) == (False, cache)
+    assert primary.queries == 0
+
+    fixed, used_backend = proposal.try_fixing_with_priority(secondary, DeferredTarget(), used_backend=cache)
+    assert fixed and used_backend is primary
+    assert proposal.proposed_lines == ["4\n", "primary\n", "6\n"]
+    assert secondary.queries == 0
+
+
+def test_factory_sets_hedging(tmp_path):
+    config = {"backends": [{"cache": {"type": "dummy", "filename": "cache.json"}}], "hedge": {"delay": 1.0}}
+    backend = BackendFactory.init_backend(["hallux", "."], config, tmp_path)
+    assert backend.hedging is not None and backend.hedging.delay == 1.0
+
+    config["hedge"] = False
+    assert BackendFactory.init_backend(["hallux", "."], config, tmp_path).hedging is None
+    assert BackendFactory.init_backend(["hallux", "--hedge", "."], config, tmp_path).hedging is not None
@@ -46,6 +46,18 @@ def test_query_valid_model(mock_completion, setup_litellm_backend):
     assert response == expected_response
 
 
+@patch("hallux.backends.litellm.completion")
+def test_query_counts_tokens(mock_completion, setup_litellm_backend):
+    mock_completion.return_value = {"choices": [{"message": {"content": "answer"}}], "usage": {"total_tokens": 42}}
+    setup_litellm_backend.query("Test request")
+    assert setup_litellm_backend.total_tokens() == 42
+
+    # without usage report tokens are estimated
+    mock_completion.return_value = {"choices": [{"message": {"content": "a" * 400}}]}
+    setup_litellm_backend.query("Test request")
+    assert setup_litellm_backend.total_tokens() > 142
+
+
 def test_query_invalid_model(invalid_model):
     with patch("hallux.logger.logger.warning"):
         backend = LiteLLMBackend(model=invalid_model)
@@ -0,0 +1,50 @@
+#!/bin/env python
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+from hallux.backends.query_backend import QueryBackend
+from hallux.issues.issue import IssueDescriptor
+from hallux.proposals.diff_proposal import DiffProposal
+from hallux.tools.issue_solver import IssueSolver
+
+
+class LineIssue(IssueDescriptor):
+    def list_proposals(self):
+        return [LineProposal(self)]
+
+
+class LineProposal(DiffProposal):
+    # replaces issue line with the backend answer
+    def __init__(self, issue: LineIssue):
+        super().__init__(issue.filename, issue.description, issue.issue_line, issue.issue_line, issue.issue_line)
+        with open(issue.filename) as file:
+            self.all_lines = file.read().splitlines(keepends=True)
+        self.issue_lines = self.all_lines[self.start_line - 1 : self.end_line]
+
+    def try_fixing(self, query_backend, diff_target) -> bool:
+        self.proposed_lines = query_backend.query("", None, self.issue_lines)
+        return diff_target.apply_diff(self)
+
+
+class BadLineSolver(IssueSolver):
+    # every line "bad" in *.txt files is an issue
+    def list_issues(self):
+        issues = []
+        for path in sorted(self.run_path.glob("*.txt")):
+            for i, line in enumerate(path.read_text().splitlines()):
+                if line == "bad":
+                    issues.append(LineIssue("txt", path.name, issue_line=i + 1, description="bad line"))
+        return issues
+
+
+class GoodLineBackend(QueryBackend):
+    def __init__(self):
+        super().__init__()
+        self.fixed: list[str] = []
+
+    def query(self, request, issue=None, issue_lines=list):
+        return ["good\n"]
+
+    def report_successful_fix(self, issue, proposal) -> None:
+        self.fixed.append(f"{issue.filename}:{proposal.start_line}")
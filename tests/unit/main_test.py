@@ -4,6 +4,8 @@
 from __future__ import annotations
 
 import os
+import subprocess
+import sys
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from unittest.mock import MagicMock, mock_open, patch
@@ -19,6 +21,9 @@ from hallux.main import CONFIG_FILE, Hallux, main
 from hallux.targets.filesystem import FilesystemTarget
 from hallux.tools.factory import IssueSolver
 
+# heavy backends, targets, pipeline (asyncio), sandboxes (multiprocessing) and daemon are imported only when used
+HEAVY_MODULES = ["litellm", "openai", "github", "unidiff", "requests", "asyncio", "multiprocessing", "hallux.server"]
+
 
 @patch("builtins.print")
 def test_hallux_main(mock_print):
@@ -145,3 +150,27 @@ def test_main_invalid_directory(mock_logger):
     argv = ["hallux", "invalid_dir"]
     assert main(argv) == 1
     mock_logger.error.assert_called_once_with("invalid_dir is not a valid DIR")
+
+
+def test_init_journal(tmp_path, monkeypatch):
+    from hallux.main import init_journal
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    target = FilesystemTarget()
+    assert init_journal(["hallux"], {}, tmp_path, target) is None
+    assert not tmp_path.joinpath(".cache").exists()
+
+    journal = init_journal(["hallux"], {"journal": "journal.jsonl"}, tmp_path, target)
+    journal.close()
+    assert journal.path == tmp_path.joinpath("journal.jsonl")
+
+    journal = init_journal(["hallux", "--resume"], {}, tmp_path, target)
+    journal.close()
+    assert journal.path.parent == tmp_path.joinpath(".cache", "hallux")
+
+
+def test_lazy_imports():
+    # fresh interpreter, since other tests have imported everything already
+    check_modules = f"import sys, hallux.main; print([m for m in {HEAVY_MODULES} if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-c", check_modules], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]", "heavy modules shall be imported lazily"
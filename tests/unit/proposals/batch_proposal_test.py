@@ -0,0 +1,27 @@
+#!/bin/env python
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from unit.common.testing_issue import TestingIssue
+
+from hallux.proposals.batch_proposal import BatchProposal
+
+
+def test_batch_proposal(test_filename="simple_proposal_test.txt"):
+    test_file = str(Path(__file__).resolve().parent.joinpath(test_filename))
+    issues = [
+        TestingIssue(test_file, issue_line=4, description="four", line_comment="  # 4"),
+        TestingIssue(test_file, issue_line=6, description="six", line_comment="  # 6"),
+    ]
+    proposal = BatchProposal(issues, radius=2)
+    assert (proposal.start_line, proposal.end_line, proposal.safety_radius) == (2, 8, 2)
+    assert proposal.issue_lines == ["2\n", "3\n", "4  # 4\n", "5\n", "6  # 6\n", "7\n", "8\n"]
+    assert proposal.issue_data()["ISSUE_DESCRIPTION"] == "line 4: four; line 6: six"
+    assert proposal.description == "2 issues: four; six"
+
+    assert proposal._merge_lines(proposal._split_lines("```\n3\nFOUR  # 4\n5\nSIX\n7\n```\n"))
+    assert proposal.proposed_lines == proposal._split_lines("2\n3\nFOUR\n5\nSIX\n7\n8\n")
+    assert proposal.issue_lines == proposal._split_lines("2\n3\n4\n5\n6\n7\n8\n")  # line comments are removed
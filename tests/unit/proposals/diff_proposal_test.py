@@ -61,3 +61,13 @@ def test_try_fixing_with_priority_return_true(custom_proposal):
 
     result = custom_proposal.try_fixing_with_priority(query_backend, diff_target, used_backend)
     assert result[0] is True
+
+
+def test_shift_line():
+    proposal = CustomProposal("test-file.py", "description", start_line=3, end_line=4)
+    proposal.proposed_lines = ["a\n", "b\n", "c\n"]
+
+    assert [proposal.shift_line(line) for line in [1, 2, 3, 4, 5, 10]] == [1, 2, 3, 4, 6, 11]
+
+    proposal.proposed_lines = []
+    assert [proposal.shift_line(line) for line in [2, 3, 4, 5]] == [2, 2, 2, 3]
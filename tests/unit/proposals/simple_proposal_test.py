@@ -124,3 +124,33 @@ def test_cpp_file_diff_with_real_openai_results(test_filename="../../test-cpp-pr
         "    return 0; // line 21\n",
         "}\n",
     ]
+
+
+def test_simple_proposal_large_range(tmp_path: Path):
+    # Sonar-like radius: 201 lines, answer wrapped into some chatter, every original line is slightly changed
+    lines = [f"value_{i} = compute(value_{i - 1}, {i * 7})\n" for i in range(301)]
+    test_file = tmp_path.joinpath("large.py")
+    test_file.write_text("".join(lines))
+    proposal = SimpleProposal(TestingIssue(str(test_file), issue_line=151, base_path=tmp_path), radius_or_range=100)
+
+    fixed = lines[50:251]
+    fixed[100:103] = ["fixed = True\n"]
+    assert proposal._merge_lines(["Here is the fixed code:\n"] + fixed + ["Hope it helps\n"])
+    assert proposal.proposed_lines == fixed
+
+    changed = [line.replace("compute", "Compute") for line in lines[50:251]]
+    assert not proposal._merge_lines(changed)  # no line matches, so changes are out of the safety radius
+
+
+def test_simple_proposal_repeated_lines(tmp_path: Path):
+    # lines, repeated in more than 1% of 200+ lines, would be junk for SequenceMatcher with autojunk (as in ndiff),
+    # then lines below the fix do not match and the merge fails
+    lines = ["\n"] * 100 + ["x = 1\n"] + ["\n"] * 100
+    test_file = tmp_path.joinpath("blank.py")
+    test_file.write_text("".join(lines))
+    proposal = SimpleProposal(TestingIssue(str(test_file), issue_line=101, base_path=tmp_path), radius_or_range=100)
+
+    fixed = ["\n"] * 100 + ["x = 2\n"] + ["\n"] * 100
+    assert SimpleProposal._matching_ends(lines, fixed) == ((0, 0), (0, 0))
+    assert proposal._merge_lines(fixed)
+    assert proposal.proposed_lines == fixed
@@ -0,0 +1,74 @@
+#!/bin/env python
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from hallux.server import WarmState, is_listening, run_client
+
+
+def test_warm_state_reloads_changed_config():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        config_file = tmp_path.joinpath(".hallux")
+        config_file.write_text("target: git\n")
+        state = WarmState()
+
+        config, config_path = state.find_config(tmp_path)
+        assert config == {"target": "git"} and config_path == tmp_path
+        config["target"] = "files"  # jobs get own copies
+        assert state.find_config(tmp_path)[0] == {"target": "git"}
+
+        config_file.write_text("target: github\n")
+        os.utime(config_file, (0, 0))
+        assert state.find_config(tmp_path)[0] == {"target": "github"}
+
+
+def test_warm_state_keeps_backends():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        config = {"backends": [{"cache": {"type": "dummy", "filename": "dummy.json"}}]}
+        state = WarmState()
+
+        backend = state.init_backend(["hallux", "--cache", "dir"], config, tmp_path)
+        assert state.init_backend(["hallux", "--cache", "other_dir"], config, tmp_path) is backend
+        assert state.init_backend(["hallux", "--ruff", "--cache", "dir"], config, tmp_path) is not backend
+
+
+def test_run_client_without_daemon():
+    with TemporaryDirectory() as tmp_dir:
+        assert run_client(["hallux", "--help"], Path(tmp_dir).joinpath("no.sock")) is None
+
+
+def test_serve_runs_jobs(capfd):
+    with TemporaryDirectory() as tmp_dir:
+        socket_path = Path(tmp_dir).joinpath("hallux.sock")
+        daemon = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                f"from hallux.main import main; main(['hallux', 'serve', '--socket', '{socket_path}'])",
+            ],
+            env={**os.environ, "LITELLM_LOCAL_MODEL_COST_MAP": "True"},
+        )
+        try:
+            for _ in range(600):
+                if is_listening(socket_path):
+                    break
+                time.sleep(0.1)
+
+            assert run_client(["hallux", "--help"], socket_path) == 0
+            assert run_client(["hallux", "--ruff", "/non/existing/dir"], socket_path) == 1
+        finally:
+            daemon.send_signal(signal.SIGINT)
+            daemon.wait(timeout=10)
+
+        assert "USAGE" in capfd.readouterr().out
+        assert not socket_path.exists()
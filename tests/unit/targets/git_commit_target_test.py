@@ -76,12 +76,13 @@ def test_commit_diff(git_target_factory, diff_proposal):
         assert git_target.commit_diff() is True
 
         # Check that subprocess.check_output was called with the expected arguments
-        mock_subprocess.assert_any_call(["git", "add", "file"])
-        mock_subprocess.assert_any_call(["git", "commit", "-m", f"HALLUX: {diff_proposal.description}"])
+        mock_subprocess.assert_any_call(["git", "-C", "/path/to", "add", "file"])
+        mock_subprocess.assert_any_call(
+            ["git", "-C", "/path/to", "commit", "-m", f"HALLUX: {diff_proposal.description}"]
+        )
 
-        # Check that os.chdir was called to change into and back out of the git directory
-        mock_chdir.assert_any_call("/path/to")
-        mock_chdir.assert_any_call(TEST_PROJECT_PATH)
+        # Working directory is shared by all threads, so it is never changed
+        mock_chdir.assert_not_called()
 
 
 # Coverage with verbose = True
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from unittest.mock import Mock
 
 from unit.common.testing_issue import TestingIssue
 
@@ -37,3 +38,22 @@ def test_compact_proposal():
     assert compacted.proposed_lines == ["4AAA\n", "5AAA\n", "NEW LINE\n"]
     assert compacted.start_line == 4
     assert compacted.end_line == 5
+
+
+def test_scope():
+    github_suggestion = GithubSuggestion.__new__(GithubSuggestion)
+    github_suggestion.changed_lines = None
+    github_suggestion.pull_request = Mock()
+    github_suggestion.pull_request.get_files.return_value = [
+        Mock(
+            filename="a.py",
+            status="modified",
+            patch="@@ -1,3 +1,4 @@\n a\n-b\n+c\n+d\n e\n@@ -10,2 +11,2 @@\n-x\n+y\n z",
+        ),
+        Mock(filename="image.png", status="added", patch=None),
+        Mock(filename="old.py", status="removed", patch="@@ -1 +0,0 @@\n-x"),
+    ]
+    assert github_suggestion.scope() == {"a.py": {1, 2, 3, 4, 11, 12}, "image.png": set()}
+    # pull-request files are requested once
+    github_suggestion.scope()
+    github_suggestion.pull_request.get_files.assert_called_once()
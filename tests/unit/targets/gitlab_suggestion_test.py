@@ -174,6 +174,7 @@ class TestGitlabSuggestion(unittest.TestCase):
         # Patch FilesystemTarget.apply_diff
         apply_diff_patch = patch("hallux.targets.filesystem.FilesystemTarget.apply_diff")
         apply_diff_patch.start()
+        self.addCleanup(apply_diff_patch.stop)
 
         # Shall return True if the file is in the list
         self.gitlab_suggestion.changed_files[__file__] = __file__
@@ -184,10 +185,20 @@ class TestGitlabSuggestion(unittest.TestCase):
         # Patch FilesystemTarget.revert_diff
         revert_diff_patch = patch("hallux.targets.filesystem.FilesystemTarget.revert_diff")
         mock_revert_diff = revert_diff_patch.start()
+        self.addCleanup(revert_diff_patch.stop)
 
         self.gitlab_suggestion.revert_diff()
         mock_revert_diff.assert_called_once()
 
+    # Test the scope method
+    def test_scope(self):
+        self.gitlab_suggestion.changed_diffs["pull_request.yml"] = test_unidiff_str
+        self.gitlab_suggestion.changed_diffs["empty.txt"] = ""
+        scope = self.gitlab_suggestion.scope()
+        assert scope["empty.txt"] == set()
+        assert {5, 6, 36, 41, 58}.issubset(scope["pull_request.yml"])
+        assert not {1, 2, 10, 35, 53, 59}.intersection(scope["pull_request.yml"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,56 @@
+#!/bin/env python
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from hallux.auxiliary import set_directory
+from hallux.proposals.diff_proposal import DiffProposal
+from hallux.targets.sandbox import SandboxTarget
+from hallux.tools.sandbox import Sandbox
+
+
+class ReplaceProposal(DiffProposal):
+    def try_fixing(self, query_backend, diff_target) -> bool:
+        return diff_target.apply_diff(self)
+
+
+def make_proposal(filename: str) -> DiffProposal:
+    proposal = ReplaceProposal(filename=filename, issue_line=2, start_line=2, end_line=2)
+    proposal.all_lines = ["1\n", "2\n", "3\n"]
+    proposal.proposed_lines = ["two\n"]
+    return proposal
+
+
+@pytest.mark.parametrize("keep_changes, expected", [(True, "1\ntwo\n3\n"), (False, "1\n2\n3\n")])
+def test_sandbox_target(keep_changes: bool, expected: str):
+    with TemporaryDirectory() as tmp_dir:
+        Path(tmp_dir, "file.txt").write_text("1\n2\n3\n")
+        with set_directory(tmp_dir):
+            target = SandboxTarget(keep_changes)
+            assert target.apply_diff(make_proposal("file.txt"))
+            assert Path("file.txt").read_text() == "1\ntwo\n3\n"
+            assert target.commit_diff()
+            assert Path("file.txt").read_text() == expected
+            assert target.requires_refresh() == keep_changes
+
+
+def test_sandbox():
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir, "project")
+        root.joinpath("src", ".git").mkdir(parents=True)
+        root.joinpath("src", "file.txt").write_text("text")
+
+        sandbox = Sandbox(root)
+        try:
+            assert sandbox.path != root.resolve()
+            assert sandbox.rebase(root.joinpath("src")).joinpath("file.txt").read_text() == "text"
+            assert not sandbox.rebase(root.joinpath("src", ".git")).exists()
+            assert sandbox.rebase(Path(tmp_dir)) == Path(tmp_dir)
+        finally:
+            sandbox.cleanup()
+        assert not sandbox.path.exists()
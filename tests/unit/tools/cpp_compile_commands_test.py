@@ -0,0 +1,82 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from shutil import which
+from unittest.mock import Mock, patch
+
+import pytest
+
+from hallux.targets.filesystem import FilesystemTarget
+from hallux.tools.cpp.compile_commands import CompileCommand
+from hallux.tools.cpp.cpp import Cpp_IssueSolver
+from hallux.tools.cpp.translation_unit_solver import TranslationUnitSolver
+
+
+class TestCompileCommands(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.base_path = Path(self.tmp_dir.name)
+        with open(self.base_path / "header.h", "w") as file:
+            file.write("inline int size() {\n    std::vector<int> v;\n    return v.size();\n}\n")
+        with open(self.base_path / "a.cpp", "w") as file:
+            file.write('#include "header.h"\nint a() { return size(); }\n')
+        with open(self.base_path / "b.cpp", "w") as file:
+            file.write('#include "header.h"\nint b() { return size(); }\n')
+        with open(self.base_path / "c.cpp", "w") as file:
+            file.write("int c() { return 1; }\n")
+        entries = [
+            {"directory": str(self.base_path), "arguments": ["g++", "-c", "a.cpp", "-o", "a.o"], "file": "a.cpp"},
+            {"directory": str(self.base_path), "command": "g++ -c b.cpp -o b.o", "file": "b.cpp"},
+            {"directory": str(self.base_path), "command": "g++ -c c.cpp -o c.o", "file": "c.cpp"},
+            # the same file of another target
+            {"directory": str(self.base_path), "command": "g++ -DOTHER -c c.cpp -o c2.o", "file": "c.cpp"},
+        ]
+        with open(self.base_path / "compile_commands.json", "w") as file:
+            json.dump(entries, file)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_load(self):
+        commands = CompileCommand.load(self.base_path / "compile_commands.json")
+        self.assertEqual([self.base_path / name for name in ["a.cpp", "b.cpp", "c.cpp"]], [c.file for c in commands])
+        self.assertEqual(["g++", "-c", "b.cpp", "-o", "b.o"], commands[1].arguments)
+
+        with open(self.base_path / "broken.json", "w") as file:
+            file.write("[{")
+        with self.assertRaises(SystemError):
+            CompileCommand.load(self.base_path / "broken.json")
+
+    @pytest.mark.skipif(not which("g++"), reason="g++ is not installed")
+    def test_check(self):
+        commands = CompileCommand.load(self.base_path / "compile_commands.json")
+        self.assertIn('fix-it:"header.h":{1:1-1:1}:"#include <vector>\\n"', commands[0].check())
+        self.assertEqual("", commands[2].check())
+        self.assertFalse(self.base_path.joinpath("c.o").exists())
+
+    @pytest.mark.skipif(not which("g++"), reason="g++ is not installed")
+    def test_solve_translation_units(self):
+        solver = Cpp_IssueSolver(self.base_path, self.base_path, compile_commands="compile_commands.json")
+        query_backend = Mock()
+        units: list[TranslationUnitSolver] = []
+        solve_issues = TranslationUnitSolver.solve_issues
+
+        def record(unit, diff_target, query_backend):
+            units.append(unit)
+            solve_issues(unit, diff_target, query_backend)
+
+        with patch.object(TranslationUnitSolver, "solve_issues", record):
+            solver.solve_issues(FilesystemTarget(), query_backend)
+
+        with open(self.base_path / "header.h") as file:
+            self.assertEqual("#include <vector>\n", file.readline())
+        # c.cpp compiles, b.cpp is compiled again after the header was fixed, instead of reusing its diagnostics
+        self.assertEqual([self.base_path / "a.cpp", self.base_path / "b.cpp"], [unit.command.file for unit in units])
+        self.assertEqual([1, 0], [unit.fixed for unit in units])
+        query_backend.query.assert_not_called()
+
+    def test_missing_compile_commands(self):
+        solver = Cpp_IssueSolver(self.base_path, self.base_path, compile_commands="missing.json")
+        with self.assertRaises(SystemError):
+            solver.solve_issues(FilesystemTarget(), Mock())
@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+from hallux.tools.cpp.fixit import FixIt, FixItProposal
+from hallux.tools.cpp.issue import CppIssue
+from hallux.tools.cpp.make_target_solver import MakeTargetSolver
+
+
+class TestFixIt(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = str(Path(self.tmp_dir.name).joinpath("main.cpp"))
+        with open(self.filename, "w") as file:
+            file.write("int main() {\n    std::vector<int> v\n    return v.size();\n}\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_parse(self):
+        fixit = FixIt.parse('fix-it:"dir/m \\"1\\".cpp":{2:1-2:1}:"#include <vector>\\n"')
+        self.assertEqual(FixIt('dir/m "1".cpp', 2, 1, 2, 1, "#include <vector>\n"), fixit)
+        self.assertEqual("é", FixIt.parse('fix-it:"m.cpp":{1:1-1:2}:"\\303\\251"').replacement)
+        self.assertIsNone(FixIt.parse("m.cpp:2:5: error: 'vector' is not a member of 'std'"))
+
+    def test_parse_make_issues(self):
+        output = "\n".join(
+            [
+                f"{self.filename}:2:10: error: 'vector' is not a member of 'std'",
+                "    2 |     std::vector<int> v",
+                f"{self.filename}:1:1: note: 'std::vector' is defined in header '<vector>'",
+                f'fix-it:"{self.filename}":{{1:1-1:1}}:"#include <vector>\\n"',
+                f"{self.filename}:2:23: error: expected ';' before 'return'",
+                f'fix-it:"{self.filename}":{{2:23-2:23}}:";"',
+                "make: *** [Makefile:2: main.o] Error 1",
+            ]
+        )
+        issues = CppIssue.parseMakeIssues(output)
+        self.assertEqual(2, len(issues))
+        self.assertEqual([FixIt(self.filename, 1, 1, 1, 1, "#include <vector>\n")], issues[0].fixits)
+        self.assertEqual([FixIt(self.filename, 2, 23, 2, 23, ";")], issues[1].fixits)
+        self.assertFalse(any(line.startswith("fix-it:") for issue in issues for line in issue.message_lines))
+
+    def test_proposal(self):
+        issue = CppIssue(self.filename, 2, "expected ';'")
+        issue.fixits = [
+            FixIt(self.filename, 1, 1, 1, 1, "#include <vector>\n"),
+            FixIt(self.filename, 2, 23, 2, 23, ";"),
+            # overlaps the first hint, dropped
+            FixIt(self.filename, 1, 1, 1, 1, "#include <list>\n"),
+            # another file
+            FixIt("other.cpp", 1, 1, 1, 1, "x"),
+        ]
+        proposal = FixItProposal(issue)
+        self.assertTrue(proposal.is_applicable())
+        self.assertEqual((1, 2), (proposal.start_line, proposal.end_line))
+        self.assertEqual(
+            ["#include <vector>\n", "int main() {\n", "    std::vector<int> v;\n"], proposal.proposed_lines
+        )
+
+        replacement = CppIssue(self.filename, 3, "unknown")
+        replacement.fixits = [FixIt(self.filename, 3, 14, 3, 18, "length")]
+        self.assertEqual(["    return v.length();\n"], FixItProposal(replacement).proposed_lines)
+
+    def test_solve_issue_without_backends(self):
+        issue = CppIssue(self.filename, 2, "expected ';'")
+        issue.fixits = [FixIt(self.filename, 2, 23, 2, 23, ";")]
+        solver = MakeTargetSolver(run_path=Path(self.tmp_dir.name), make_target="main.o")
+        solver.is_issue_fixed = Mock(return_value=True)
+        diff_target = Mock()
+        diff_target.apply_diff.return_value = True
+        diff_target.commit_diff.return_value = True
+        query_backend = Mock()
+
+        proposal = solver.solve_issue(issue, diff_target, query_backend)
+
+        self.assertIsInstance(proposal, FixItProposal)
+        self.assertIsNone(solver.used_backend)
+        diff_target.apply_diff.assert_called_once_with(proposal)
+        query_backend.query.assert_not_called()
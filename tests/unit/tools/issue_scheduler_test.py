@@ -0,0 +1,95 @@
+from collections import Counter
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+import pytest
+from unit.common.line_issue import BadLineSolver, GoodLineBackend, LineIssue
+
+from hallux.auxiliary import set_directory
+from hallux.targets.filesystem import FilesystemTarget
+from hallux.tools.issue_scheduler import IssueScheduler, RunBudget
+
+
+@pytest.mark.parametrize(
+    "description, rule",
+    [
+        ("F401 [*] `os` imported but unused", "F401"),
+        ('error: Name "x" is not defined  [name-defined]', "name-defined"),
+        ("Remove this unused import", "Remove this unused import"),
+    ],
+)
+def test_rule_code(description, rule):
+    assert IssueScheduler.rule_code(description) == rule
+
+
+def test_order_by_expected_value():
+    history = [
+        {"tool": "ruff", "description": "E501 line too long", "fixed": False},
+        {"tool": "ruff", "description": "E501 line too long (130 > 120)", "fixed": False},
+        {"tool": "ruff", "description": "F401 `os` imported but unused", "fixed": True},
+    ]
+    scheduler = IssueScheduler(history=history)
+    scheduler.churn = Counter({"hot.py": 20})
+
+    hard = LineIssue("ruff", "a.py", 1, "E501 line too long (150 > 120)")
+    easy = LineIssue("ruff", "b.py", 5, "F401 `sys` imported but unused")
+    unknown = LineIssue("ruff", "c.py", 1, "W291 trailing whitespace")
+    hot = LineIssue("ruff", "hot.py", 1, "W291 trailing whitespace")
+    error = LineIssue("mypy", "d.py", 1, "error: Incompatible types  [assignment]")
+
+    assert scheduler.order([hard, unknown, easy, hot, error]) == [hot, error, easy, unknown, hard]
+
+
+def test_budget():
+    backend = Mock()
+    backend.total_tokens.return_value = 0
+    assert not RunBudget().exhausted(backend)
+    assert RunBudget(max_time=0).exhausted(backend)
+
+    # tokens, spent before the first check, e.g. by previous jobs of `hallux serve`, are not counted
+    budget = RunBudget(max_time=60, max_tokens=100)
+    backend.total_tokens.return_value = 1000
+    assert not budget.exhausted(backend)
+    backend.total_tokens.return_value = 1099
+    assert not budget.exhausted(backend)
+    assert budget.exhausted(backend, parallel_tokens=1)
+    backend.total_tokens.return_value = 1100
+    assert budget.exhausted(backend)
+
+
+class CountingBackend(GoodLineBackend):
+    def query(self, request, issue=None, issue_lines=list):
+        self.tokens_used += 10
+        return super().query(request, issue, issue_lines)
+
+
+def test_solver_stops_when_budget_is_used_up():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        tmp_path.joinpath("a.txt").write_text("bad\nbad\nbad\n")
+
+        backend = CountingBackend()
+        with set_directory(tmp_path):
+            solver = BadLineSolver(tmp_path, tmp_path)
+            solver.issue_scheduler = IssueScheduler(RunBudget(max_tokens=15))
+            solver.solve_issues(FilesystemTarget(), backend)
+
+        assert backend.fixed == ["a.txt:1", "a.txt:2"]
+        assert tmp_path.joinpath("a.txt").read_text() == "good\ngood\nbad\n"
+
+
+def test_parallel_workers_share_budget(tmp_path):
+    for name in ["a.txt", "b.txt"]:
+        tmp_path.joinpath(name).write_text("bad\nbad\nbad\n")
+
+    backend = CountingBackend()
+    with set_directory(tmp_path):
+        solver = BadLineSolver(tmp_path, tmp_path, jobs=2)
+        solver.issue_scheduler = IssueScheduler(RunBudget(max_tokens=15))
+        solver.solve_issues(FilesystemTarget(), backend)
+
+    # each worker might start one query, before it sees tokens, spent by the other one
+    assert 20 <= backend.tokens_used <= 30
+    assert backend.tokens_used == 10 * len(backend.fixed)
+    assert solver.budget_exhausted(backend)
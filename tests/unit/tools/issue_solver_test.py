@@ -1,12 +1,17 @@
+import threading
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest.mock import Mock
 
 import pytest
+from unit.common.line_issue import BadLineSolver, GoodLineBackend, LineIssue, LineProposal
 from unit.common.testing_issue import TestingIssue
 
+from hallux.auxiliary import set_directory
 from hallux.backends.query_backend import QueryBackend
 from hallux.proposals.diff_proposal import DiffProposal
 from hallux.targets.diff import DiffTarget
+from hallux.targets.filesystem import FilesystemTarget
 from hallux.tools.issue_solver import IssueSolver
 
 
@@ -26,7 +31,9 @@ def issue_solver():
 # Define a fixture for the diff_target mock
 @pytest.fixture
 def diff_target():
-    return Mock(spec=DiffTarget)
+    target = Mock(spec=DiffTarget)
+    target.scope.return_value = None
+    return target
 
 
 # Define a fixture for the query_backend mock
@@ -136,3 +143,215 @@ def test_solve_issues_try_fixing_fails(issue_solver, diff_target, query_backend,
     # Check that the commit_diff method was not called
     diff_target.commit_diff.assert_not_called()
     diff_target.revert_diff.assert_called()
+
+
+def test_solve_issues_in_parallel():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        tmp_path.joinpath("b.txt").write_text("ok\nbad\nok\nbad\n")
+        tmp_path.joinpath("a.txt").write_text("bad\nok\n")
+        tmp_path.joinpath("c.txt").write_text("ok\n")
+
+        backend = GoodLineBackend()
+        with set_directory(tmp_path):
+            solver = BadLineSolver(tmp_path, tmp_path, jobs=2)
+            solver.solve_issues(FilesystemTarget(), backend)
+
+        assert tmp_path.joinpath("a.txt").read_text() == "good\nok\n"
+        assert tmp_path.joinpath("b.txt").read_text() == "ok\ngood\nok\ngood\n"
+        assert tmp_path.joinpath("c.txt").read_text() == "ok\n"
+        # proposals are merged back sorted by filename
+        assert backend.fixed == ["a.txt:1", "b.txt:2", "b.txt:4"]
+
+
+def test_solve_issues_in_parallel_falls_back_for_single_file():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        tmp_path.joinpath("a.txt").write_text("bad\nbad\n")
+
+        backend = GoodLineBackend()
+        with set_directory(tmp_path):
+            solver = BadLineSolver(tmp_path, tmp_path, jobs=4)
+            solver.solve_issues(FilesystemTarget(), backend)
+
+        assert tmp_path.joinpath("a.txt").read_text() == "good\ngood\n"
+        assert backend.fixed == ["a.txt:1", "a.txt:2"]
+
+
+class IncrementalBadLineSolver(BadLineSolver):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.listed_files: list[str] = []
+
+    def list_file_issues(self, filename: str):
+        self.listed_files.append(filename)
+        return [issue for issue in BadLineSolver.list_issues(self) if issue.filename == filename]
+
+
+def test_solve_issues_incremental():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        tmp_path.joinpath("a.txt").write_text("bad\nok\nbad\n")
+        tmp_path.joinpath("b.txt").write_text("bad\n")
+
+        backend = GoodLineBackend()
+        with set_directory(tmp_path):
+            solver = IncrementalBadLineSolver(tmp_path, tmp_path)
+            solver.list_issues = Mock(side_effect=solver.list_issues)
+            solver.solve_issues(FilesystemTarget(), backend)
+
+        assert tmp_path.joinpath("a.txt").read_text() == "good\nok\ngood\n"
+        assert tmp_path.joinpath("b.txt").read_text() == "good\n"
+        assert backend.fixed == ["a.txt:1", "a.txt:3", "b.txt:1"]
+        # whole directory is listed only once, afterwards only fixed files are re-checked
+        solver.list_issues.assert_called_once()
+        assert solver.listed_files == ["a.txt", "a.txt", "b.txt"]
+
+
+def test_refresh_issues_keeps_order():
+    solver = IncrementalBadLineSolver(Path(), Path())
+    first, second, third = (LineIssue("txt", name, issue_line=1) for name in ["a.txt", "b.txt", "c.txt"])
+    solver.target_issues = [first, second, third]
+    fresh = LineIssue("txt", "b.txt", issue_line=5)
+    solver.list_file_issues = Mock(return_value=[fresh])
+
+    solver.refresh_issues(second, Mock(spec=DiffProposal))
+
+    assert solver.target_issues == [first, fresh, third]
+
+
+class TwoLinesBackend(GoodLineBackend):
+    def query(self, request, issue=None, issue_lines=list):
+        return ["good\n", "ok\n"]
+
+
+def test_solve_issues_with_validity_test_remaps_lines():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        tmp_path.joinpath("a.txt").write_text("bad\nok\nbad\n")
+        tmp_path.joinpath("check.sh").write_text("exit 0\n")
+
+        backend = TwoLinesBackend()
+        with set_directory(tmp_path):
+            solver = BadLineSolver(tmp_path, tmp_path, validity_test="check.sh")
+            solver.list_issues = Mock(side_effect=solver.list_issues)
+            solver.solve_issues(FilesystemTarget(), backend)
+
+        assert tmp_path.joinpath("a.txt").read_text() == "good\nok\nok\ngood\nok\n"
+        # second issue moved from line 3 to line 4 without re-listing
+        assert backend.fixed == ["a.txt:1", "a.txt:4"]
+        solver.list_issues.assert_called_once()
+
+
+class BatchBackend(GoodLineBackend):
+    # fixes all "bad" lines of the requested code at once
+    def __init__(self):
+        super().__init__()
+        self.prompt = {"system": "", "user": "{ISSUE_DESCRIPTION}\n{ISSUE_LINES}"}
+        self.queries = 0
+
+    def query(self, request, issue=None, issue_lines=list):
+        self.queries += 1
+        return ["".join("good\n" if line == "bad\n" else line for line in issue_lines)]
+
+
+def test_batch_solving():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        tmp_path.joinpath("a.txt").write_text("ok\nbad\nok\nbad\nok\nbad\n" + "ok\n" * 30 + "bad\n")
+
+        with set_directory(tmp_path):
+            solver = BadLineSolver(tmp_path, tmp_path, batch=3)
+            assert [len(batch) for batch in solver.group_batches(solver.list_issues())] == [3]
+            backend = BatchBackend()
+            solver.solve_issues(FilesystemTarget(), backend)
+
+        # 3 nearby issues are fixed by one query, the distant one by its own query
+        assert backend.queries == 2
+        assert "bad" not in tmp_path.joinpath("a.txt").read_text()
+
+
+class TaggedProposal(LineProposal):
+    def __init__(self, issue: LineIssue, tag: str):
+        super().__init__(issue)
+        self.tag = tag
+
+    def try_fixing(self, query_backend, diff_target) -> bool:
+        self.proposed_lines = query_backend.query(self.tag, None, self.issue_lines)
+        return diff_target.apply_diff(self)
+
+
+class TaggedIssue(LineIssue):
+    def list_proposals(self):
+        return [TaggedProposal(self, "first"), TaggedProposal(self, "second"), TaggedProposal(self, "third")]
+
+
+class ConcurrentBackend(GoodLineBackend):
+    # only the second proposal gets a fix
+    def __init__(self, parties: int):
+        super().__init__()
+        self.requests: list[str] = []
+        # every request waits for all others, so requests sent one after another break the barrier
+        self.barrier = threading.Barrier(parties, timeout=10)
+
+    def query(self, request, issue=None, issue_lines=list):
+        self.requests.append(request)
+        self.barrier.wait()
+        return ["good\n"] if request == "second" else ["bad\n"]
+
+
+def test_speculative_solving():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        tmp_path.joinpath("a.txt").write_text("bad\n")
+
+        with set_directory(tmp_path):
+            solver = BadLineSolver(tmp_path, tmp_path, speculative=True)
+            issue = TaggedIssue("txt", "a.txt", issue_line=1, description="bad line")
+            solver.target_issues = [issue]
+            # all 3 requests are sent at once, instead of one after another
+            backend = ConcurrentBackend(parties=3)
+            proposal = solver.solve_issue(issue, FilesystemTarget(), backend)
+
+        assert not backend.barrier.broken
+        assert sorted(backend.requests) == ["first", "second", "third"]
+        assert proposal.tag == "second"
+        assert tmp_path.joinpath("a.txt").read_text() == "good\n"
+
+
+class ScopedTarget(FilesystemTarget):
+    def scope(self):
+        return {"a.txt": {3}, "c.txt": {1}, "../outside.txt": {1}}
+
+
+class FilesBadLineSolver(BadLineSolver):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.listed_files: list[str] = []
+
+    def list_issues_in_files(self, filenames: list[str]):
+        self.listed_files.extend(filenames)
+        return [issue for issue in BadLineSolver.list_issues(self) if issue.filename in filenames]
+
+
+def test_solve_issues_in_scope():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir).joinpath("project")
+        tmp_path.mkdir()
+        tmp_path.joinpath("a.txt").write_text("bad\nok\nbad\n")
+        tmp_path.joinpath("b.txt").write_text("bad\n")
+        tmp_path.parent.joinpath("outside.txt").write_text("bad\n")
+
+        backend = GoodLineBackend()
+        with set_directory(tmp_path):
+            solver = FilesBadLineSolver(tmp_path, tmp_path)
+            solver.list_issues = Mock(side_effect=solver.list_issues)
+            solver.solve_issues(ScopedTarget(), backend)
+
+        # only changed line of the changed file is fixed, missing files and files outside are not checked
+        assert tmp_path.joinpath("a.txt").read_text() == "bad\nok\ngood\n"
+        assert tmp_path.joinpath("b.txt").read_text() == "bad\n"
+        assert backend.fixed == ["a.txt:3"]
+        # changed files are checked again after the fix
+        assert solver.listed_files == ["a.txt", "a.txt"]
+        solver.list_issues.assert_not_called()
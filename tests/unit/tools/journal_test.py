@@ -0,0 +1,96 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+from unit.common.line_issue import BadLineSolver, GoodLineBackend, LineIssue
+
+from hallux.auxiliary import set_directory
+from hallux.proposals.diff_proposal import DiffProposal
+from hallux.targets.filesystem import FilesystemTarget
+from hallux.tools.journal import RunJournal
+
+
+def test_journal_resume():
+    with TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir).joinpath("journal")
+        fixed, unfixed = LineIssue("txt", "a.txt", 1, "fixed"), LineIssue("txt", "a.txt", 2, "unfixed")
+        proposal = Mock(spec=DiffProposal, start_line=1, end_line=1, proposed_lines=["good\n"])
+
+        journal = RunJournal(path)
+        journal.record(fixed, True, proposal, GoodLineBackend())
+        journal.record(unfixed, False)
+        journal.close()
+        with open(path, "at") as file:
+            file.write('{"tool": "txt", "filen')  # crash in the middle of the record
+
+        records = RunJournal.read(path)
+        assert [record["fixed"] for record in records] == [True, False]
+        assert records[0]["backend"] == "GoodLineBackend"
+        assert records[0]["proposal"] == {"start_line": 1, "end_line": 1, "lines": ["good\n"]}
+
+        resumed = RunJournal(path, resume=True)
+        assert not resumed.is_finished(fixed)  # fixed issue is gone from local files, so same one is a new issue
+        assert resumed.is_finished(unfixed)
+        assert not resumed.is_finished(unfixed)  # every record skips one issue only
+        resumed.close()
+
+        assert RunJournal(path, resume=True, skip_fixed=True).is_finished(fixed)
+        assert not RunJournal(path).is_finished(unfixed)
+        assert path.read_text() == ""
+
+
+class OneFixBackend(GoodLineBackend):
+    # fixes only the first queried issue
+    def __init__(self):
+        super().__init__()
+        self.queries = 0
+
+    def query(self, request, issue=None, issue_lines=list):
+        self.queries += 1
+        return ["good\n"] if self.queries == 1 else ["bad\n"]
+
+
+def test_solver_skips_finished_issues():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        tmp_path.joinpath("a.txt").write_text("bad\n")
+        tmp_path.joinpath("b.txt").write_text("bad\n")
+        journal_path = tmp_path.joinpath("journal")
+
+        with set_directory(tmp_path):
+            solver = BadLineSolver(tmp_path, tmp_path)
+            solver.journal = RunJournal(journal_path)
+            solver.solve_issues(FilesystemTarget(), OneFixBackend())
+            solver.journal.close()
+            assert [(r["filename"], r["fixed"]) for r in RunJournal.read(journal_path)] == [
+                ("a.txt", True),
+                ("b.txt", False),
+            ]
+
+            tmp_path.joinpath("a.txt").write_text("bad\n")
+            backend = GoodLineBackend()
+            solver.journal = RunJournal(journal_path, resume=True)
+            solver.solve_issues(FilesystemTarget(), backend)
+            solver.journal.close()
+
+        # b.txt is not queried again
+        assert backend.fixed == ["a.txt:1"]
+        assert tmp_path.joinpath("b.txt").read_text() == "bad\n"
+        assert len(RunJournal.read(journal_path)) == 3
+
+
+def test_parallel_solving_journals_backends(tmp_path):
+    tmp_path.joinpath("a.txt").write_text("bad\n")
+    tmp_path.joinpath("b.txt").write_text("bad\n")
+    journal_path = tmp_path.joinpath("journal")
+
+    with set_directory(tmp_path):
+        solver = BadLineSolver(tmp_path, tmp_path, jobs=2)
+        solver.journal = RunJournal(journal_path)
+        solver.solve_issues(FilesystemTarget(), GoodLineBackend())
+        solver.journal.close()
+
+    assert [(r["filename"], r["fixed"], r["backend"]) for r in RunJournal.read(journal_path)] == [
+        ("a.txt", True, "GoodLineBackend"),
+        ("b.txt", True, "GoodLineBackend"),
+    ]
@@ -0,0 +1,78 @@
+import shutil
+
+import pytest
+
+from hallux.tools.python.lint_cache import LintCache
+from hallux.tools.python.python_issue import PythonIssue
+from hallux.tools.ruff.solver import Ruff_IssueSolver
+
+
+def test_lint_cache_keys(tmp_path):
+    project = tmp_path.joinpath("project")
+    project.mkdir()
+    project.joinpath("a.py").write_text("x = 1\n")
+    project.joinpath("b.py").write_text("y = 2\n")
+    cache_file = tmp_path.joinpath("lint.jsonl")
+
+    cache = LintCache(cache_file, "mypy", "--strict", project)
+    file_key = cache.file_key("a.py")
+    tree_key = cache.tree_key(LintCache.python_files(project))
+    issue = PythonIssue("a.py", 1, "error: Bad  [misc]", tool="mypy", code="misc", end_line=2, column=3)
+    cache.put(tree_key, [issue])
+    cache.put(file_key, [])
+    cache.close()
+
+    # issues are read back by the next run
+    cache = LintCache(cache_file, "mypy", "--strict", project)
+    assert cache.get(file_key) == []
+    cached = cache.get(tree_key)
+    assert len(cached) == 1 and cached[0] is not issue
+    assert (cached[0].filename, cached[0].issue_line, cached[0].end_line, cached[0].column, cached[0].code) == (
+        "a.py",
+        1,
+        2,
+        3,
+        "misc",
+    )
+
+    # other arguments, configs or contents of any file make other keys
+    assert LintCache(cache_file, "mypy", "", project).file_key("a.py") != file_key
+    project.joinpath("b.py").write_text("y = 3\n")
+    assert cache.file_key("a.py") == file_key
+    assert cache.tree_key(LintCache.python_files(project)) != tree_key
+    project.joinpath("pyproject.toml").write_text("[tool.mypy]\n")
+    assert LintCache(cache_file, "mypy", "--strict", project).file_key("a.py") != file_key
+
+
+@pytest.mark.skipif(shutil.which("ruff") is None, reason="ruff is not installed")
+def test_ruff_solver_lint_cache(tmp_path, monkeypatch):
+    project = tmp_path.joinpath("project")
+    project.mkdir()
+    project.joinpath("a.py").write_text("import os\n")
+    project.joinpath("b.py").write_text("import sys\n")
+    cache_file = str(tmp_path.joinpath("lint.jsonl"))
+
+    solver = Ruff_IssueSolver(project, project, lint_cache=cache_file)
+    issues = solver.list_issues()
+    assert [(issue.filename, issue.issue_line, issue.code) for issue in issues] == [
+        ("a.py", 1, "F401"),
+        ("b.py", 1, "F401"),
+    ]
+    solver.close()
+
+    linted: list[list[str]] = []
+    run_ruff = Ruff_IssueSolver._run_ruff
+
+    def recording_run_ruff(self, paths):
+        linted.append(paths)
+        return run_ruff(self, paths)
+
+    monkeypatch.setattr(Ruff_IssueSolver, "_run_ruff", recording_run_ruff)
+    solver = Ruff_IssueSolver(project, project, lint_cache=cache_file)
+    assert [(issue.filename, issue.fixable) for issue in solver.list_issues()] == [("a.py", True), ("b.py", True)]
+    assert linted == []
+
+    project.joinpath("b.py").write_text("import sys\n\nprint(sys.path)\n")
+    assert [issue.filename for issue in solver.list_issues()] == ["a.py"]
+    assert linted == [["b.py"]]
+    solver.close()
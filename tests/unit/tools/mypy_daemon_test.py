@@ -0,0 +1,111 @@
+import shutil
+
+import pytest
+
+from hallux.tools.mypy.daemon import MypyDaemon
+from hallux.tools.mypy.solver import Mypy_IssueSolver
+
+
+def test_daemon_commands(tmp_path):
+    args = ["--strict", "--follow-imports=skip"]
+    daemon = MypyDaemon(tmp_path)
+    start = daemon.command(args, ["src"])
+    assert start[:2] == ["dmypy", "--status-file"]
+    assert start[3:] == [
+        "run",
+        "--timeout",
+        str(MypyDaemon.idle_timeout),
+        "--",
+        "--strict",
+        "--follow-imports=skip",
+        "src",
+    ]
+    assert daemon.command(args, ["src"]) == ["dmypy", "--status-file", start[2], "recheck"]
+    assert daemon.command(args, ["src"], "src/a.py")[4:] == ["--remove", "src/a.py", "--update", "src/a.py"]
+    # file of the previous check might have been reverted
+    assert daemon.command(args, ["src"], "src/b.py")[4:] == [
+        "--remove",
+        "src/a.py",
+        "src/b.py",
+        "--update",
+        "src/a.py",
+        "src/b.py",
+    ]
+
+    # --update crashes the daemon, which follows imports after all
+    assert daemon.recheck_failed()
+    assert daemon.status_file is None
+    assert daemon.command(args, ["src"], "src/c.py")[3:] == start[3:]
+    assert daemon.command(args, ["src"], "src/c.py")[3:] == ["recheck"]
+    assert not daemon.recheck_failed()
+
+    # forked process starts its own daemon
+    daemon.owner_pid = -1
+    daemon.update_files = True
+    assert daemon.command(["--strict"], ["src"])[3:6] == ["run", "--timeout", str(daemon.idle_timeout)]
+    # --update is not supported, while following imports, which is the default
+    assert daemon.command([], ["src"], "src/a.py")[3:] == ["recheck"]
+
+
+@pytest.mark.parametrize(
+    "filename, config, follow_imports, given_config_follow_imports",
+    [
+        ("mypy.ini", "[mypy]\nfollow_imports = skip\n", "skip", "skip"),
+        ("setup.cfg", "[flake8]\nmax-line-length = 120\n", "normal", "normal"),
+        ("setup.cfg", "[mypy]\nfollow_imports = error\n", "error", "error"),
+        ("pyproject.toml", '[tool.mypy]\nfollow_imports = "skip"\n', "skip", "skip"),
+        ("pyproject.toml", "[tool.black]\nline-length = 120\n", "normal", "normal"),
+        # not looked up by mypy, unless given by --config-file
+        ("custom.ini", "[mypy]\nfollow_imports = skip\n", "normal", "skip"),
+    ],
+)
+def test_follow_imports_from_config(tmp_path, filename, config, follow_imports, given_config_follow_imports):
+    tmp_path.joinpath(filename).write_text(config)
+    daemon = MypyDaemon(tmp_path)
+    assert daemon.follow_imports([]) == follow_imports
+    assert daemon.follow_imports(["--config-file", filename]) == given_config_follow_imports
+    assert daemon.follow_imports(["--follow-imports=error"]) == "error"
+
+
+def test_changed_files_get_later_mtimes(tmp_path):
+    path = tmp_path.joinpath("a.py")
+    path.write_text("x = 1\n")
+    daemon = MypyDaemon(tmp_path)
+    daemon.command([], ["."])
+    first_mtime = path.stat().st_mtime
+
+    daemon.command([], ["."], "a.py")
+    fixed_mtime = path.stat().st_mtime
+    assert int(fixed_mtime) > int(first_mtime)
+
+    # reverted within the same second, with the same size
+    path.write_text("x = 2\n")
+    daemon.command([], ["."], "a.py")
+    assert int(path.stat().st_mtime) > int(fixed_mtime)
+
+
+@pytest.mark.skipif(shutil.which("dmypy") is None, reason="mypy is not installed")
+def test_mypy_solver_daemon(tmp_path):
+    tmp_path.joinpath("a.py").write_text('x: int = "a"\n')
+    tmp_path.joinpath("b.py").write_text("from a import x\n\ny: str = x\n")
+    solver = Mypy_IssueSolver(tmp_path, tmp_path, daemon=True)
+    try:
+        issues = solver.list_issues()
+        assert [(issue.filename, issue.issue_line, issue.code) for issue in issues] == [
+            ("a.py", 1, "assignment"),
+            ("b.py", 3, "assignment"),
+        ]
+        status_file = solver.daemon.status_file
+        assert status_file.exists()
+
+        tmp_path.joinpath("a.py").write_text('x: str = "a"\n')
+        assert solver.list_file_issues("a.py") == []
+        # dependent module is re-checked by the daemon too
+        assert solver.list_file_issues("b.py") == []
+
+        # reverted within the same second, with the same size
+        tmp_path.joinpath("a.py").write_text('x: int = "a"\n')
+        assert [issue.issue_line for issue in solver.list_file_issues("a.py")] == [1]
+    finally:
+        solver.close()
+    assert not status_file.exists()
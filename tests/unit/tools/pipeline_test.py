@@ -0,0 +1,81 @@
+#!/bin/env python
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+from unit.common.line_issue import BadLineSolver, GoodLineBackend
+
+from hallux.auxiliary import set_directory
+from hallux.targets.filesystem import FilesystemTarget
+from hallux.tools.pipeline import IssuePipeline
+
+
+class BarrierBackend(GoodLineBackend):
+    # first queries wait for each other, i.e. fail unless they are sent concurrently
+    def __init__(self, parties: int):
+        super().__init__()
+        self.barrier = threading.Barrier(parties, timeout=5)
+        self.queries = 0
+        self.lock = threading.Lock()
+
+    def query(self, request, issue=None, issue_lines=list):
+        with self.lock:
+            self.queries += 1
+            first_queries = self.queries <= self.barrier.parties
+        if first_queries:
+            self.barrier.wait()
+        return super().query(request, issue, issue_lines)
+
+
+class FailingBackend(GoodLineBackend):
+    def query(self, request, issue=None, issue_lines=list):
+        raise ValueError("backend failure")
+
+
+@pytest.fixture
+def project():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        tmp_path.joinpath("a.txt").write_text("bad\nok\nbad\n")
+        tmp_path.joinpath("b.txt").write_text("ok\nbad\n")
+        with set_directory(tmp_path):
+            yield tmp_path
+
+
+def test_pipeline_solves_issues(project: Path):
+    backend = GoodLineBackend()
+    solver = BadLineSolver(project, project, pipeline=True)
+    solver.solve_issues(FilesystemTarget(), backend)
+
+    assert project.joinpath("a.txt").read_text() == "good\nok\ngood\n"
+    assert project.joinpath("b.txt").read_text() == "ok\ngood\n"
+    assert sorted(backend.fixed) == ["a.txt:1", "a.txt:3", "b.txt:2"]
+    # issues of the same file are solved in order
+    assert [fix for fix in backend.fixed if fix.startswith("a.txt")] == ["a.txt:1", "a.txt:3"]
+
+
+def test_pipeline_queries_concurrently(project: Path):
+    backend = BarrierBackend(parties=2)
+    solver = BadLineSolver(project, project, pipeline={"files": 2, "query": 2})
+    solver.solve_issues(FilesystemTarget(), backend)
+
+    assert sorted(backend.fixed) == ["a.txt:1", "a.txt:3", "b.txt:2"]
+
+
+def test_pipeline_raises_stage_failure(project: Path):
+    solver = BadLineSolver(project, project, pipeline=True)
+    with pytest.raises(ValueError):
+        solver.solve_issues(FilesystemTarget(), FailingBackend())
+
+    assert project.joinpath("a.txt").read_text() == "bad\nok\nbad\n"
+
+
+@pytest.mark.parametrize("limits", [{"query": 0}, {"unknown": 1}])
+def test_pipeline_wrong_limits(limits: dict):
+    with pytest.raises(SystemError):
+        IssuePipeline(BadLineSolver(Path(), Path()), limits)
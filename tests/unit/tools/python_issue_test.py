@@ -0,0 +1,142 @@
+#!/bin/env python
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import json
+
+from hallux.tools.python.python_issue import PythonIssue
+
+
+def test_parse_mypy_issues():
+    mypy_output = (
+        'bench/module.py:8: error: Incompatible types in assignment (expression has type "str")  [assignment]\n'
+        "bench/module.py:9: note: See https://mypy.readthedocs.io\n"
+        "Found 1 error in 1 file (checked 2 source files)\n"
+        ""
+    )
+    issues = PythonIssue.parseIssues(mypy_output, tool="mypy", keyword="error:")
+    assert [(issue.filename, issue.issue_line, issue.tool) for issue in issues] == [("bench/module.py", 8, "mypy")]
+    assert issues[0].description.startswith("error: Incompatible types")
+    assert issues[0].code == "assignment"
+
+
+def test_parse_text_issues():
+    ruff_output = (
+        "dir with spaces/a b.py:1:8: F401 [*] `os` imported but unused\n"
+        "dir with spaces/a b.py:3: F541 [*] f-string without any placeholders\n"
+        "Found 2 errors.\n"
+        "[*] 2 fixable with `--fix`.\n"
+    )
+    issues = PythonIssue.parseIssues(ruff_output)
+    assert [(issue.filename, issue.issue_line, issue.column) for issue in issues] == [
+        ("dir with spaces/a b.py", 1, 8),
+        ("dir with spaces/a b.py", 3, None),
+    ]
+    assert issues[0].description == "F401 [*] `os` imported but unused"
+    assert [(issue.code, issue.fixable) for issue in issues] == [("F401", True), ("F541", True)]
+
+
+def test_parse_ruff_json(tmp_path):
+    ruff_output = [
+        json.dumps(
+            {
+                "code": "F401",
+                "end_location": {"column": 10, "row": 2},
+                "filename": str(tmp_path.joinpath("a b.py")),
+                "fix": {"applicability": "safe", "edits": [], "message": "Remove unused import: `os`"},
+                "location": {"column": 8, "row": 1},
+                "message": "`os` imported but unused",
+            }
+        ),
+        "warning: not a JSON line",
+        json.dumps(
+            {
+                "code": "E711",
+                "end_location": {"column": 12, "row": 5},
+                "filename": "/elsewhere/b.py",
+                "fix": {"applicability": "unsafe", "edits": [], "message": "Replace with `is`"},
+                "location": {"column": 7, "row": 5},
+                "message": "Comparison to `None` should be `cond is None`",
+            }
+        ),
+    ]
+    issues = list(PythonIssue.parseRuffJson(ruff_output, tmp_path))
+    assert [(issue.filename, issue.issue_line, issue.end_line, issue.column) for issue in issues] == [
+        ("a b.py", 1, 2, 8),
+        ("/elsewhere/b.py", 5, 5, 7),
+    ]
+    assert [(issue.code, issue.fixable) for issue in issues] == [("F401", True), ("E711", False)]
+    assert [issue.description for issue in issues] == [
+        "F401 [*] `os` imported but unused",
+        "E711 Comparison to `None` should be `cond is None`",
+    ]
+
+
+def test_parse_mypy_json():
+    mypy_output = [
+        '{"file": "a.py", "line": 2, "column": 9, "end_line": 3, "message": "Incompatible types", "hint": null,'
+        ' "code": "assignment", "severity": "error"}',
+        '{"file": "a.py", "line": 4, "column": 0, "message": "See docs", "hint": null, "code": null,'
+        ' "severity": "note"}',
+    ]
+    issues = list(PythonIssue.parseMypyJson(mypy_output))
+    assert [(issue.filename, issue.issue_line, issue.end_line, issue.column, issue.tool) for issue in issues] == [
+        ("a.py", 2, 3, 10, "mypy")
+    ]
+    assert issues[0].description == "error: Incompatible types  [assignment]"
+
+
+def test_parse_ruff_json_array(tmp_path):
+    # `ruff check --format json` output of ruff 0.0.272
+    ruff_output = json.dumps(
+        [
+            {
+                "code": "F401",
+                "message": "`os` imported but unused",
+                "fix": {
+                    "applicability": "Automatic",
+                    "message": "Remove unused import: `os`",
+                    "edits": [
+                        {"content": "", "location": {"row": 1, "column": 1}, "end_location": {"row": 2, "column": 1}}
+                    ],
+                },
+                "location": {"row": 1, "column": 8},
+                "end_location": {"row": 1, "column": 10},
+                "filename": str(tmp_path.joinpath("a b.py")),
+                "noqa_row": 1,
+            },
+            {
+                "code": "F541",
+                "message": "f-string without any placeholders",
+                "fix": {
+                    "applicability": "Unspecified",
+                    "message": "Remove extraneous `f` prefix",
+                    "edits": [
+                        {"content": '"a"', "location": {"row": 2, "column": 5}, "end_location": {"row": 2, "column": 9}}
+                    ],
+                },
+                "location": {"row": 2, "column": 5},
+                "end_location": {"row": 2, "column": 9},
+                "filename": str(tmp_path.joinpath("a b.py")),
+                "noqa_row": 2,
+            },
+            {
+                "code": "F821",
+                "message": "Undefined name `undefined`",
+                "fix": None,
+                "location": {"row": 3, "column": 7},
+                "end_location": {"row": 3, "column": 16},
+                "filename": str(tmp_path.joinpath("a b.py")),
+                "noqa_row": 3,
+            },
+        ],
+        indent=2,
+    ).splitlines(keepends=True)
+    issues = list(PythonIssue.parseRuffJson(ruff_output, tmp_path))
+    assert [(issue.filename, issue.issue_line, issue.code, issue.fixable) for issue in issues] == [
+        ("a b.py", 1, "F401", True),
+        ("a b.py", 2, "F541", True),
+        ("a b.py", 3, "F821", False),
+    ]
+    assert issues[0].description == "F401 [*] `os` imported but unused"
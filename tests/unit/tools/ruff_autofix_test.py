@@ -0,0 +1,94 @@
+import re
+import subprocess
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+import pytest
+
+from hallux.auxiliary import set_directory
+from hallux.targets.filesystem import FilesystemTarget
+from hallux.tools.python.python_issue import PythonIssue
+from hallux.tools.ruff.autofix import RuffFixProposal
+from hallux.tools.ruff.solver import Ruff_IssueSolver
+
+
+def ruff_version() -> tuple[int, ...]:
+    """
+    :return: version of installed ruff, empty if ruff is not installed
+    """
+    try:
+        output = subprocess.check_output(["ruff", "--version"], text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return ()
+    return tuple(int(part) for part in re.findall(r"\d+", output)[:3])
+
+
+# fixes of stdin and safe fix marks are expected as in ruff of requirements.txt
+requires_ruff = pytest.mark.skipif(ruff_version() < (0, 0, 272), reason="ruff 0.0.272 or newer is not installed")
+
+
+def test_fix_proposals():
+    original = ["import os\n", "import sys\n", "\n", 'x = f"a"\n', "y = 1\n", "print(sys.path, x)\n"]
+    fixed = ["import sys\n", "\n", 'x = "a"\n', "y = 1\n", "print(sys.path, x)\n", "print(y)\n"]
+    issues = [
+        PythonIssue("a.py", 1, "F401 [*] `os` imported but unused", code="F401", fixable=True),
+        PythonIssue("a.py", 4, "F541 [*] f-string without any placeholders", code="F541", fixable=True),
+    ]
+    proposals = RuffFixProposal.from_fix("a.py", original, fixed, issues)
+    assert [(proposal.start_line, proposal.end_line, proposal.proposed_lines) for proposal in proposals] == [
+        (1, 1, []),
+        (4, 4, ['x = "a"\n']),
+    ]
+    assert [proposal.issues for proposal in proposals] == [issues[:1], issues[1:]]
+    # changed range without reported issues is not applied
+    assert RuffFixProposal.apply_all(original, proposals) == fixed[:-1]
+
+
+@requires_ruff
+def test_fix_natively():
+    with TemporaryDirectory() as tmp_dir:
+        project = Path(tmp_dir).joinpath("project")
+        project.mkdir()
+        project.joinpath("a.py").write_text('import os\nimport sys\n\nx = f"a"\nprint(sys.path, x, undefined)\n')
+        project.joinpath("b.py").write_text("import json\n")
+        # every run is logged outside of the project
+        project.joinpath("check.sh").write_text("echo run >> ../runs.log\n")
+
+        with set_directory(project):
+            solver = Ruff_IssueSolver(project, project, validity_test="check.sh", autofix=True)
+            solver.fix_natively(FilesystemTarget())
+            assert [issue.code for issue in solver.list_issues()] == ["F821"]
+            assert solver.autofixed == set()
+
+        assert project.joinpath("a.py").read_text() == 'import sys\n\nx = "a"\nprint(sys.path, x, undefined)\n'
+        assert project.joinpath("b.py").read_text() == ""
+        # once at start, once for all fixes
+        assert Path(tmp_dir).joinpath("runs.log").read_text() == "run\nrun\n"
+
+
+@requires_ruff
+def test_fix_natively_suggestions():
+    with TemporaryDirectory() as tmp_dir:
+        project = Path(tmp_dir)
+        project.joinpath("a.py").write_text("import os\nimport sys\n\nprint(sys.path)\n")
+
+        target = Mock(spec=FilesystemTarget)
+        target.scope.return_value = {"a.py": {2, 3, 4}}
+        target.apply_diff.return_value = True
+        target.commit_diff.return_value = True
+        target.requires_refresh.return_value = False
+        with set_directory(project):
+            solver = Ruff_IssueSolver(project, project, autofix=True)
+            solver.fix_natively(target)
+
+        # unused import is out of pull-request scope
+        target.apply_diff.assert_not_called()
+        assert solver.autofixed == set()
+
+        target.scope.return_value = None
+        with set_directory(project):
+            solver.fix_natively(target)
+        target.apply_diff.assert_called_once()
+        assert solver.autofixed == {("ruff", "a.py", "F401 [*] `os` imported but unused")}
+        assert solver.is_finished(solver.list_issues()[0])
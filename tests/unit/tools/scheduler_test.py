@@ -0,0 +1,136 @@
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+from unit.common.line_issue import BadLineSolver, GoodLineBackend, LineIssue
+
+from hallux.auxiliary import set_directory
+from hallux.proposals.diff_proposal import DiffProposal
+from hallux.targets.filesystem import FilesystemTarget
+from hallux.tools.issue_solver import IssueSolver
+from hallux.tools.scheduler import FileLockManager, SolverScheduler, TreeLockedTarget
+
+
+class FilesSolver(BadLineSolver):
+    # lists only given files, like different tools look at different files
+    def __init__(self, filenames: list[str], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.filenames = filenames
+
+    def list_issues(self):
+        return [issue for issue in BadLineSolver.list_issues(self) if issue.filename in self.filenames]
+
+
+class BarrierBackend(GoodLineBackend):
+    # first queries of both solvers must be in flight at the same time
+    def __init__(self):
+        super().__init__()
+        self.barrier = threading.Barrier(2, timeout=10)
+
+    def query(self, request, issue=None, issue_lines=list):
+        self.barrier.wait()
+        return super().query(request, issue, issue_lines)
+
+
+def test_solvers_run_concurrently():
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        tmp_path.joinpath("a.txt").write_text("bad\nok\n")
+        tmp_path.joinpath("b.txt").write_text("ok\nbad\n")
+
+        backend = BarrierBackend()
+        with set_directory(tmp_path):
+            solvers = [FilesSolver(["a.txt"], tmp_path, tmp_path), FilesSolver(["b.txt"], tmp_path, tmp_path)]
+            SolverScheduler(solvers).run(FilesystemTarget(), backend)
+
+        assert tmp_path.joinpath("a.txt").read_text() == "good\nok\n"
+        assert tmp_path.joinpath("b.txt").read_text() == "ok\ngood\n"
+        assert sorted(backend.fixed) == ["a.txt:1", "b.txt:2"]
+        assert all(solver.file_locks is None for solver in solvers)
+
+
+def test_unsafe_solvers_run_afterwards():
+    first, second, unsafe = (Mock(spec=IssueSolver) for _ in range(3))
+    first.can_run_concurrently.return_value = True
+    second.can_run_concurrently.return_value = True
+    unsafe.can_run_concurrently.return_value = False
+    calls = []
+    for name, solver in [("first", first), ("second", second), ("unsafe", unsafe)]:
+        solver.solve_issues.side_effect = lambda *args, name=name: calls.append(name)
+
+    diff_target = FilesystemTarget()
+    SolverScheduler([unsafe, first, second]).run(diff_target, Mock())
+
+    assert sorted(calls[:2]) == ["first", "second"]
+    assert calls[2] == "unsafe"
+    # concurrent solvers get own copies of diff_target, which lock the tree between apply and commit
+    assert isinstance(first.solve_issues.call_args.args[0], TreeLockedTarget)
+    assert first.solve_issues.call_args.args[0].diff_target is not diff_target
+    assert unsafe.solve_issues.call_args.args[0] is diff_target
+
+
+def test_committed_remaps_other_solvers():
+    this_solver, other_solver = BadLineSolver(Path(), Path()), BadLineSolver(Path(), Path())
+    this_issue = LineIssue("txt", "a.txt", issue_line=5)
+    same_file, other_file = LineIssue("txt", "a.txt", issue_line=5), LineIssue("txt", "b.txt", issue_line=5)
+    this_solver.target_issues = [this_issue]
+    other_solver.target_issues = [same_file, other_file]
+    proposal = Mock(spec=DiffProposal, filename="./a.txt")
+    proposal.shift_line.side_effect = lambda line: line + 1
+
+    FileLockManager([this_solver, other_solver]).committed(this_solver, proposal)
+
+    assert [this_issue.issue_line, same_file.issue_line, other_file.issue_line] == [5, 6, 5]
+
+
+def test_tree_is_locked_while_fix_is_pending():
+    file_locks = FileLockManager([])
+    first = TreeLockedTarget(Mock(spec=FilesystemTarget), file_locks)
+    second = TreeLockedTarget(Mock(spec=FilesystemTarget), file_locks)
+    first.diff_target.apply_diff.return_value = True
+    first.diff_target.commit_diff.return_value = True
+    second.diff_target.apply_diff.return_value = True
+    proposal = Mock(spec=DiffProposal, filename="a.txt")
+
+    assert first.apply_diff(proposal)
+    applied = threading.Event()
+    thread = threading.Thread(target=lambda: second.apply_diff(proposal) and applied.set())
+    thread.start()
+    # fix of the other solver is not applied, until the first one is committed
+    assert not applied.wait(0.1)
+    assert first.commit_diff()
+    assert applied.wait(10)
+    thread.join()
+    second.revert_diff()
+    assert not file_locks.tree_lock.locked()
+
+    # apply, which writes nothing, does not keep the tree locked
+    first.diff_target.apply_diff.return_value = False
+    assert not first.apply_diff(proposal)
+    assert not file_locks.tree_lock.locked()
+
+
+def test_issues_are_not_listed_while_fix_is_pending(tmp_path):
+    tmp_path.joinpath("a.txt").write_text("bad\n")
+    tmp_path.joinpath("b.txt").write_text("ok\n")
+    file_locks = FileLockManager([])
+    # fix of the other solver breaks b.txt, until it is reverted
+    other = TreeLockedTarget(Mock(spec=FilesystemTarget), file_locks)
+    other.diff_target.apply_diff.side_effect = lambda diff: tmp_path.joinpath("b.txt").write_text("bad\n") > 0
+    other.diff_target.revert_diff.side_effect = lambda: tmp_path.joinpath("b.txt").write_text("ok\n")
+    assert other.apply_diff(Mock(spec=DiffProposal, filename="b.txt"))
+
+    backend = GoodLineBackend()
+    with set_directory(tmp_path):
+        solver = BadLineSolver(tmp_path, tmp_path)
+        solver.file_locks = file_locks
+        thread = threading.Thread(target=solver.solve_issues, args=(FilesystemTarget(), backend))
+        thread.start()
+        thread.join(0.1)
+        assert thread.is_alive()
+        other.revert_diff()
+        thread.join(10)
+
+    assert backend.fixed == ["a.txt:1"]
+    assert tmp_path.joinpath("b.txt").read_text() == "ok\n"
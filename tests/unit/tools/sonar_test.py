@@ -8,6 +8,7 @@ import requests
 
 from hallux.backends.query_backend import QueryBackend
 from hallux.issues.issue import IssueDescriptor
+from hallux.proposals.diff_proposal import DiffProposal
 from hallux.targets.diff import DiffTarget
 from hallux.tools.sonarqube.solver import OverrideQueryBackend, Sonar_IssueSolver, SonarIssue
 
@@ -25,6 +26,17 @@ def solver_instance():
         instance.search_params = "mock_search_params"
         instance.argvalue = "mock_extra_param"
         instance.already_fixed_files = []
+        instance.jobs = 1
+        instance.pipeline = None
+        instance.batch = 1
+        instance.speculative = False
+        instance.validity_cache = None
+        instance.test_impact = None
+        instance.warm_runner = None
+        instance.issue_scheduler = None
+        instance.journal = None
+        instance.scope = None
+        instance.file_locks = None
         return instance
 
 
@@ -115,6 +127,21 @@ def test_parse_issues():
     assert issues[0].issue_type == "type"
 
 
+def test_remap_lines():
+    sonar_issue = SonarIssue(
+        filename="test_file",
+        text_range={"startLine": 5, "endLine": 6, "startOffset": 0, "endOffset": 0},
+        issue_line=5,
+    )
+    proposal = Mock(spec=DiffProposal)
+    proposal.shift_line.side_effect = lambda line: line + 2
+
+    sonar_issue.remap_lines(proposal)
+
+    assert sonar_issue.issue_line == 7
+    assert sonar_issue.text_range == {"startLine": 7, "endLine": 8, "startOffset": 0, "endOffset": 0}
+
+
 def test_solve_issues_with_missing_configuration(solver_instance, caplog):
     solver_instance.token = None  # Simulate missing token
     solver_instance.url = "http://example.com"
@@ -131,6 +158,7 @@ def test_solve_issues_with_full_configuration(solver_instance, caplog):
     solver_instance.project = "mock_project"
 
     diff_target = Mock(spec=DiffTarget)
+    diff_target.scope.return_value = None
     query_backend = Mock(spec=QueryBackend)
 
     # with patch('hallux.tools.sonarqube.solver.OverrideQueryBackend', autospec=True) as mock_override_backend:
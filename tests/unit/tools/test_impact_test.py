@@ -0,0 +1,88 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+from unit.common.line_issue import BadLineSolver, LineIssue, LineProposal
+
+from hallux.auxiliary import set_directory
+from hallux.proposals.diff_proposal import DiffProposal
+from hallux.tools.test_impact import TestImpact
+
+
+class RangeProposal(DiffProposal):
+    def try_fixing(self, query_backend, diff_target) -> bool:
+        return True
+
+
+def test_select_and_shift(tmp_path):
+    impact = TestImpact(tmp_path, full_every=4)
+    impact.line_tests = {
+        "a.py": {1: {""}, 3: {"t.py::one"}, 4: {"t.py::one", "t.py::two"}, 10: {"t.py::three"}},
+    }
+    proposal = RangeProposal(str(tmp_path.joinpath("a.py")), "", issue_line=4, start_line=3, end_line=4)
+    assert impact.select(proposal) == ["t.py::one", "t.py::two"]
+
+    # changed lines are not executed by tests: all tests of the file
+    uncovered = RangeProposal(str(tmp_path.joinpath("a.py")), "", issue_line=6, start_line=5, end_line=7)
+    assert impact.select(uncovered) == ["t.py::one", "t.py::three", "t.py::two"]
+
+    # line executed on import, unknown file, and every 4th check run the whole validity test
+    assert impact.select(RangeProposal(str(tmp_path.joinpath("a.py")), "", 1, 1, 2)) is None
+    assert impact.select(proposal) is None
+    assert impact.select(RangeProposal(str(tmp_path.joinpath("b.py")), "", 1, 1, 2)) is None
+
+    proposal.proposed_lines = ["fixed\n", "fixed\n", "added\n"]
+    impact.shift_lines(proposal)
+    assert impact.line_tests["a.py"] == {1: {""}, 3: {"t.py::one"}, 4: {"t.py::one", "t.py::two"}, 11: {"t.py::three"}}
+
+
+def test_read_map(tmp_path):
+    coverage = pytest.importorskip("coverage")
+    source = str(tmp_path.joinpath("a.py"))
+    data = coverage.CoverageData(basename=str(tmp_path.joinpath(".coverage")))
+    data.set_context("t.py::one|run")
+    data.add_lines({source: [1, 2]})
+    data.set_context("t.py::two|setup")
+    data.add_lines({source: [2]})
+    data.write()
+
+    assert TestImpact.read_map(tmp_path.joinpath(".coverage"), tmp_path) == {
+        "a.py": {1: {"t.py::one"}, 2: {"t.py::one", "t.py::two"}}
+    }
+
+
+def test_impacted_validity_test():
+    with TemporaryDirectory() as tmp_dir:
+        project = Path(tmp_dir).joinpath("project")
+        project.mkdir()
+        project.joinpath("a.txt").write_text("ok\nbad\n")
+        # every run is logged outside of the project
+        project.joinpath("check.sh").write_text("echo full >> ../runs.log\n")
+        project.joinpath("impacted.sh").write_text('echo "$@" >> ../runs.log\n')
+        runs_log = Path(tmp_dir).joinpath("runs.log")
+
+        with set_directory(project):
+            solver = BadLineSolver(
+                project, project, validity_test="check.sh", test_impact={"command": "bash impacted.sh", "full_every": 2}
+            )
+            # no coverage data from impacted.sh
+            assert solver.test_impact.line_tests == {}
+            solver.test_impact.line_tests = {"a.txt": {1: {"t.py::one"}, 2: {"t.py::two"}}}
+
+            proposal = LineProposal(LineIssue("txt", "a.txt", issue_line=2, description="bad line"))
+            assert solver.is_issue_fixed(proposal=proposal)
+            assert solver.test_impact.unverified == ["a.txt:2"]
+            solver.verify_impacted_fixes()
+            assert solver.test_impact.unverified == []
+            assert solver.is_issue_fixed(proposal=proposal)
+
+            # the whole validity test fails after a fix, which passed impacted tests
+            assert solver.is_issue_fixed(proposal=proposal)
+            project.joinpath("check.sh").write_text("echo full >> ../runs.log\nexit 1\n")
+            with pytest.raises(SystemError, match="a.txt:2"):
+                solver.verify_impacted_fixes()
+
+        runs = runs_log.read_text().splitlines()
+        assert runs[0] == "full"
+        assert runs[1].startswith("--cov=.")
+        assert runs[2:] == ["t.py::two", "full", "full", "t.py::two", "full"]
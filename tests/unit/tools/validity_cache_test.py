@@ -0,0 +1,92 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from unit.common.line_issue import BadLineSolver
+
+from hallux.tools.file_hashes import FileHashes
+from hallux.tools.validity_cache import ValidityCache
+
+
+def test_validity_cache_key():
+    with TemporaryDirectory() as tmp_dir:
+        project = Path(tmp_dir).joinpath("project")
+        project.joinpath("src").mkdir(parents=True)
+        project.joinpath("src", "a.txt").write_text("ok\n")
+        project.joinpath("__pycache__").mkdir()
+        cache_path = Path(tmp_dir).joinpath("cache.jsonl")
+
+        cache = ValidityCache(cache_path)
+        key = cache.key("check.sh", project)
+        assert key != cache.key("check.sh -x", project)
+
+        project.joinpath("src", "a.txt").write_text("bad\n")
+        changed_key = cache.key("check.sh", project)
+        assert changed_key != key
+        project.joinpath("__pycache__", "a.pyc").write_text("ignored")
+        assert cache.key("check.sh", project) == changed_key
+
+        # reverted tree is the same tree
+        project.joinpath("src", "a.txt").write_text("ok\n")
+        assert cache.key("check.sh", project) == key
+
+        cache.put(key, True)
+        cache.put(changed_key, False)
+        assert cache.get(changed_key) is False
+        cache.close()
+        with open(cache_path, "at") as file:
+            file.write('{"key": "old", "passed": false}\n{"key": "cut')
+
+        # failure might be flaky, it is tested again by the next run
+        cache = ValidityCache(cache_path)
+        assert (cache.get(key), cache.get(changed_key), cache.get("old"), cache.get("unknown")) == (
+            True,
+            None,
+            None,
+            None,
+        )
+        cache.close()
+
+
+def test_file_hashes_same_size_rewrite(tmp_path):
+    path = tmp_path.joinpath("a.txt")
+    path.write_text("ok\n")
+    old = path.stat()
+    os.utime(path, ns=(old.st_atime_ns, old.st_mtime_ns - 2 * FileHashes.racy_ns))
+    hashes = FileHashes()
+    ok_hash = hashes.get(str(path))
+    assert hashes.get(str(path)) == ok_hash
+    assert str(path) in hashes.hashes
+
+    # same size and mtime, as after a rewrite within timestamp granularity of the filesystem
+    path.write_text("no\n")
+    os.utime(path, ns=(old.st_atime_ns, old.st_mtime_ns - 2 * FileHashes.racy_ns))
+    assert hashes.get(str(path)) != ok_hash
+
+    # just modified file is re-hashed every time
+    path.write_text("ok\n")
+    assert hashes.get(str(path)) == ok_hash
+    assert str(path) not in hashes.hashes
+
+
+def test_cached_validity_test():
+    with TemporaryDirectory() as tmp_dir:
+        project = Path(tmp_dir).joinpath("project")
+        project.mkdir()
+        project.joinpath("a.txt").write_text("ok\n")
+        # every run is logged outside of the project, so the tree stays the same
+        project.joinpath("check.sh").write_text("echo run >> ../runs.log\n! grep -q broken a.txt\n")
+        runs_log = Path(tmp_dir).joinpath("runs.log")
+        cache = ValidityCache(Path(tmp_dir).joinpath("cache.jsonl"))
+
+        solver = BadLineSolver(project, project, validity_test="check.sh", validity_cache=cache)
+        BadLineSolver(project, project, validity_test="check.sh", validity_cache=cache)
+        assert len(runs_log.read_text().splitlines()) == 1
+
+        project.joinpath("a.txt").write_text("broken\n")
+        assert not solver.is_issue_fixed()
+        assert not solver.is_issue_fixed()
+        project.joinpath("a.txt").write_text("ok\n")
+        assert solver.is_issue_fixed()
+        assert len(runs_log.read_text().splitlines()) == 2
+        cache.close()
@@ -0,0 +1,41 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from unit.common.line_issue import BadLineSolver
+
+from hallux.tools.warm_runner import WarmTestRunner
+
+
+def test_warm_runner_reloads_modules():
+    with TemporaryDirectory() as tmp_dir:
+        project = Path(tmp_dir)
+        project.joinpath("value.py").write_text("VALUE = 1\n")
+        project.joinpath("test_value.py").write_text(
+            "from value import VALUE\n\ndef test_value():\n    assert VALUE == 1\n"
+        )
+
+        runner = WarmTestRunner(args="-q -p no:cacheprovider", preload=["json", "missing_module"])
+        try:
+            assert runner.run(project)
+            project.joinpath("value.py").write_text("VALUE = 2\n")
+            assert not runner.run(project)
+            project.joinpath("value.py").write_text("VALUE = 1\n")
+            assert runner.run(project, ["-q", "-p", "no:cacheprovider", "test_value.py::test_value"])
+            assert not runner.run(project, ["-q", "-p", "no:cacheprovider", "test_value.py::test_missing"])
+        finally:
+            runner.close()
+
+
+def test_solver_with_warm_runner():
+    with TemporaryDirectory() as tmp_dir:
+        project = Path(tmp_dir)
+        project.joinpath("test_ok.py").write_text("def test_ok():\n    pass\n")
+
+        # validity_test script does not exist, tests are run by the warm worker
+        solver = BadLineSolver(
+            project, project, validity_test="missing.sh", warm_runner={"args": "-p no:cacheprovider"}
+        )
+        assert solver.warm_runner.process is not None
+        project.joinpath("test_ok.py").write_text("def test_ok():\n    assert False\n")
+        assert not solver.is_issue_fixed()
+        solver.warm_runner.close()
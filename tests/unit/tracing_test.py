@@ -0,0 +1,81 @@
+#!/bin/env python
+# Copyright: Hallux team, 2024
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+from unit.common.line_issue import BadLineSolver, GoodLineBackend
+
+from hallux.auxiliary import set_directory
+from hallux.backends.query_backend import QueryBackend
+from hallux.targets.filesystem import FilesystemTarget
+from hallux.tracing import Tracer, traced_methods, tracer
+
+
+@pytest.fixture
+def tracing():
+    tracer.start()
+    yield tracer
+    tracer.stop()
+    tracer.spans.clear()
+
+
+def test_traced_solving(tracing):
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        tmp_path.joinpath("a.txt").write_text("bad\nok\n")
+        with set_directory(tmp_path):
+            BadLineSolver(tmp_path, tmp_path).solve_issues(FilesystemTarget(), GoodLineBackend())
+
+        names = {span.name for span in tracing.spans}
+        assert {
+            "list_issues",
+            "solve_issue",
+            "list_proposals",
+            "query",
+            "apply_diff",
+            "is_issue_fixed",
+            "commit_diff",
+        } <= names
+        query = next(span for span in tracing.spans if span.name == "query")
+        assert (query.cls, query.issue, query.nested) == ("GoodLineBackend", "a.txt:1", True)
+
+        summary = tracing.summary()
+        assert "GoodLineBackend" in summary and "a.txt:1" in summary
+
+        trace_path = tmp_path.joinpath("trace.json")
+        tracing.write_trace(trace_path)
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        assert len(events) == len(tracing.spans)
+        assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+
+
+@traced_methods("test", "work")
+class Worker:
+    def work(self) -> int:
+        return 1
+
+
+class DerivedWorker(Worker):
+    def work(self) -> int:
+        return super().work() + 1
+
+
+def test_traced_overrides(tracing):
+    assert DerivedWorker().work() == 2
+    # super() call is not traced again
+    assert [(span.name, span.cls) for span in tracing.spans] == [("work", "DerivedWorker")]
+    # abstract methods stay abstract
+    with pytest.raises(TypeError):
+        QueryBackend()
+
+
+def test_disabled_tracer():
+    disabled = Tracer()
+    with disabled.span("work") as span:
+        assert span is None
+    assert disabled.spans == [] and "Phase" in disabled.summary()